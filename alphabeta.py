@@ -9,150 +9,358 @@ Gain : Réduit drastiquement le nombre de nœuds explorés
 """
 
 import math
-from game import PLAYER_1, PLAYER_2
-from heuristic import heuristic
+import time
+from game import PLAYER_1, PLAYER_2, ONGOING
+from transposition import TranspositionTable, EXACT, LOWER_BOUND, UPPER_BOUND
+from ordering import make_orderer, DEFAULT_STRATEGY
+from endgame import solve_endgame, ENDGAME_THRESHOLD
+from context import SearchContext, SearchTimeout, TIME_CHECK_INTERVAL
 
-
-class AlphaBetaStats:
-    """Classe pour collecter les statistiques de l'algorithme"""
-    def __init__(self):
-        self.nodes_explored = 0  # Nombre de nœuds explorés
-        self.nodes_pruned = 0    # Nombre de nœuds élagues
-        self.max_depth_reached = 0  # Profondeur maximale atteinte
-        
-    def reset(self):
-        """Réinitialise les compteurs"""
-        self.nodes_explored = 0
-        self.nodes_pruned = 0
-        self.max_depth_reached = 0
-
-
-# Instance globale pour les statistiques
-stats = AlphaBetaStats()
+# Un score au-delà de ce seuil signifie une victoire ou une défaite forcée
+WIN_THRESHOLD = 100000000
 
 
-def alphabeta(game, depth, alpha, beta, maximizing_player):
+def alphabeta(game, depth, alpha, beta, maximizing_player, ctx):
     """
     Algorithme Alpha-Beta avec élagage
     
+    Les compteurs de nœuds sont tenus dans des variables locales de
+    _alphabeta et ajoutés au contexte une seule fois, à la fin de la recherche.
+    
     Args:
         game (Connect4): État actuel du jeu
         depth (int): Profondeur restante à explorer
         alpha (float): Meilleur score garanti pour MAX
         beta (float): Meilleur score garanti pour MIN
         maximizing_player (bool): True si c'est le tour de MAX (IA)
+        ctx (SearchContext): Contexte de la recherche (statistiques, limites, table
+                             de transposition et ordonnancement des coups)
         
     Returns:
         tuple: (meilleur_score, meilleure_colonne)
     """
-    # Incrémenter le compteur de nœuds
-    stats.nodes_explored += 1
+    try:
+        score, col, nodes, pruned = _alphabeta(game, depth, alpha, beta, maximizing_player, ctx)
+    except SearchTimeout as stop:
+        # Nœuds de la recherche interrompue, remontés par l'exception
+        ctx.add_counts(stop.nodes, stop.pruned, depth)
+        raise
+    ctx.add_counts(nodes, pruned, depth)
+    return score, col
+
+
+def _alphabeta(game, depth, alpha, beta, maximizing_player, ctx):
+    """
+    Nœud de la recherche Alpha-Beta (voir alphabeta)
     
-    # Mettre à jour la profondeur maximale atteinte
-    current_depth = stats.max_depth_reached
-    if depth > current_depth:
-        stats.max_depth_reached = depth
+    Returns:
+        tuple: (meilleur_score, meilleure_colonne, nœuds explorés, coupures)
+               (nœuds et coupures du sous-arbre, ce nœud compris)
+    """
+    # Condition d'arrêt : nœud terminal (seul le dernier coup peut avoir
+    # créé un alignement) ou profondeur = 0
+    status = game.terminal_status()
+    if status != ONGOING:
+        # États terminaux
+        if status == PLAYER_2:
+            return (100000000, None, 1, 0)  # IA gagne
+        elif status == PLAYER_1:
+            return (-100000000, None, 1, 0)  # Adversaire gagne
+        else:
+            return (0, None, 1, 0)  # Match nul
+    if depth == 0:
+        # Profondeur limite atteinte : le nœud n'est pas terminal (vérifié ci-dessus),
+        # on lit directement le score incrémental
+        return (game.evaluate(PLAYER_2), None, 1, 0)
     
     # Récupérer les coups valides
-    valid_locations = game.get_valid_locations()
-    
-    # Condition d'arrêt : nœud terminal ou profondeur = 0
-    is_terminal = game.is_terminal_node()
-    
-    if depth == 0 or is_terminal:
-        if is_terminal:
-            # États terminaux
-            if game.check_win(PLAYER_2):
-                return (100000000, None)  # IA gagne
-            elif game.check_win(PLAYER_1):
-                return (-100000000, None)  # Adversaire gagne
+    valid_locations = game.legal_moves()
+    
+    # Consulter la table de transposition
+    # (le trait est inclus dans la clé : MAX et MIN ne partagent pas les entrées)
+    alpha_orig, beta_orig = alpha, beta
+    hash_move = None
+    tt = ctx.tt
+    if tt is not None:
+        key = game.hash ^ game.geometry.zobrist_side if maximizing_player else game.hash
+        entry = tt.probe(key)
+        if entry is not None:
+            # Le meilleur coup mémorisé sert à l'ordonnancement quelle que soit sa profondeur
+            hash_move = entry[3]
+        if entry is not None and entry[0] == depth:
+            _, tt_score, tt_flag, tt_move = entry
+            if tt_flag == EXACT:
+                ctx.tt_cutoffs += 1
+                return tt_score, tt_move, 1, 0
+            elif tt_flag == LOWER_BOUND:
+                alpha = max(alpha, tt_score)
             else:
-                return (0, None)  # Match nul
-        else:
-            # Profondeur limite atteinte : évaluer avec heuristique
-            return (heuristic(game, PLAYER_2), None)
+                beta = min(beta, tt_score)
+            if alpha >= beta:
+                ctx.tt_cutoffs += 1
+                return tt_score, tt_move, 1, 0
     
-    if maximizing_player:
-        # Niveau MAX : L'IA cherche à maximiser
-        value = -math.inf
-        best_col = valid_locations[0]  # Colonne par défaut
-        
-        for col in valid_locations:
-            # Créer une copie du jeu et simuler le coup
-            temp_game = game.copy()
-            row = temp_game.get_next_open_row(col)
-            temp_game.drop_piece(row, col, PLAYER_2)
-            
-            # Appel récursif pour le niveau MIN
-            new_score, _ = alphabeta(temp_game, depth - 1, alpha, beta, False)
-            
-            # Mettre à jour le meilleur score
-            if new_score > value:
-                value = new_score
-                best_col = col
-            
-            # Mise à jour d'alpha
-            alpha = max(alpha, value)
+    # Ordonner les coups (les meilleurs candidats d'abord pour élaguer plus tôt)
+    piece = PLAYER_2 if maximizing_player else PLAYER_1
+    orderer = ctx.orderer
+    if orderer is not None:
+        ply = len(game.moves)
+        valid_locations = orderer.order(valid_locations, ply, piece, hash_move)
+    
+    # Compteurs du sous-arbre (ce nœud compris) ; le temps restant et les
+    # demandes d'arrêt sont vérifiés tous les TIME_CHECK_INTERVAL nœuds
+    nodes, pruned = 1, 0
+    next_check = TIME_CHECK_INTERVAL
+    
+    try:
+        if maximizing_player:
+            # Niveau MAX : L'IA cherche à maximiser
+            value = -math.inf
+            best_col = valid_locations[0]  # Colonne par défaut
             
-            # ÉLAGAGE BETA : Si alpha >= beta, on peut arrêter
-            if alpha >= beta:
-                stats.nodes_pruned += 1
-                break  # Coupure Beta
+            for col in valid_locations:
+                # Simuler le coup sur le plateau (annulé juste après)
+                game.play(col, PLAYER_2)
+                
+                # Appel récursif pour le niveau MIN
+                new_score, _, child_nodes, child_pruned = _alphabeta(game, depth - 1, alpha, beta, False, ctx)
+                game.undo()
+                nodes += child_nodes
+                pruned += child_pruned
+                if nodes >= next_check:
+                    if ctx.should_stop():
+                        raise SearchTimeout()
+                    next_check = nodes + TIME_CHECK_INTERVAL
+                
+                # Mettre à jour le meilleur score
+                if new_score > value:
+                    value = new_score
+                    best_col = col
+                
+                # Mise à jour d'alpha
+                alpha = max(alpha, value)
+                
+                # ÉLAGAGE BETA : Si alpha >= beta, on peut arrêter
+                if alpha >= beta:
+                    pruned += 1
+                    if orderer is not None:
+                        orderer.record_cutoff(col, ply, piece, depth, col == valid_locations[0])
+                    break  # Coupure Beta
         
-        return value, best_col
+        else:
+            # Niveau MIN : L'adversaire cherche à minimiser
+            value = math.inf
+            best_col = valid_locations[0]  # Colonne par défaut
+            
+            for col in valid_locations:
+                # Simuler le coup sur le plateau (annulé juste après)
+                game.play(col, PLAYER_1)
+                
+                # Appel récursif pour le niveau MAX
+                new_score, _, child_nodes, child_pruned = _alphabeta(game, depth - 1, alpha, beta, True, ctx)
+                game.undo()
+                nodes += child_nodes
+                pruned += child_pruned
+                if nodes >= next_check:
+                    if ctx.should_stop():
+                        raise SearchTimeout()
+                    next_check = nodes + TIME_CHECK_INTERVAL
+                
+                # Mettre à jour le meilleur score
+                if new_score < value:
+                    value = new_score
+                    best_col = col
+                
+                # Mise à jour de beta
+                beta = min(beta, value)
+                
+                # ÉLAGAGE ALPHA : Si alpha >= beta, on peut arrêter
+                if alpha >= beta:
+                    pruned += 1
+                    if orderer is not None:
+                        orderer.record_cutoff(col, ply, piece, depth, col == valid_locations[0])
+                    break  # Coupure Alpha
+    except SearchTimeout as stop:
+        # Ajouter les nœuds de ce sous-arbre avant de remonter l'arrêt
+        stop.nodes += nodes
+        stop.pruned += pruned
+        raise
     
+    if tt is not None:
+        store_result(tt, key, depth, value, best_col, alpha_orig, beta_orig)
+    return value, best_col, nodes, pruned
+
+
+def store_result(tt, key, depth, value, best_col, alpha, beta):
+    """
+    Enregistre le résultat d'un nœud dans la table de transposition
+    avec le type de borne déduit de la fenêtre initiale [alpha, beta]
+    
+    Args:
+        tt (TranspositionTable): Table de transposition
+        key (int): Clé de la position (hachage + trait)
+        depth (int): Profondeur restante du nœud
+        value (int): Score trouvé
+        best_col (int): Meilleure colonne trouvée
+        alpha (float): Alpha à l'entrée du nœud
+        beta (float): Beta à l'entrée du nœud
+    """
+    if value <= alpha:
+        flag = UPPER_BOUND  # Aucun coup n'a amélioré alpha
+    elif value >= beta:
+        flag = LOWER_BOUND  # Coupure : d'autres coups pourraient faire mieux
     else:
-        # Niveau MIN : L'adversaire cherche à minimiser
-        value = math.inf
-        best_col = valid_locations[0]  # Colonne par défaut
-        
-        for col in valid_locations:
-            # Créer une copie du jeu et simuler le coup
-            temp_game = game.copy()
-            row = temp_game.get_next_open_row(col)
-            temp_game.drop_piece(row, col, PLAYER_1)
-            
-            # Appel récursif pour le niveau MAX
-            new_score, _ = alphabeta(temp_game, depth - 1, alpha, beta, True)
-            
-            # Mettre à jour le meilleur score
-            if new_score < value:
-                value = new_score
-                best_col = col
-            
-            # Mise à jour de beta
-            beta = min(beta, value)
-            
-            # ÉLAGAGE ALPHA : Si alpha >= beta, on peut arrêter
-            if alpha >= beta:
-                stats.nodes_pruned += 1
-                break  # Coupure Alpha
-        
-        return value, best_col
+        flag = EXACT
+    tt.store(key, depth, value, flag, best_col)
 
 
-def find_best_move_alphabeta(game, depth):
+def find_best_move_alphabeta(game, depth=None, tt=None, use_tt=True, time_limit=None,
+                             ordering=DEFAULT_STRATEGY, stop_event=None, book=None,
+                             endgame_threshold=ENDGAME_THRESHOLD, endgame_solver=None):
     """
     Trouve le meilleur coup à jouer avec l'algorithme Alpha-Beta
     
+    Avec time_limit, la recherche procède par approfondissement itératif
+    (profondeur 1, 2, 3...) jusqu'à épuisement du temps ; depth devient
+    alors la profondeur maximale (facultative).
+    
     Args:
         game (Connect4): État actuel du jeu
         depth (int): Profondeur de recherche
+        tt (TranspositionTable): Table à utiliser (une nouvelle table par défaut)
+        use_tt (bool): False pour désactiver la table de transposition
+        time_limit (float): Temps alloué en secondes (None = profondeur fixe)
+        ordering (str): Stratégie d'ordonnancement des coups
+                        ('none', 'center', 'pv', 'killer' ou 'history', ou un MoveOrderer)
+        stop_event (Event): Arrête la recherche quand il est activé. En profondeur
+                            fixe, SearchTimeout est alors levée ; avec time_limit,
+                            le coup de la dernière itération terminée est retourné.
+        book (OpeningBook): Bibliothèque d'ouvertures consultée avant de chercher
+                            (le coup et le score de la bibliothèque sont alors retournés)
+        endgame_threshold (int): Nombre de cases vides à partir duquel le solveur
+                                 exact remplace la recherche (None pour le désactiver)
+        endgame_solver (EndgameSolver): Solveur de fin de partie (un nouveau par défaut ;
+                                        le garder d'un coup à l'autre conserve sa table)
         
     Returns:
         tuple: (meilleure_colonne, score, statistiques)
     """
-    # Réinitialiser les statistiques
-    stats.reset()
+    if depth is None and time_limit is None:
+        raise ValueError("Il faut indiquer une profondeur ou un temps limite")
     
-    # Lancer Alpha-Beta avec les bornes initiales
-    score, col = alphabeta(game, depth, -math.inf, math.inf, True)
+    # Position connue : le coup de la bibliothèque évite toute recherche
+    if book is not None:
+        result = book.probe(game)
+        if result is not None:
+            return result
+    
+    # Fin de partie : le solveur exact remplace l'heuristique
+    result = solve_endgame(game, endgame_threshold, endgame_solver)
+    if result is not None:
+        return result
+    
+    if not use_tt:
+        tt = None
+    elif tt is None:
+        tt = TranspositionTable()
+    else:
+        tt.reset_stats()
+    orderer = make_orderer(ordering)
+    orderer.start_search(game)
+    ctx = SearchContext(tt, orderer)
+    
+    if time_limit is None:
+        # Lancer Alpha-Beta avec les bornes initiales
+        root_moves = len(game.moves)
+        ctx.stop_event = stop_event
+        try:
+            score, col = alphabeta(game, depth, -math.inf, math.inf, True, ctx)
+        except SearchTimeout:
+            # Remettre le plateau dans l'état de la racine avant de propager l'arrêt
+            while len(game.moves) > root_moves:
+                game.undo()
+            raise
+        result_stats = {}
+    else:
+        col, score, result_stats = iterative_deepening(game, depth, ctx, time_limit, stop_event)
     
     # Retourner le résultat avec les statistiques
-    return col, score, {
-        'nodes_explored': stats.nodes_explored,
-        'nodes_pruned': stats.nodes_pruned,
-        'max_depth': stats.max_depth_reached
+    result_stats.update({
+        'nodes_explored': ctx.nodes_explored,
+        'nodes_pruned': ctx.nodes_pruned,
+        'max_depth': ctx.max_depth_reached
+    })
+    if tt is not None:
+        result_stats.update(tt.get_stats())
+        result_stats['tt_cutoffs'] = ctx.tt_cutoffs
+    result_stats.update(orderer.get_stats())
+    return col, score, result_stats
+
+
+def iterative_deepening(game, max_depth, ctx, time_limit, stop_event=None):
+    """
+    Approfondissement itératif avec budget de temps
+    
+    Chaque itération est une recherche Alpha-Beta complète à la profondeur
+    suivante. Quand le temps est écoulé, l'itération en cours est abandonnée
+    et le coup de la dernière itération terminée est retenu. La profondeur 1
+    est toujours terminée pour garantir un coup jouable.
+    
+    Args:
+        game (Connect4): État actuel du jeu
+        max_depth (int): Profondeur maximale (None = jusqu'à remplir le plateau)
+        ctx (SearchContext): Contexte de la recherche (table et ordonnancement compris)
+        time_limit (float): Temps alloué en secondes
+        stop_event (Event): Arrête la recherche comme un dépassement de temps
+        
+    Returns:
+        tuple: (meilleure_colonne, score, statistiques de l'approfondissement)
+    """
+    start_time = time.perf_counter()
+    deadline = start_time + time_limit
+    root_moves = len(game.moves)
+    
+    # Inutile de chercher plus loin que le nombre de cases vides
+    empty_cells = game.geometry.cells - bin(game.mask).count('1')
+    if max_depth is None or max_depth > empty_cells:
+        max_depth = max(1, empty_cells)
+    
+    best_col, best_score = None, None
+    iterations = []
+    
+    for depth in range(1, max_depth + 1):
+        iteration_start = time.perf_counter()
+        nodes_before = ctx.nodes_explored
+        ctx.deadline = deadline if depth > 1 else None
+        ctx.stop_event = stop_event if depth > 1 else None
+        try:
+            score, col = alphabeta(game, depth, -math.inf, math.inf, True, ctx)
+        except SearchTimeout:
+            # Remettre le plateau dans l'état de la racine
+            while len(game.moves) > root_moves:
+                game.undo()
+            break
+        
+        best_col, best_score = col, score
+        ctx.orderer.pv_move = col  # Exploré en premier à l'itération suivante
+        iterations.append({
+            'depth': depth,
+            'column': col,
+            'score': score,
+            'nodes': ctx.nodes_explored - nodes_before,
+            'time': time.perf_counter() - iteration_start
+        })
+        
+        # Victoire ou défaite forcée : approfondir ne changera rien
+        if abs(score) >= WIN_THRESHOLD or time.perf_counter() >= deadline:
+            break
+        if stop_event is not None and stop_event.is_set():
+            break
+    
+    return best_col, best_score, {
+        'depth_reached': iterations[-1]['depth'],
+        'iterations': iterations,
+        'elapsed_time': time.perf_counter() - start_time
     }
 
 
@@ -212,6 +420,7 @@ L'efficacité dépend de l'ordre d'exploration des coups :
 - Meilleur cas : Explorer les meilleurs coups d'abord
 - Pire cas     : Explorer les pires coups d'abord
 - Astuce       : Privilégier les colonnes centrales
+(voir ordering.py : centre, coup PV, coups killer, historique)
 
 COMPARAISON MIN-MAX vs ALPHA-BETA :
 ------------------------------------
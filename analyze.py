@@ -0,0 +1,384 @@
+"""
+analyze.py
+Analyse en série d'un fichier de positions
+
+Lit des positions (une par ligne) dans un fichier ou sur l'entrée
+standard, les répartit par paquets sur un pool de processus et écrit pour
+chacune le meilleur coup, le score, le score de chaque colonne et le
+nombre de nœuds, au format JSON Lines et dans l'ordre de l'entrée.
+Les positions sont lues au fur et à mesure et le nombre de paquets en
+cours est borné : la mémoire reste la même quelle que soit la taille du
+fichier.
+
+Formats d'une ligne :
+    3342            colonnes jouées depuis le plateau vide (PLAYER_1 commence)
+    3,3,4,10        idem avec des séparateurs (plateaux de plus de 10 colonnes)
+    ......./......./......./......./...2.../..11...
+                    plateau, ligne du haut en premier ('.' ou '0' vide,
+                    '1' ou 'x' pour PLAYER_1, '2' ou 'o' pour PLAYER_2)
+Les lignes vides et celles qui commencent par '#' sont ignorées.
+
+Exemples :
+    python analyze.py positions.txt --depth 6 --output analyse.jsonl
+    cat positions.txt | python analyze.py - --depth 5 --workers 4
+"""
+
+import argparse
+import itertools
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+import numpy as np
+
+from game import Connect4, ROWS, COLS, CONNECT, PLAYER_1, PLAYER_2, EMPTY
+from alphabeta import alphabeta, find_best_move_alphabeta
+from context import SearchContext
+from ordering import make_orderer, DEFAULT_STRATEGY
+from transposition import TranspositionTable
+
+# Profondeur d'analyse par défaut
+DEFAULT_DEPTH = 6
+
+# Positions envoyées ensemble à un processus (moins d'échanges entre processus)
+DEFAULT_CHUNK_SIZE = 16
+
+# Paquets en cours par processus (envoyés, ou terminés mais pas encore écrits)
+TASKS_PER_WORKER = 4
+
+# Taille de la table de transposition de chaque processus (en Mo)
+ANALYSIS_TT_MB = 4
+
+# Symboles acceptés dans un plateau
+BOARD_SYMBOLS = {'.': EMPTY, '0': EMPTY, '1': PLAYER_1, 'x': PLAYER_1, 'X': PLAYER_1,
+                 '2': PLAYER_2, 'o': PLAYER_2, 'O': PLAYER_2}
+
+# Table de transposition du processus (initialisée dans le processus, vidée à chaque position)
+_tt = None
+
+
+def read_positions(stream):
+    """
+    Lit les positions d'un flux, une à une
+
+    Args:
+        stream: Fichier texte ouvert (ou sys.stdin)
+
+    Yields:
+        tuple: (numéro de ligne, texte de la position)
+    """
+    for line_number, line in enumerate(stream, 1):
+        text = line.strip()
+        if text and not text.startswith('#'):
+            yield line_number, text
+
+
+def board_from_text(text, connect=CONNECT):
+    """
+    Crée une position à partir d'un plateau écrit ligne par ligne
+
+    Args:
+        text (str): Lignes séparées par '/', celle du haut en premier
+        connect (int): Nombre de pions à aligner pour gagner
+
+    Returns:
+        Connect4: La position (dimensions déduites du texte, trait déduit du nombre de pions)
+    """
+    lines = text.split('/')
+    cols = len(lines[0])
+    if any(len(line) != cols for line in lines):
+        raise ValueError("toutes les lignes du plateau doivent avoir la même longueur")
+    try:
+        # Première ligne du texte = ligne du haut = dernière ligne du tableau
+        board = np.array([[BOARD_SYMBOLS[cell] for cell in line] for line in reversed(lines)], dtype=int)
+    except KeyError as e:
+        raise ValueError(f"symbole inconnu : {e.args[0]!r}")
+    # Gravité : pas de case vide sous un pion
+    if np.any((board[:-1] == EMPTY) & (board[1:] != EMPTY)):
+        raise ValueError("pion posé au-dessus d'une case vide")
+    count_1 = int(np.sum(board == PLAYER_1))
+    count_2 = int(np.sum(board == PLAYER_2))
+    if count_1 - count_2 not in (0, 1):
+        raise ValueError("nombres de pions incohérents (PLAYER_1 joue en premier)")
+
+    game = Connect4(len(lines), cols, connect)
+    game.board = board
+    game.turn = PLAYER_1 if count_1 == count_2 else PLAYER_2
+    return game
+
+
+def parse_position(text, rows=ROWS, cols=COLS, connect=CONNECT):
+    """
+    Crée une position à partir d'une ligne d'entrée
+
+    Args:
+        text (str): Colonnes jouées ('3342' ou '3,3,4,2') ou plateau (contient '/')
+        rows (int): Nombre de lignes (colonnes jouées uniquement)
+        cols (int): Nombre de colonnes (colonnes jouées uniquement)
+        connect (int): Nombre de pions à aligner pour gagner
+
+    Returns:
+        Connect4: La position
+    """
+    if '/' in text:
+        return board_from_text(text, connect)
+    if ',' in text or ' ' in text:
+        moves = [int(col) for col in text.replace(',', ' ').split()]
+    else:
+        moves = text
+    return Connect4.from_moves(moves, rows, cols, connect)
+
+
+def analyze_position(game, depth, columns=True, tt=None, ordering=DEFAULT_STRATEGY):
+    """
+    Analyse une position, PLAYER_2 au trait
+
+    Avec columns, chaque coup est cherché avec une fenêtre complète : son
+    score est exact à la profondeur demandée (et non une simple borne
+    comme après une coupure Alpha-Beta). Le meilleur coup est celui de
+    meilleur score, le plus central à égalité.
+
+    Args:
+        game (Connect4): Position (remise dans son état à la fin)
+        depth (int): Profondeur de recherche
+        columns (bool): Calculer le score de chaque colonne (sinon, une seule recherche)
+        tt (TranspositionTable): Table de transposition (None = aucune)
+        ordering (str): Stratégie d'ordonnancement des coups
+
+    Returns:
+        dict: Colonne, score, scores par colonne (None pour un coup impossible),
+              nœuds explorés et élagués
+    """
+    if not columns:
+        col, score, stats = find_best_move_alphabeta(game, depth, tt=tt, use_tt=tt is not None,
+                                                     ordering=ordering, endgame_threshold=None)
+        return {'column': col, 'score': score, 'column_scores': None,
+                'nodes': stats['nodes_explored'], 'pruned': stats['nodes_pruned']}
+
+    orderer = make_orderer(ordering)
+    orderer.start_search(game)
+    ctx = SearchContext(tt, orderer)
+    column_scores = [None] * game.geometry.cols
+    best_col, best_score = None, -math.inf
+    for col in sorted(game.legal_moves(), key=game.geometry.center_rank.__getitem__):
+        game.play(col, PLAYER_2)
+        score, _ = alphabeta(game, depth - 1, -math.inf, math.inf, False, ctx)
+        game.undo()
+        column_scores[col] = score
+        if score > best_score:
+            best_col, best_score = col, score
+    return {'column': best_col, 'score': best_score, 'column_scores': column_scores,
+            'nodes': ctx.nodes_explored, 'pruned': ctx.nodes_pruned}
+
+
+def _init_worker(tt_size_mb):
+    """Initialise un processus d'analyse (sa table de transposition est gardée)"""
+    global _tt
+    _tt = TranspositionTable(tt_size_mb) if tt_size_mb > 0 else None
+
+
+def _analyze_chunk(chunk, depth, geometry, columns):
+    """
+    Analyse un paquet de positions (exécutée dans le pool)
+
+    Les erreurs (position invalide ou terminée) sont rendues dans
+    l'enregistrement de la position : le reste du fichier continue.
+
+    Args:
+        chunk (list): (numéro de ligne, texte) des positions
+        depth (int): Profondeur de recherche
+        geometry (tuple): (lignes, colonnes, alignement) des positions écrites en colonnes jouées
+        columns (bool): Calculer le score de chaque colonne
+
+    Returns:
+        list: Un enregistrement par position, dans l'ordre du paquet
+    """
+    records = []
+    for line_number, text in chunk:
+        start_time = time.perf_counter()
+        record = {'line': line_number, 'input': text}
+        try:
+            game = parse_position(text, *geometry)
+        except ValueError as e:
+            record['error'] = f"position invalide : {e}"
+            records.append(record)
+            continue
+        if game.is_terminal_node():
+            record['error'] = "la partie est terminée"
+            records.append(record)
+            continue
+
+        # Les recherches jouent pour PLAYER_2 : un PLAYER_1 au trait prend sa place
+        to_move = game.turn
+        if to_move == PLAYER_1:
+            game = game.swapped()
+        if _tt is not None:
+            _tt.clear()  # Même résultat et mêmes compteurs quel que soit le processus
+        record['to_move'] = to_move
+        record.update(analyze_position(game, depth, columns, _tt))
+        record['time'] = round(time.perf_counter() - start_time, 4)
+        records.append(record)
+    return records
+
+
+def _chunked(iterable, size):
+    """Découpe un itérable en listes de size éléments (la dernière peut être plus courte)"""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def analyze_stream(positions, output, depth=DEFAULT_DEPTH, workers=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                   geometry=(ROWS, COLS, CONNECT), columns=True, tt_size_mb=ANALYSIS_TT_MB):
+    """
+    Analyse des positions en parallèle et écrit les résultats dans l'ordre
+
+    Au plus workers * TASKS_PER_WORKER paquets sont entre la lecture et
+    l'écriture : un paquet terminé en avance attend que les précédents
+    soient écrits, et la lecture attend qu'il y ait de la place.
+
+    Args:
+        positions: Itérable de (numéro de ligne, texte), par exemple read_positions(fichier)
+        output: Fichier texte où écrire une ligne JSON par position
+        depth (int): Profondeur de recherche
+        workers (int): Nombre de processus (par défaut : nombre de cœurs)
+        chunk_size (int): Positions par paquet
+        geometry (tuple): (lignes, colonnes, alignement) des positions écrites en colonnes jouées
+        columns (bool): Calculer le score de chaque colonne
+        tt_size_mb (float): Table de transposition de chaque processus (0 = aucune)
+
+    Returns:
+        dict: Nombre de positions, erreurs, nœuds, temps et débit
+    """
+    start_time = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = workers * TASKS_PER_WORKER
+    chunks = enumerate(_chunked(positions, chunk_size))
+
+    analyzed = errors = nodes = 0
+    pending = {}    # Future -> numéro du paquet
+    finished = {}   # Numéro du paquet -> enregistrements (terminé, pas encore écrit)
+    next_chunk = 0  # Prochain paquet à écrire
+    submitted = 0
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(tt_size_mb,)) as executor:
+        while True:
+            # Remplir jusqu'à la limite (comptée depuis le prochain paquet à écrire)
+            while submitted - next_chunk < max_in_flight:
+                entry = next(chunks, None)
+                if entry is None:
+                    break
+                index, chunk = entry
+                pending[executor.submit(_analyze_chunk, chunk, depth, geometry, columns)] = index
+                submitted += 1
+            if not pending:
+                break
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                finished[pending.pop(future)] = future.result()
+
+            # Écrire les paquets terminés qui suivent le dernier écrit
+            while next_chunk in finished:
+                for record in finished.pop(next_chunk):
+                    output.write(json.dumps(record, separators=(',', ':')) + '\n')
+                    if 'error' in record:
+                        errors += 1
+                    else:
+                        analyzed += 1
+                        nodes += record['nodes']
+                output.flush()
+                next_chunk += 1
+
+    elapsed = time.perf_counter() - start_time
+    return {
+        'positions': analyzed,
+        'errors': errors,
+        'nodes': nodes,
+        'time': elapsed,
+        'positions_per_sec': analyzed / elapsed if elapsed > 0 else 0.0,
+        'workers': workers
+    }
+
+
+def main():
+    """Analyse un fichier de positions en ligne de commande"""
+    parser = argparse.ArgumentParser(description="Analyse en série d'un fichier de positions")
+    parser.add_argument('input', nargs='?', default='-', help="Fichier de positions ('-' = entrée standard)")
+    parser.add_argument('--output', default='-', help="Fichier JSONL à écrire ('-' = sortie standard)")
+    parser.add_argument('--depth', type=int, default=DEFAULT_DEPTH, help="Profondeur de recherche")
+    parser.add_argument('--workers', type=int, default=None, help="Nombre de processus")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help="Positions par paquet")
+    parser.add_argument('--best-only', action='store_true',
+                        help="Seulement le meilleur coup (une recherche par position, sans score par colonne)")
+    parser.add_argument('--tt-mb', type=float, default=ANALYSIS_TT_MB,
+                        help="Table de transposition par processus en Mo (0 = aucune)")
+    parser.add_argument('--rows', type=int, default=ROWS, help="Lignes (positions en colonnes jouées)")
+    parser.add_argument('--cols', type=int, default=COLS, help="Colonnes (positions en colonnes jouées)")
+    parser.add_argument('--connect', type=int, default=CONNECT, help="Pions à aligner pour gagner")
+    args = parser.parse_args()
+    if args.depth < 1 or args.chunk_size < 1:
+        parser.error("--depth et --chunk-size doivent être positifs")
+
+    source = sys.stdin if args.input == '-' else open(args.input, encoding='utf-8')
+    output = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    try:
+        summary = analyze_stream(read_positions(source), output, args.depth, args.workers, args.chunk_size,
+                                 (args.rows, args.cols, args.connect), not args.best_only, args.tt_mb)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if output is not sys.stdout:
+            output.close()
+
+    # Le résumé va sur la sortie d'erreur : la sortie standard peut contenir les résultats
+    print(f"✓ {summary['positions']} positions analysées ({summary['errors']} erreurs) en "
+          f"{summary['time']:.1f}s : {summary['positions_per_sec']:.1f} positions/s, "
+          f"{summary['nodes']:,} nœuds, {summary['workers']} processus", file=sys.stderr)
+
+
+# EXPLICATION DE L'ANALYSE EN SÉRIE :
+"""
+FLUX :
+------
+read_positions (générateur) -> _chunked (paquets) -> pool de processus
+-> tampon de remise en ordre -> une ligne JSON par position.
+Rien n'est lu à l'avance au-delà de la limite de paquets en cours : un
+fichier de plusieurs millions de positions s'analyse avec la même
+mémoire qu'un fichier de dix lignes.
+
+ORDRE DE SORTIE :
+-----------------
+Les paquets ne se terminent pas dans l'ordre (positions plus ou moins
+longues à chercher). Un paquet terminé attend dans `finished` que tous
+les précédents soient écrits. La limite de paquets en cours est comptée
+à partir du prochain paquet à écrire : un paquet lent bloque la lecture
+au lieu de laisser grossir le tampon.
+
+SCORE DE CHAQUE COLONNE :
+-------------------------
+Une recherche Alpha-Beta classique ne donne que le score du meilleur
+coup : les autres sont coupés dès qu'ils sont moins bons (bornes). Ici
+chaque coup de la racine est cherché avec la fenêtre complète ; la table
+de transposition et l'ordonnancement (coups meurtriers, historique)
+restent partagés entre les colonnes, ce qui limite le surcoût.
+--best-only revient à une seule recherche par position.
+
+POINT DE VUE :
+--------------
+Les scores sont ceux du joueur au trait (to_move) : une position où
+PLAYER_1 joue est cherchée échangée (Connect4.swapped), comme dans
+selfplay.py. Le solveur de fin de partie n'est pas utilisé : tous les
+scores sont ceux d'Alpha-Beta à la profondeur demandée.
+"""
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,356 @@
+"""
+benchmark.py
+Banc d'essai des algorithmes sur un ensemble fixe de positions
+
+Chaque couple (algorithme, profondeur) est lancé plusieurs fois sur des
+positions d'ouverture, de milieu et de fin de partie. Le temps est
+mesuré avec time.perf_counter et résumé par la médiane et le 95e
+centile ; on en déduit les nœuds par seconde et le facteur de
+branchement effectif. Les résultats sont écrits en JSON et comparés à
+une référence enregistrée pour détecter les régressions.
+
+Avec --scaling, la même mesure est faite sur des plateaux plus grands et
+des alignements plus longs, avec la mémoire des tables et de la recherche.
+
+Exemple : python benchmark.py --output bench.json --baseline bench_reference.json
+"""
+
+import argparse
+import json
+import math
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+from game import Connect4, Geometry, ROWS, COLS, CONNECT
+from engine import ALGORITHMS
+
+# Version de l'ensemble de positions : à incrémenter dès qu'une position change
+# (les résultats de versions différentes ne sont pas comparables)
+SUITE_VERSION = 1
+
+# Positions de test : colonnes jouées depuis le plateau vide (PLAYER_1 en premier),
+# toujours avec l'IA (PLAYER_2) au trait
+POSITIONS = {
+    'opening-1': '3',
+    'opening-2': '334',
+    'opening-3': '32453',
+    'middlegame-1': '264135333222435',
+    'middlegame-2': '126133233245211',
+    'middlegame-3': '222231333345444',
+    'middlegame-4': '062431323323253',
+    'endgame-1': '1441243040632316356534561',
+    'endgame-2': '3422106502434024450551556',
+    'endgame-3': '3646633441164364103211406',
+}
+
+# Couples (algorithme, profondeur) mesurés par défaut
+DEFAULT_CASES = [('minimax', 4), ('alphabeta', 6), ('negamax', 6), ('alphabeta', 8)]
+
+# Nombre de mesures par position
+DEFAULT_REPEATS = 5
+
+# Ralentissement toléré par rapport à la référence (10 %)
+DEFAULT_THRESHOLD = 0.10
+
+# Géométries (lignes, colonnes, alignement) mesurées par --scaling
+SCALING_GEOMETRIES = [(6, 7, 4), (7, 8, 4), (8, 9, 4), (6, 7, 5)]
+
+# Couples (algorithme, profondeur) mesurés sur chaque géométrie
+SCALING_CASES = [('alphabeta', 6), ('negamax', 6)]
+
+# Positions de --scaling : colonnes jouées, en décalage par rapport à la colonne centrale
+# (valables quelle que soit la largeur du plateau)
+SCALING_POSITIONS = {
+    'opening-1': (0,),
+    'opening-2': (0, 0, 1),
+    'opening-3': (0, -1, 1, 0, 0),
+}
+
+
+def percentile(values, fraction):
+    """
+    Centile par la méthode du rang le plus proche
+
+    Args:
+        values (list): Mesures
+        fraction (float): Centile voulu (0.95 pour le 95e centile)
+
+    Returns:
+        float: La valeur du centile
+    """
+    ordered = sorted(values)
+    rank = max(1, math.ceil(fraction * len(ordered)))
+    return ordered[rank - 1]
+
+
+def benchmark_position(algorithm, depth, moves, repeats=DEFAULT_REPEATS, geometry=(ROWS, COLS, CONNECT)):
+    """
+    Mesure un algorithme sur une position
+
+    Args:
+        algorithm (str): 'minimax', 'alphabeta' ou 'negamax'
+        depth (int): Profondeur de recherche
+        moves (str ou list): Colonnes jouées depuis le plateau vide
+        repeats (int): Nombre de mesures
+        geometry (tuple): (lignes, colonnes, alignement) du plateau
+
+    Returns:
+        dict: Coup, nœuds, temps médian et 95e centile, nœuds/s et facteur de branchement
+    """
+    search = ALGORITHMS[algorithm]
+    game = Connect4.from_moves(moves, *geometry)
+    times = []
+    for _ in range(repeats):
+        position = game.copy()
+        start_time = time.perf_counter()
+        col, score, stats = search(position, depth)
+        times.append(time.perf_counter() - start_time)
+
+    nodes = stats['nodes_explored']
+    median_time = statistics.median(times)
+    return {
+        'column': col,
+        'score': score,
+        'nodes': nodes,
+        'median_time': median_time,
+        'p95_time': percentile(times, 0.95),
+        'nodes_per_sec': nodes / median_time if median_time > 0 else 0.0,
+        # Facteur de branchement effectif : b tel que b^profondeur = nœuds
+        'ebf': nodes ** (1 / depth) if depth > 0 else 0.0
+    }
+
+
+def run_suite(cases=DEFAULT_CASES, repeats=DEFAULT_REPEATS, positions=POSITIONS, verbose=True):
+    """
+    Lance tout le banc d'essai
+
+    Args:
+        cases (list): Couples (algorithme, profondeur)
+        repeats (int): Nombre de mesures par position
+        positions (dict): Positions à mesurer, par identifiant
+        verbose (bool): Afficher chaque résultat
+
+    Returns:
+        dict: Résultats complets (sérialisables en JSON)
+    """
+    results = []
+    if verbose:
+        print(f"\n{'Algorithme':<10} │ {'Prof.':>5} │ {'Position':<13} │ {'Nœuds':>8} │ {'Médiane':>8} │ "
+              f"{'p95':>8} │ {'Nœuds/s':>9} │ {'EBF':>5}")
+        print("─"*88)
+    for algorithm, depth in cases:
+        for position_id, moves in positions.items():
+            result = benchmark_position(algorithm, depth, moves, repeats)
+            result.update({'algorithm': algorithm, 'depth': depth, 'position': position_id})
+            results.append(result)
+            if verbose:
+                print(f"{algorithm:<10} │ {depth:>5} │ {position_id:<13} │ {result['nodes']:>8,} │ "
+                      f"{result['median_time']:>8.4f} │ {result['p95_time']:>8.4f} │ "
+                      f"{result['nodes_per_sec']:>9,.0f} │ {result['ebf']:>5.2f}")
+        if verbose:
+            print("─"*88)
+
+    return {
+        'suite_version': SUITE_VERSION,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'repeats': repeats,
+        'results': results
+    }
+
+
+def measure_memory(algorithm, depth, moves, geometry):
+    """
+    Mémoire des tables d'une géométrie et pic de mémoire d'une recherche
+    (mesures séparées de celles du temps : tracemalloc ralentit l'exécution)
+
+    Args:
+        algorithm (str): 'minimax', 'alphabeta' ou 'negamax'
+        depth (int): Profondeur de recherche
+        moves (list): Colonnes jouées depuis le plateau vide
+        geometry (tuple): (lignes, colonnes, alignement) du plateau
+
+    Returns:
+        dict: 'tables_kb' (tables de la géométrie) et 'search_peak_kb'
+              (pic pendant la recherche, table de transposition comprise)
+    """
+    game = Connect4.from_moves(moves, *geometry)
+    Geometry(*geometry)  # Premier appel hors mesure (allocations faites une seule fois par processus)
+    tracemalloc.start()
+    try:
+        # Construite à part : get_geometry() renverrait les tables déjà en cache
+        tables = Geometry(*geometry)
+        tables_size = tracemalloc.get_traced_memory()[0]
+        del tables
+        tracemalloc.reset_peak()
+        start_size = tracemalloc.get_traced_memory()[0]
+        ALGORITHMS[algorithm](game, depth)
+        search_peak = tracemalloc.get_traced_memory()[1] - start_size
+    finally:
+        tracemalloc.stop()
+    return {'tables_kb': tables_size / 1024, 'search_peak_kb': search_peak / 1024}
+
+
+def run_scaling(geometries=SCALING_GEOMETRIES, cases=SCALING_CASES, repeats=DEFAULT_REPEATS,
+                positions=SCALING_POSITIONS, verbose=True):
+    """
+    Mesure l'évolution des performances avec la taille du plateau et la longueur de l'alignement
+
+    Args:
+        geometries (list): Triplets (lignes, colonnes, alignement)
+        cases (list): Couples (algorithme, profondeur)
+        repeats (int): Nombre de mesures par position
+        positions (dict): Positions (décalages par rapport au centre), par identifiant
+        verbose (bool): Afficher chaque résultat
+
+    Returns:
+        dict: Résultats complets (sérialisables en JSON, comparables avec find_regressions)
+    """
+    results = []
+    if verbose:
+        print(f"\n{'Plateau':<9} │ {'Algorithme':<10} │ {'Prof.':>5} │ {'Position':<10} │ {'Nœuds':>8} │ "
+              f"{'Médiane':>8} │ {'Nœuds/s':>9} │ {'EBF':>5} │ {'Tables':>8} │ {'Pic':>8}")
+        print("─"*104)
+    for rows, cols, connect in geometries:
+        label = f"{rows}x{cols}-{connect}"
+        for algorithm, depth in cases:
+            for position_id, offsets in positions.items():
+                moves = [cols // 2 + offset for offset in offsets]
+                result = benchmark_position(algorithm, depth, moves, repeats, (rows, cols, connect))
+                result.update(measure_memory(algorithm, depth, moves, (rows, cols, connect)))
+                result.update({'algorithm': algorithm, 'depth': depth,
+                               'position': f"{label}/{position_id}",
+                               'rows': rows, 'cols': cols, 'connect': connect})
+                results.append(result)
+                if verbose:
+                    print(f"{label:<9} │ {algorithm:<10} │ {depth:>5} │ {position_id:<10} │ "
+                          f"{result['nodes']:>8,} │ {result['median_time']:>8.4f} │ "
+                          f"{result['nodes_per_sec']:>9,.0f} │ {result['ebf']:>5.2f} │ "
+                          f"{result['tables_kb']:>6.0f}ko │ {result['search_peak_kb']:>6.0f}ko")
+        if verbose:
+            print("─"*104)
+
+    return {
+        'suite_version': SUITE_VERSION,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'repeats': repeats,
+        'results': results
+    }
+
+
+def find_regressions(report, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Compare un rapport à la référence
+
+    Une mesure est en régression si son temps médian dépasse celui de la
+    référence de plus de threshold, ou si elle explore plus de nœuds
+    (le nombre de nœuds ne dépend pas de la machine : toute hausse compte).
+
+    Args:
+        report (dict): Résultats de run_suite()
+        baseline (dict): Résultats de référence
+        threshold (float): Ralentissement toléré (0.10 = 10 %)
+
+    Returns:
+        list: Une description par régression
+    """
+    if baseline['suite_version'] != report['suite_version']:
+        raise ValueError(f"Référence de la version {baseline['suite_version']} des positions, "
+                         f"banc d'essai en version {report['suite_version']}")
+
+    reference = {(r['algorithm'], r['depth'], r['position']): r for r in baseline['results']}
+    regressions = []
+    for result in report['results']:
+        key = (result['algorithm'], result['depth'], result['position'])
+        if key not in reference:
+            continue
+        base = reference[key]
+        if result['median_time'] > base['median_time'] * (1 + threshold):
+            regressions.append({
+                'algorithm': key[0], 'depth': key[1], 'position': key[2], 'metric': 'median_time',
+                'baseline': base['median_time'], 'value': result['median_time'],
+                'change': result['median_time'] / base['median_time'] - 1
+            })
+        if result['nodes'] > base['nodes']:
+            regressions.append({
+                'algorithm': key[0], 'depth': key[1], 'position': key[2], 'metric': 'nodes',
+                'baseline': base['nodes'], 'value': result['nodes'],
+                'change': result['nodes'] / base['nodes'] - 1
+            })
+    return regressions
+
+
+def main():
+    """Lance le banc d'essai en ligne de commande (code de sortie 1 en cas de régression)"""
+    parser = argparse.ArgumentParser(description="Banc d'essai des algorithmes")
+    parser.add_argument('--output', default='benchmark.json', help="Fichier de résultats JSON")
+    parser.add_argument('--baseline', default=None, help="Référence à comparer")
+    parser.add_argument('--save-baseline', default=None, help="Enregistrer aussi les résultats comme référence")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help="Ralentissement toléré")
+    parser.add_argument('--repeats', type=int, default=DEFAULT_REPEATS, help="Mesures par position")
+    parser.add_argument('--scaling', action='store_true',
+                        help="Mesurer les plateaux plus grands et l'alignement de 5 (SCALING_GEOMETRIES)")
+    args = parser.parse_args()
+
+    report = run_scaling(repeats=args.repeats) if args.scaling else run_suite(repeats=args.repeats)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"✓ Résultats écrits dans {args.output}")
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"✓ Référence écrite dans {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = find_regressions(report, baseline, args.threshold)
+        if not regressions:
+            print(f"✓ Aucune régression (seuil {args.threshold * 100:.0f} %)")
+            return
+        print(f"\n✗ {len(regressions)} régression(s) :")
+        for r in regressions:
+            print(f"  {r['algorithm']} prof. {r['depth']} {r['position']} : {r['metric']} "
+                  f"{r['baseline']:.4g} -> {r['value']:.4g} ({r['change'] * 100:+.1f} %)")
+        sys.exit(1)
+
+
+# EXPLICATION DU BANC D'ESSAI :
+"""
+POURQUOI PLUSIEURS MESURES :
+----------------------------
+Une seule mesure avec time.time() dépend de l'activité de la machine au
+même moment. On répète chaque recherche et on garde la MÉDIANE (peu
+sensible à une mesure aberrante) et le 95e centile (les pires cas).
+
+MESURES :
+---------
+- nœuds          : ne dépend pas de la machine, détecte les changements d'algorithme
+- nœuds/seconde  : vitesse brute du code (jeu, heuristique)
+- EBF            : facteur de branchement effectif, nœuds^(1/profondeur) ;
+                   7 sans élagage, plus il est petit, mieux l'arbre est élagué
+
+PASSAGE À L'ÉCHELLE (--scaling) :
+---------------------------------
+Sur 7x8, 8x9 ou avec un alignement de 5, chaque nœud a plus de coups,
+l'évaluation plus de fenêtres, et les tables (fenêtres, lignes par case,
+clés de Zobrist) grandissent avec le nombre de cases. On mesure donc, par
+géométrie : nœuds/seconde, facteur de branchement, mémoire des tables
+(construites une fois par géométrie) et pic de mémoire d'une recherche.
+
+RÉGRESSIONS :
+-------------
+Les résultats sont comparés à une référence enregistrée (--save-baseline)
+avec la même version des positions (SUITE_VERSION). Un temps médian plus
+lent que le seuil, ou plus de nœuds, est signalé.
+"""
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,298 @@
+"""
+book.py
+Bibliothèque d'ouvertures pour l'IA
+
+Les premiers coups sont les plus coûteux à chercher (plateau vide, 7 coups
+possibles à chaque niveau) et pourtant toujours les mêmes. Ils sont donc
+calculés une fois pour toutes, par une recherche profonde hors ligne, et
+rangés dans un fichier binaire trié par hachage de Zobrist. Pendant la
+partie, le fichier est lu avec mmap : seules les pages consultées sont
+chargées, et les processus qui ouvrent le même fichier partagent ces pages.
+
+Construction : python book.py [--ply 4] [--depth 8] [--workers N]
+"""
+
+import argparse
+import mmap
+import os
+import struct
+import time
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+
+from game import Connect4, PLAYER_2, DEFAULT_GEOMETRY
+from alphabeta import find_best_move_alphabeta
+
+# En-tête : signature, version, nombre de coups joués couverts, profondeur de recherche, nombre d'entrées
+BOOK_MAGIC = b'C4BK'
+BOOK_VERSION = 1
+HEADER_FORMAT = '<4sHBBI'
+HEADER_SIZE = 16  # En-tête aligné sur la taille d'une entrée
+
+# Entrée : hachage de Zobrist, score, colonne (+ 3 octets de bourrage)
+RECORD_FORMAT = '<QiB3x'
+RECORD_SIZE = struct.calcsize(RECORD_FORMAT)
+
+# Paramètres par défaut de la construction
+BOOK_PLY = 4     # Positions de moins de 4 pions
+BOOK_DEPTH = 8   # Profondeur de la recherche hors ligne
+
+# Fichier utilisé par défaut (à côté des sources)
+DEFAULT_BOOK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'opening_book.bin')
+
+
+class OpeningBook:
+    """
+    Bibliothèque d'ouvertures en lecture seule, projetée en mémoire avec mmap
+
+    Les entrées sont triées par hachage : une recherche est une recherche
+    dichotomique directement dans les pages du fichier, sans rien charger
+    au démarrage.
+    """
+
+    def __init__(self, path=DEFAULT_BOOK_PATH):
+        """
+        Args:
+            path (str): Chemin du fichier construit par build_book()
+        """
+        self.path = path
+        with open(path, 'rb') as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self.mm) < HEADER_SIZE:
+            raise ValueError(f"Fichier de bibliothèque invalide : {path}")
+        magic, version, self.ply, self.depth, self.size = struct.unpack_from(HEADER_FORMAT, self.mm, 0)
+        if magic != BOOK_MAGIC or version != BOOK_VERSION:
+            raise ValueError(f"Fichier de bibliothèque invalide : {path}")
+        if len(self.mm) != HEADER_SIZE + self.size * RECORD_SIZE:
+            raise ValueError(f"Fichier de bibliothèque tronqué : {path}")
+
+        # Statistiques
+        self.hits = 0    # Positions trouvées
+        self.misses = 0  # Positions absentes
+
+    def __getstate__(self):
+        # Transmis aux processus par son chemin : chacun projette le même fichier
+        return {'path': self.path}
+
+    def __setstate__(self, state):
+        self.__init__(state['path'])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self.size
+
+    def _key_at(self, index):
+        """Hachage de l'entrée numéro index"""
+        return struct.unpack_from('<Q', self.mm, HEADER_SIZE + index * RECORD_SIZE)[0]
+
+    def __getitem__(self, index):
+        # Permet à bisect de chercher directement dans le fichier
+        return self._key_at(index)
+
+    def lookup(self, game):
+        """
+        Cherche la position dans la bibliothèque
+
+        Args:
+            game (Connect4): Position, avec l'IA (PLAYER_2) au trait
+
+        Returns:
+            tuple: (colonne, score) ou None si la position est absente
+        """
+        if game.geometry is not DEFAULT_GEOMETRY:
+            return None  # La bibliothèque ne contient que des positions du plateau standard
+        index = bisect_left(self, game.hash, 0, self.size)
+        if index < self.size and self._key_at(index) == game.hash:
+            _, score, col = struct.unpack_from(RECORD_FORMAT, self.mm, HEADER_SIZE + index * RECORD_SIZE)
+            if game.is_valid_location(col):
+                self.hits += 1
+                return col, score
+        self.misses += 1
+        return None
+
+    def probe(self, game):
+        """
+        Résultat complet d'une recherche pour une position de la bibliothèque
+        (utilisé par find_best_move_minimax et find_best_move_alphabeta)
+
+        Args:
+            game (Connect4): État actuel du jeu
+
+        Returns:
+            tuple: (meilleure_colonne, score, statistiques) ou None
+        """
+        entry = self.lookup(game)
+        if entry is None:
+            return None
+        col, score = entry
+        return col, score, {
+            'nodes_explored': 0,
+            'nodes_pruned': 0,
+            'max_depth': 0,
+            'book_hit': True,
+            'book_depth': self.depth
+        }
+
+    def close(self):
+        """Libère la projection du fichier"""
+        self.mm.close()
+
+
+def default_book():
+    """
+    Ouvre la bibliothèque par défaut si elle a été construite
+
+    Returns:
+        OpeningBook: La bibliothèque, ou None si le fichier n'existe pas
+    """
+    if not os.path.exists(DEFAULT_BOOK_PATH):
+        return None
+    return OpeningBook(DEFAULT_BOOK_PATH)
+
+
+def book_positions(ply=BOOK_PLY):
+    """
+    Énumère les positions de moins de ply pions où l'IA (PLAYER_2) est au trait
+
+    Les transpositions (même position atteinte par des ordres de coups
+    différents) ne sont gardées qu'une fois.
+
+    Args:
+        ply (int): Nombre de pions maximal (exclu)
+
+    Returns:
+        list: Une séquence de colonnes par position (PLAYER_1 joue en premier)
+    """
+    positions = {}
+    visited = set()
+    game = Connect4()
+
+    def explore(sequence):
+        if game.hash in visited or game.is_terminal_node():
+            return
+        visited.add(game.hash)
+        if game.turn == PLAYER_2:
+            positions[game.hash] = tuple(sequence)
+        if len(sequence) + 1 >= ply:
+            return
+        for col in game.get_valid_locations():
+            game.play(col)
+            sequence.append(col)
+            explore(sequence)
+            sequence.pop()
+            game.undo()
+
+    explore([])
+    return list(positions.values())
+
+
+def _search_position(sequence, depth):
+    """
+    Recherche profonde d'une position (exécutée dans un processus)
+
+    Args:
+        sequence (tuple): Colonnes jouées depuis le plateau vide
+        depth (int): Profondeur de recherche
+
+    Returns:
+        tuple: (hachage, score, colonne)
+    """
+    game = Connect4()
+    for col in sequence:
+        game.play(col)
+    col, score, _ = find_best_move_alphabeta(game, depth)
+    return game.hash, int(score), col
+
+
+def build_book(path=DEFAULT_BOOK_PATH, ply=BOOK_PLY, depth=BOOK_DEPTH, workers=None):
+    """
+    Construit la bibliothèque : recherche chaque position en parallèle
+    et écrit le fichier trié par hachage
+
+    Args:
+        path (str): Fichier à écrire
+        ply (int): Positions de moins de ply pions
+        depth (int): Profondeur de la recherche Alpha-Beta
+        workers (int): Nombre de processus (par défaut : nombre de cœurs)
+
+    Returns:
+        dict: Nombre de positions, temps de construction et taille du fichier
+    """
+    start_time = time.perf_counter()
+    sequences = book_positions(ply)
+    workers = workers or os.cpu_count() or 1
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        chunksize = max(1, len(sequences) // (workers * 4))
+        records = list(executor.map(_search_position, sequences, [depth] * len(sequences),
+                                    chunksize=chunksize))
+    records.sort()
+
+    # Écrire dans un fichier temporaire puis le renommer : un lecteur ne voit jamais de fichier partiel
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        header = struct.pack(HEADER_FORMAT, BOOK_MAGIC, BOOK_VERSION, ply, depth, len(records))
+        f.write(header.ljust(HEADER_SIZE, b'\0'))
+        for key, score, col in records:
+            f.write(struct.pack(RECORD_FORMAT, key, score, col))
+    os.replace(tmp_path, path)
+
+    return {
+        'positions': len(records),
+        'build_time': time.perf_counter() - start_time,
+        'file_size': HEADER_SIZE + len(records) * RECORD_SIZE
+    }
+
+
+def main():
+    """Construit la bibliothèque d'ouvertures en ligne de commande"""
+    parser = argparse.ArgumentParser(description="Construit la bibliothèque d'ouvertures")
+    parser.add_argument('--output', default=DEFAULT_BOOK_PATH, help="Fichier à écrire")
+    parser.add_argument('--ply', type=int, default=BOOK_PLY, help="Positions de moins de PLY pions")
+    parser.add_argument('--depth', type=int, default=BOOK_DEPTH, help="Profondeur de recherche")
+    parser.add_argument('--workers', type=int, default=None, help="Nombre de processus")
+    args = parser.parse_args()
+
+    print(f"Construction de la bibliothèque (positions < {args.ply} pions, profondeur {args.depth})...")
+    result = build_book(args.output, args.ply, args.depth, args.workers)
+    print(f"✓ {result['positions']} positions en {result['build_time']:.1f}s "
+          f"({result['file_size']:,} octets) -> {args.output}")
+
+
+# EXPLICATION DE LA BIBLIOTHÈQUE D'OUVERTURES :
+"""
+FORMAT DU FICHIER :
+-------------------
+En-tête (16 octets) : 'C4BK' | version | ply | profondeur | nombre d'entrées
+Puis une entrée de 16 octets par position, triée par hachage :
+
+    hachage de Zobrist (8 octets) | score (4 octets) | colonne (1 octet) | bourrage
+
+Le hachage suffit à identifier la position : le joueur au trait se déduit
+du nombre de pions, et la bibliothèque ne contient que des positions où
+l'IA (PLAYER_2) joue.
+
+LECTURE AVEC MMAP :
+-------------------
+Le fichier n'est pas chargé : il est projeté en mémoire et la recherche
+dichotomique (log2(n) lectures) ne touche que quelques pages. Ces pages
+sont celles du cache du système : tous les processus qui projettent le
+même fichier (processus de calcul, pool parallèle) les partagent.
+
+CONSTRUCTION :
+--------------
+Les positions sont énumérées depuis le plateau vide (en fusionnant les
+transpositions), puis chacune est cherchée à grande profondeur par
+Alpha-Beta dans un ProcessPoolExecutor. Le score enregistré est celui de
+cette recherche profonde, quelle que soit la profondeur demandée en partie.
+"""
+
+
+if __name__ == "__main__":
+    main()
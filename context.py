@@ -0,0 +1,103 @@
+"""
+context.py
+Contexte d'une recherche : statistiques, limites et tables
+
+Chaque appel à find_best_move_* crée son propre SearchContext et le
+transmet à tous les nœuds de la recherche. Deux recherches lancées en
+même temps (threads, serveur, réflexion pendant le tour du joueur) ne
+partagent donc plus aucun compteur.
+"""
+
+import time
+
+# Le chronomètre et l'événement d'arrêt ne sont consultés que tous les TIME_CHECK_INTERVAL nœuds
+TIME_CHECK_INTERVAL = 256
+
+
+class SearchTimeout(Exception):
+    """
+    Levée quand le temps alloué à la recherche est écoulé ou qu'un arrêt est demandé
+
+    Les nœuds déjà explorés par la recherche interrompue y sont ajoutés en
+    remontant (nodes, pruned) pour être comptés dans les statistiques.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.nodes = 0
+        self.pruned = 0
+
+
+class SearchContext:
+    """
+    État propre à une recherche, passé en paramètre à chaque nœud
+
+    __slots__ : pas de dictionnaire par instance, l'accès aux compteurs
+    est aussi rapide que possible dans la boucle de recherche.
+    """
+
+    __slots__ = ('nodes_explored', 'nodes_pruned', 'max_depth_reached', 'tt_cutoffs',
+                 'pvs_researches', 'aspiration_failures', 'deadline', 'stop_event',
+                 'tt', 'orderer')
+
+    def __init__(self, tt=None, orderer=None, deadline=None, stop_event=None):
+        """
+        Args:
+            tt (TranspositionTable): Table de transposition (None pour la désactiver)
+            orderer (MoveOrderer): Stratégie d'ordonnancement des coups (None = ordre 0..6)
+            deadline (float): Instant limite (time.perf_counter), None = pas de limite
+            stop_event (Event): Événement d'arrêt (threading/multiprocessing.Event), None = aucun
+        """
+        self.nodes_explored = 0       # Nombre de nœuds explorés
+        self.nodes_pruned = 0         # Nombre de coupures
+        self.max_depth_reached = 0    # Profondeur maximale atteinte
+        self.tt_cutoffs = 0           # Nœuds résolus par la table de transposition
+        self.pvs_researches = 0       # Recherches relancées après une fenêtre nulle (Negamax)
+        self.aspiration_failures = 0  # Fenêtres d'aspiration à élargir (Negamax)
+        self.deadline = deadline
+        self.stop_event = stop_event
+        self.tt = tt
+        self.orderer = orderer
+
+    def add_counts(self, nodes, pruned, depth):
+        """
+        Ajoute les compteurs d'une recherche depuis la racine (une fois par
+        racine ou par itération, jamais à chaque nœud)
+
+        Args:
+            nodes (int): Nœuds explorés
+            pruned (int): Coupures
+            depth (int): Profondeur de la racine
+        """
+        self.nodes_explored += nodes
+        self.nodes_pruned += pruned
+        if depth > self.max_depth_reached:
+            self.max_depth_reached = depth
+
+    def should_stop(self):
+        """
+        Returns:
+            bool: True si le temps est écoulé ou qu'un arrêt est demandé
+        """
+        return ((self.deadline is not None and time.perf_counter() > self.deadline)
+                or (self.stop_event is not None and self.stop_event.is_set()))
+
+
+# EXPLICATION DU CONTEXTE DE RECHERCHE :
+"""
+POURQUOI PAS DE STATISTIQUES GLOBALES :
+---------------------------------------
+Avec un objet `stats` global par module, deux recherches simultanées dans
+le même processus écrivaient dans les mêmes compteurs (et se remettaient
+à zéro l'une l'autre). Le contexte appartient à une seule recherche.
+
+COÛT DANS LA BOUCLE :
+---------------------
+Le contexte est une variable locale de chaque nœud : plus de recherche
+du nom global `stats` à chaque nœud. Les nœuds et les coupures ne sont
+pas non plus écrits dans le contexte à chaque nœud : chaque nœud rend
+les compteurs de son sous-arbre à son parent (variables locales), et la
+racine les ajoute au contexte une seule fois (add_counts). Les tests
+d'arrêt (chronomètre, événement) sont faits quand le nombre de nœuds
+d'un sous-arbre franchit un multiple de TIME_CHECK_INTERVAL.
+"""
@@ -0,0 +1,679 @@
+"""
+dataset.py
+Format binaire compact pour stocker des positions (parties, analyses)
+
+Un plateau NumPy 6x7 d'entiers 64 bits occupe 336 octets. Ici une
+position est stockée sous forme de deux bitboards (un par joueur, 8
+octets chacun sur le plateau standard) et du joueur au trait, avec en
+option son score, le
+résultat de la partie et la suite de coups qui y mène (deux coups par
+octet). Le fichier est lu avec numpy.memmap : on peut parcourir ou
+consulter au hasard des millions de positions sans charger le fichier.
+
+Disposition du fichier :
+    en-tête (32 octets) | enregistrements de taille fixe | coups (taille variable)
+
+Exemples :
+    python dataset.py from-selfplay parties.jsonl parties.c4ds --every-ply
+    python dataset.py from-analysis analyse.jsonl analyse.c4ds
+    python dataset.py info parties.c4ds
+"""
+
+import argparse
+import json
+import os
+import shutil
+import struct
+
+import numpy as np
+
+from game import Connect4, ROWS, COLS, CONNECT, PLAYER_1, PLAYER_2, EMPTY, get_geometry
+
+# En-tête : signature, version, lignes, colonnes, alignement, options, mots de 64 bits par
+# bitboard, nombre de positions, taille de la zone des coups (en octets)
+DATASET_MAGIC = b'C4DS'
+DATASET_VERSION = 2
+HEADER_FORMAT = '<4sHBBBBBxQQ'
+HEADER_SIZE = 32
+
+# Options (champ facultatif présent dans chaque enregistrement)
+HAS_SCORES = 1   # Score de la position (int32, point de vue du joueur au trait)
+HAS_MOVES = 2    # Suite de coups depuis le plateau vide
+HAS_RESULTS = 4  # Résultat de la partie (0 = nul ou inconnu, 1 ou 2 = gagnant)
+
+# Nombre de coups d'une position dont la suite de coups n'est pas connue (plateau seul)
+MOVES_UNKNOWN = 0xFFFF
+
+# Enregistrements gardés en mémoire avant d'être écrits
+WRITE_BATCH = 4096
+
+# Positions converties à la fois par Dataset.iter_boards
+DEFAULT_BATCH_SIZE = 65536
+
+
+def bitboard_words(geometry):
+    """
+    Returns:
+        int: Nombre de mots de 64 bits d'un bitboard (1 sur le plateau standard)
+    """
+    return (geometry.cols * geometry.col_height + 63) // 64
+
+
+def record_dtype(words=1, flags=HAS_MOVES):
+    """
+    Type NumPy d'un enregistrement (sans alignement : les champs se suivent)
+
+    Args:
+        words (int): Mots de 64 bits par bitboard
+        flags (int): Options du fichier (HAS_SCORES, HAS_MOVES, HAS_RESULTS)
+
+    Returns:
+        numpy.dtype: Champs p1, p2, turn, puis score, result, plies et moves_offset selon les options
+    """
+    bitboard = ('<u8', (words,)) if words > 1 else ('<u8',)
+    fields = [('p1',) + bitboard, ('p2',) + bitboard, ('turn', 'u1')]
+    if flags & HAS_SCORES:
+        fields.append(('score', '<i4'))
+    if flags & HAS_RESULTS:
+        fields.append(('result', 'u1'))
+    if flags & HAS_MOVES:
+        fields.append(('plies', '<u2'))
+        fields.append(('moves_offset', '<u8'))
+    return np.dtype(fields)
+
+
+def split_words(bitboard, words):
+    """Découpe un bitboard en mots de 64 bits (le mot de poids faible en premier)"""
+    if words == 1:
+        return bitboard
+    return tuple((bitboard >> (64 * i)) & 0xFFFFFFFFFFFFFFFF for i in range(words))
+
+
+def join_words(value):
+    """Reconstitue un bitboard à partir d'un champ p1 ou p2 (entier ou tableau de mots)"""
+    if np.ndim(value) == 0:
+        return int(value)
+    return sum(int(word) << (64 * i) for i, word in enumerate(value))
+
+
+def pack_moves(moves, cols=COLS):
+    """
+    Encode une suite de coups : deux par octet jusqu'à 16 colonnes, un par octet au-delà
+
+    Args:
+        moves (list): Colonnes jouées
+        cols (int): Nombre de colonnes du plateau
+
+    Returns:
+        bytes: Les coups encodés
+    """
+    if cols > 16:
+        return bytes(moves)
+    moves = list(moves)
+    if len(moves) % 2:
+        moves.append(0)
+    return bytes(moves[i] << 4 | moves[i + 1] for i in range(0, len(moves), 2))
+
+
+def unpack_moves(data, plies, cols=COLS):
+    """
+    Décode une suite de coups encodée par pack_moves
+
+    Args:
+        data (bytes): Octets des coups
+        plies (int): Nombre de coups
+        cols (int): Nombre de colonnes du plateau
+
+    Returns:
+        list: Colonnes jouées
+    """
+    if cols > 16:
+        return list(data[:plies])
+    moves = []
+    for byte in data[:(plies + 1) // 2]:
+        moves.append(byte >> 4)
+        moves.append(byte & 0xF)
+    return moves[:plies]
+
+
+def replay_moves(moves, geometry):
+    """
+    Rejoue une suite de coups directement sur les bitboards (sans Connect4)
+
+    Args:
+        moves (list): Colonnes jouées depuis le plateau vide (PLAYER_1 en premier)
+        geometry (Geometry): Géométrie du plateau
+
+    Returns:
+        tuple: (bitboard de PLAYER_1, bitboard de PLAYER_2)
+    """
+    bitboards = [0, 0]
+    heights = [0] * geometry.cols
+    for ply, col in enumerate(moves):
+        if not 0 <= col < geometry.cols or heights[col] == geometry.rows:
+            raise ValueError(f"Coup invalide : {col}")
+        bitboards[ply % 2] |= 1 << (col * geometry.col_height + heights[col])
+        heights[col] += 1
+    return bitboards[0], bitboards[1]
+
+
+def game_from_bitboards(p1, p2, geometry, turn=None):
+    """
+    Crée une position à partir des bitboards des deux joueurs
+
+    Args:
+        p1 (int): Bitboard de PLAYER_1
+        p2 (int): Bitboard de PLAYER_2
+        geometry (Geometry): Géométrie du plateau
+        turn (int): Joueur au trait (None = déduit du nombre de pions)
+
+    Returns:
+        Connect4: La position (sans pile de coups)
+    """
+    game = Connect4(geometry.rows, geometry.cols, geometry.connect)
+    board = np.zeros((geometry.rows, geometry.cols), dtype=int)
+    for piece, bits in ((PLAYER_1, p1), (PLAYER_2, p2)):
+        while bits:
+            low = bits & -bits
+            index = low.bit_length() - 1
+            board[index % geometry.col_height][index // geometry.col_height] = piece
+            bits ^= low
+    game.board = board
+    if turn is None:
+        # Le joueur qui a un pion de plus vient de jouer (les deux sens pour une position échangée)
+        turn = PLAYER_2 if bin(p1).count('1') > bin(p2).count('1') else PLAYER_1
+    game.turn = turn
+    return game
+
+
+def boards_to_bitboards(boards):
+    """
+    Convertit un lot de plateaux NumPy en bitboards (version vectorisée)
+
+    Args:
+        boards (numpy.ndarray): Tableau (N, lignes, colonnes) de plateaux
+
+    Returns:
+        tuple: (bitboards de PLAYER_1, bitboards de PLAYER_2), tableaux uint64
+               de forme (N,) ou (N, mots) au-delà de 64 bits
+    """
+    boards = np.asarray(boards)
+    n, rows, cols = boards.shape
+    col_height = rows + 1
+    words = (cols * col_height + 63) // 64
+    p1 = np.zeros((n, words), dtype=np.uint64)
+    p2 = np.zeros((n, words), dtype=np.uint64)
+    for col in range(cols):
+        for row in range(rows):
+            index = col * col_height + row
+            word, bit = divmod(index, 64)
+            cell = boards[:, row, col]
+            p1[:, word] |= (cell == PLAYER_1).astype(np.uint64) << np.uint64(bit)
+            p2[:, word] |= (cell == PLAYER_2).astype(np.uint64) << np.uint64(bit)
+    if words == 1:
+        return p1[:, 0], p2[:, 0]
+    return p1, p2
+
+
+def bitboards_to_boards(p1, p2, geometry):
+    """
+    Convertit des bitboards en plateaux NumPy (version vectorisée)
+
+    Args:
+        p1 (numpy.ndarray): Bitboards de PLAYER_1, forme (N,) ou (N, mots)
+        p2 (numpy.ndarray): Bitboards de PLAYER_2
+        geometry (Geometry): Géométrie du plateau
+
+    Returns:
+        numpy.ndarray: Tableau (N, lignes, colonnes) int8 (ligne 0 = bas du plateau)
+    """
+    p1 = np.asarray(p1, dtype=np.uint64)
+    p2 = np.asarray(p2, dtype=np.uint64)
+    if p1.ndim == 1:
+        p1, p2 = p1[:, None], p2[:, None]
+    boards = np.zeros((len(p1), geometry.rows, geometry.cols), dtype=np.int8)
+    one = np.uint64(1)
+    for col in range(geometry.cols):
+        for row in range(geometry.rows):
+            word, bit = divmod(col * geometry.col_height + row, 64)
+            bit = np.uint64(bit)
+            boards[:, row, col] = (((p1[:, word] >> bit) & one) * PLAYER_1 +
+                                   ((p2[:, word] >> bit) & one) * PLAYER_2).astype(np.int8)
+    return boards
+
+
+class DatasetWriter:
+    """
+    Écrit un fichier de positions au fur et à mesure (à fermer avec close()
+    ou à utiliser avec `with`)
+
+    Les enregistrements et les coups sont écrits dans deux fichiers
+    temporaires, réunis à la fermeture : un lecteur ne voit jamais de
+    fichier partiel.
+    """
+
+    def __init__(self, path, rows=ROWS, cols=COLS, connect=CONNECT, scores=False, moves=True, results=False):
+        """
+        Args:
+            path (str): Fichier à écrire
+            rows (int): Nombre de lignes
+            cols (int): Nombre de colonnes
+            connect (int): Nombre de pions à aligner pour gagner
+            scores (bool): Enregistrer un score par position
+            moves (bool): Enregistrer la suite de coups de chaque position
+            results (bool): Enregistrer le résultat de la partie
+        """
+        self.path = path
+        self.geometry = get_geometry(rows, cols, connect)
+        self.words = bitboard_words(self.geometry)
+        self.flags = (HAS_SCORES if scores else 0) | (HAS_MOVES if moves else 0) | (HAS_RESULTS if results else 0)
+        self.dtype = record_dtype(self.words, self.flags)
+        self.count = 0
+        self.moves_size = 0
+        self.buffer = []
+        self.tmp_path = path + '.tmp'
+        self.moves_path = path + '.moves.tmp'
+        self.file = open(self.tmp_path, 'wb')
+        self.file.write(b'\0' * HEADER_SIZE)  # En-tête écrit à la fermeture
+        self.moves_file = open(self.moves_path, 'wb') if moves else None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc_info):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def __len__(self):
+        return self.count
+
+    def add(self, game, score=None, result=None, moves=None):
+        """
+        Ajoute une position
+
+        Args:
+            game (Connect4): Position (de la même géométrie que le fichier)
+            score (int): Score (obligatoire si le fichier a des scores)
+            result (int): Résultat de la partie (EMPTY, PLAYER_1 ou PLAYER_2)
+            moves (list): Coups menant à la position (par défaut game.moves s'ils
+                          y mènent bien ; sinon la suite est marquée inconnue)
+        """
+        if game.geometry is not self.geometry:
+            raise ValueError("La position n'a pas la géométrie du fichier")
+        p1, p2 = game.bitboards[PLAYER_1], game.bitboards[PLAYER_2]
+        record = [split_words(p1, self.words), split_words(p2, self.words), game.turn]
+        if self.flags & HAS_SCORES:
+            if score is None:
+                raise ValueError("Le fichier enregistre un score par position")
+            record.append(int(score))
+        if self.flags & HAS_RESULTS:
+            record.append(EMPTY if result is None else int(result))
+        if self.flags & HAS_MOVES:
+            record.extend(self._store_moves(p1, p2, game.turn, game.moves if moves is None else moves,
+                                            moves is None))
+        self.buffer.append(tuple(record))
+        self.count += 1
+        if len(self.buffer) >= WRITE_BATCH:
+            self._flush()
+
+    def _store_moves(self, p1, p2, turn, moves, implicit):
+        """Écrit les coups d'une position et rend (nombre de coups, position dans la zone des coups)"""
+        moves = [int(col) for col in moves]
+        try:
+            matches = (replay_moves(moves, self.geometry) == (p1, p2)
+                       and turn == (PLAYER_1 if len(moves) % 2 == 0 else PLAYER_2))
+        except ValueError:
+            matches = False
+        if not matches:
+            if not implicit:
+                raise ValueError("Les coups ne mènent pas à la position")
+            # Position posée avec drop_piece, ou échangée (Connect4.swapped) : coups inconnus
+            return MOVES_UNKNOWN, self.moves_size
+        offset = self.moves_size
+        data = pack_moves(moves, self.geometry.cols)
+        self.moves_file.write(data)
+        self.moves_size += len(data)
+        return len(moves), offset
+
+    def _flush(self):
+        """Écrit les enregistrements en attente"""
+        if self.buffer:
+            self.file.write(np.array(self.buffer, dtype=self.dtype).tobytes())
+            self.buffer = []
+
+    def close(self):
+        """Termine le fichier : coups à la suite des enregistrements, en-tête, puis renommage"""
+        if self.file is None:
+            return
+        self._flush()
+        if self.moves_file is not None:
+            self.moves_file.close()
+            with open(self.moves_path, 'rb') as f:
+                shutil.copyfileobj(f, self.file)
+            os.remove(self.moves_path)
+        geometry = self.geometry
+        header = struct.pack(HEADER_FORMAT, DATASET_MAGIC, DATASET_VERSION, geometry.rows, geometry.cols,
+                             geometry.connect, self.flags, self.words, self.count, self.moves_size)
+        self.file.seek(0)
+        self.file.write(header.ljust(HEADER_SIZE, b'\0'))
+        self.file.close()
+        self.file = None
+        os.replace(self.tmp_path, self.path)
+
+    def abort(self):
+        """Abandonne l'écriture (les fichiers temporaires sont supprimés)"""
+        if self.file is None:
+            return
+        self.file.close()
+        self.file = None
+        os.remove(self.tmp_path)
+        if self.moves_file is not None:
+            self.moves_file.close()
+            os.remove(self.moves_path)
+
+
+class Dataset:
+    """
+    Fichier de positions en lecture seule, projeté en mémoire
+
+    records est un tableau NumPy structuré lu directement dans le fichier
+    (champs p1, p2, turn et, selon le fichier, score, result, plies,
+    moves_offset) : seules les pages consultées sont chargées.
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str): Fichier écrit par DatasetWriter
+        """
+        self.path = path
+        with open(path, 'rb') as f:
+            header = f.read(HEADER_SIZE)
+        if len(header) < HEADER_SIZE:
+            raise ValueError(f"Fichier de positions invalide : {path}")
+        (magic, version, rows, cols, connect, self.flags, self.words,
+         self.count, self.moves_size) = struct.unpack_from(HEADER_FORMAT, header)
+        if magic != DATASET_MAGIC or version != DATASET_VERSION:
+            raise ValueError(f"Fichier de positions invalide : {path}")
+        self.geometry = get_geometry(rows, cols, connect)
+        self.dtype = record_dtype(self.words, self.flags)
+        moves_start = HEADER_SIZE + self.count * self.dtype.itemsize
+        if os.path.getsize(path) != moves_start + self.moves_size:
+            raise ValueError(f"Fichier de positions tronqué : {path}")
+
+        # Un fichier vide ne peut pas être projeté en mémoire
+        if self.count:
+            self.records = np.memmap(path, dtype=self.dtype, mode='r', offset=HEADER_SIZE, shape=(self.count,))
+        else:
+            self.records = np.zeros(0, dtype=self.dtype)
+        if self.moves_size:
+            self.moves_data = np.memmap(path, dtype=np.uint8, mode='r', offset=moves_start,
+                                        shape=(self.moves_size,))
+        else:
+            self.moves_data = np.zeros(0, dtype=np.uint8)
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        return self.game(index)
+
+    def __iter__(self):
+        for index in range(self.count):
+            yield self.game(index)
+
+    @property
+    def scores(self):
+        """Scores des positions (tableau projeté), None si le fichier n'en a pas"""
+        return self.records['score'] if self.flags & HAS_SCORES else None
+
+    @property
+    def turns(self):
+        """Joueur au trait de chaque position (tableau projeté)"""
+        return self.records['turn']
+
+    @property
+    def results(self):
+        """Résultats des parties (tableau projeté), None si le fichier n'en a pas"""
+        return self.records['result'] if self.flags & HAS_RESULTS else None
+
+    def bitboards(self, index):
+        """
+        Returns:
+            tuple: (bitboard de PLAYER_1, bitboard de PLAYER_2) de la position index
+        """
+        record = self.records[index]
+        return join_words(record['p1']), join_words(record['p2'])
+
+    def moves(self, index):
+        """
+        Returns:
+            list: Coups menant à la position index, None s'ils ne sont pas connus
+        """
+        if not self.flags & HAS_MOVES:
+            return None
+        record = self.records[index]
+        plies = int(record['plies'])
+        if plies == MOVES_UNKNOWN:
+            return None
+        offset = int(record['moves_offset'])
+        size = plies if self.geometry.cols > 16 else (plies + 1) // 2
+        return unpack_moves(self.moves_data[offset:offset + size].tobytes(), plies, self.geometry.cols)
+
+    def game(self, index):
+        """
+        Position numéro index (rejouée coup par coup si les coups sont connus :
+        la pile de coups permet alors undo())
+
+        Returns:
+            Connect4: La position
+        """
+        if not -self.count <= index < self.count:
+            raise IndexError(index)
+        moves = self.moves(index)
+        geometry = self.geometry
+        if moves is not None:
+            return Connect4.from_moves(moves, geometry.rows, geometry.cols, geometry.connect)
+        return game_from_bitboards(*self.bitboards(index), geometry, int(self.records[index]['turn']))
+
+    def boards(self, start=0, stop=None):
+        """
+        Plateaux NumPy d'un intervalle de positions (par exemple pour heuristic.evaluate_positions)
+
+        Args:
+            start (int): Première position
+            stop (int): Position de fin (exclue, None = fin du fichier)
+
+        Returns:
+            numpy.ndarray: Tableau (N, lignes, colonnes) int8
+        """
+        records = self.records[start:stop]
+        return bitboards_to_boards(records['p1'], records['p2'], self.geometry)
+
+    def iter_boards(self, batch_size=DEFAULT_BATCH_SIZE):
+        """
+        Parcourt le fichier par paquets de plateaux NumPy (mémoire bornée)
+
+        Yields:
+            tuple: (indice de la première position, tableau (N, lignes, colonnes))
+        """
+        for start in range(0, self.count, batch_size):
+            yield start, self.boards(start, start + batch_size)
+
+    def info(self):
+        """
+        Returns:
+            dict: Géométrie, options, nombre de positions et taille par position
+        """
+        size = os.path.getsize(self.path)
+        geometry = self.geometry
+        return {
+            'path': self.path,
+            'geometry': (geometry.rows, geometry.cols, geometry.connect),
+            'positions': self.count,
+            'scores': bool(self.flags & HAS_SCORES),
+            'moves': bool(self.flags & HAS_MOVES),
+            'results': bool(self.flags & HAS_RESULTS),
+            'record_size': self.dtype.itemsize,
+            'file_size': size,
+            'bytes_per_position': (size - HEADER_SIZE) / self.count if self.count else 0.0,
+            # Même positions en plateaux NumPy d'entiers 64 bits
+            'numpy_bytes_per_position': geometry.rows * geometry.cols * 8
+        }
+
+
+def write_dataset(path, games, scores=None, results=None, rows=ROWS, cols=COLS, connect=CONNECT):
+    """
+    Écrit des positions en une fois
+
+    Args:
+        path (str): Fichier à écrire
+        games: Itérable de positions (Connect4)
+        scores: Itérable de scores (None = pas de score)
+        results: Itérable de résultats (None = pas de résultat)
+
+    Returns:
+        int: Nombre de positions écrites
+    """
+    with DatasetWriter(path, rows, cols, connect, scores=scores is not None,
+                       results=results is not None) as writer:
+        scores = iter(scores) if scores is not None else None
+        results = iter(results) if results is not None else None
+        for game in games:
+            writer.add(game, None if scores is None else next(scores),
+                       None if results is None else next(results))
+    return len(writer)
+
+
+def from_selfplay(source, path, every_ply=False):
+    """
+    Convertit un fichier de parties de selfplay.py (.jsonl ou .bin)
+
+    Args:
+        source (str): Fichier de parties
+        path (str): Fichier de positions à écrire
+        every_ply (bool): Une position après chaque coup (sinon la position finale de chaque partie)
+
+    Returns:
+        int: Nombre de positions écrites
+    """
+    from selfplay import read_records
+
+    records, _ = read_records(source)
+    with DatasetWriter(path, results=True) as writer:
+        for record in records:
+            game = Connect4()
+            if every_ply:
+                writer.add(game, result=record['result'])
+            for col in record['moves']:
+                game.play(int(col))
+                if every_ply:
+                    writer.add(game, result=record['result'])
+            if not every_ply:
+                writer.add(game, result=record['result'])
+    return len(writer)
+
+
+def from_analysis(source, path, rows=ROWS, cols=COLS, connect=CONNECT):
+    """
+    Convertit un fichier de résultats de analyze.py (les lignes en erreur sont ignorées)
+
+    Args:
+        source (str): Fichier JSONL écrit par analyze.py
+        path (str): Fichier de positions à écrire (scores du joueur au trait)
+        rows (int): Nombre de lignes (positions écrites en colonnes jouées)
+        cols (int): Nombre de colonnes
+        connect (int): Nombre de pions à aligner pour gagner
+
+    Returns:
+        int: Nombre de positions écrites
+    """
+    from analyze import parse_position
+
+    with open(source, encoding='utf-8') as f, \
+            DatasetWriter(path, rows, cols, connect, scores=True) as writer:
+        for line in f:
+            record = json.loads(line)
+            if 'error' not in record:
+                writer.add(parse_position(record['input'], rows, cols, connect), record['score'])
+    return len(writer)
+
+
+def main():
+    """Conversion et description des fichiers de positions en ligne de commande"""
+    parser = argparse.ArgumentParser(description="Fichiers de positions compacts")
+    commands = parser.add_subparsers(dest='command', required=True)
+    selfplay_parser = commands.add_parser('from-selfplay', help="Convertir des parties de selfplay.py")
+    selfplay_parser.add_argument('source', help="Fichier de parties (.jsonl ou .bin)")
+    selfplay_parser.add_argument('output', help="Fichier de positions à écrire")
+    selfplay_parser.add_argument('--every-ply', action='store_true', help="Une position après chaque coup")
+    analysis_parser = commands.add_parser('from-analysis', help="Convertir des résultats de analyze.py")
+    analysis_parser.add_argument('source', help="Fichier JSONL de analyze.py")
+    analysis_parser.add_argument('output', help="Fichier de positions à écrire")
+    for name, default in (('--rows', ROWS), ('--cols', COLS), ('--connect', CONNECT)):
+        analysis_parser.add_argument(name, type=int, default=default)
+    info_parser = commands.add_parser('info', help="Décrire un fichier de positions")
+    info_parser.add_argument('path', help="Fichier de positions")
+    args = parser.parse_args()
+
+    if args.command == 'from-selfplay':
+        count = from_selfplay(args.source, args.output, args.every_ply)
+        print(f"✓ {count} positions -> {args.output}")
+    elif args.command == 'from-analysis':
+        count = from_analysis(args.source, args.output, args.rows, args.cols, args.connect)
+        print(f"✓ {count} positions -> {args.output}")
+    else:
+        info = Dataset(args.path).info()
+        rows, cols, connect = info['geometry']
+        options = [name for name in ('scores', 'moves', 'results') if info[name]]
+        print(f"{info['path']} : {info['positions']:,} positions {rows}x{cols} (alignement de {connect}), "
+              f"options : {', '.join(options) or 'aucune'}")
+        print(f"{info['file_size']:,} octets, {info['bytes_per_position']:.1f} octets par position "
+              f"(enregistrement {info['record_size']} octets, plateau NumPy {info['numpy_bytes_per_position']} octets)")
+
+
+# EXPLICATION DU FORMAT DE POSITIONS :
+"""
+ENREGISTREMENT :
+----------------
+    p1 (8 octets) | p2 (8 octets) | trait (1) | score (4) | résultat (1) | nb de coups (2) | début des coups (8)
+Seuls p1, p2 et le trait sont toujours présents ; les autres champs
+dépendent des options de l'en-tête. Le trait ne se déduit pas toujours
+des bitboards : dans une position échangée (Connect4.swapped), c'est
+PLAYER_1 qui a un pion de plus et il est au trait, et le score enregistré
+est celui de ce joueur. Les bitboards suivent la disposition de game.py
+(bit colonne * (lignes + 1) + ligne) ; au-delà de 64 bits (plateaux plus
+grands), chaque bitboard occupe plusieurs mots. Sur le plateau standard,
+une position avec sa suite de coups occupe une quarantaine d'octets au
+lieu de 336.
+
+COUPS :
+-------
+Zone de taille variable après les enregistrements, deux coups par octet
+(comme le format binaire de selfplay.py). Chaque enregistrement donne le
+nombre de coups et leur position dans la zone : l'accès reste direct.
+Une position connue seulement par son plateau (drop_piece, plateau lu
+par analyze.py, position échangée) a un nombre de coups MOVES_UNKNOWN ;
+elle est alors reconstruite à partir des bitboards et du trait.
+
+LECTURE AVEC MEMMAP :
+---------------------
+Dataset.records est un tableau NumPy structuré projeté sur le fichier :
+dataset.scores.mean() ou dataset.records['p1'][i] ne lisent que les pages
+nécessaires. Dataset.boards() et iter_boards() convertissent les
+bitboards en plateaux par opérations sur tableaux (par paquets), prêts
+pour heuristic.evaluate_positions.
+
+ÉCRITURE :
+----------
+DatasetWriter ajoute les positions au fil de l'eau (par paquets de
+WRITE_BATCH) et ne connaît le nombre de positions qu'à la fin : l'en-tête
+est écrit en dernier, puis le fichier temporaire est renommé, comme pour
+la bibliothèque d'ouvertures.
+"""
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+"""
+endgame.py
+Solveur exact de fin de partie
+
+Quand il reste peu de cases vides, l'arbre complet est assez petit pour
+être exploré jusqu'au bout : plus besoin de l'heuristique à l'horizon.
+Le solveur cherche directement sur les bitboards (sans objet Connect4),
+avec sa propre table de transposition, et donne le résultat exact
+(victoire, nul ou défaite) avec la distance de la victoire.
+"""
+
+from game import ROWS, COLS, PLAYER_2, DEFAULT_GEOMETRY, BOTTOM_MASK, BOARD_MASK, COL_HEIGHT, COLUMN_MASK, DIRECTIONS
+from transposition import TranspositionTable, EXACT, LOWER_BOUND, UPPER_BOUND
+from ordering import CENTER_ORDER
+
+# Nombre total de cases
+CELLS = ROWS * COLS
+
+# Le solveur prend le relais quand il reste au plus ENDGAME_THRESHOLD cases vides
+ENDGAME_THRESHOLD = 16
+
+# Score d'Alpha-Beta pour une victoire (le solveur y ajoute la distance)
+WIN_SCORE = 100000000
+
+# Multiplicateur impair puis repli des bits de poids fort : mélange les bits de la clé
+# sans créer de collision (sinon les bits de poids faible, qui indexent la table,
+# ne dépendraient que des premières colonnes)
+KEY_MULTIPLIER = 0x9E3779B97F4A7C15
+KEY_MASK = (1 << 64) - 1
+
+# Cases de chaque colonne, du centre vers les bords
+CENTER_COLUMNS = [(col, COLUMN_MASK << (col * COL_HEIGHT)) for col in CENTER_ORDER]
+
+
+def winning_cells(position, mask):
+    """
+    Cases vides qui complèteraient un alignement de 4 pour le joueur position
+
+    Args:
+        position (int): Bitboard du joueur
+        mask (int): Bitboard de toutes les cases occupées
+
+    Returns:
+        int: Bitboard des cases gagnantes (jouables ou non)
+    """
+    # Verticale : seulement 3 pions en dessous
+    r = (position << 1) & (position << 2) & (position << 3)
+    for shift in DIRECTIONS:
+        if shift == 1:
+            continue
+        # Case vide à droite de 3 pions, ou entre 1 et 2 pions
+        p = (position << shift) & (position << 2 * shift)
+        r |= p & (position << 3 * shift)
+        r |= p & (position >> shift)
+        # Case vide à gauche de 3 pions, ou entre 2 et 1 pions
+        p = (position >> shift) & (position >> 2 * shift)
+        r |= p & (position << shift)
+        r |= p & (position >> 3 * shift)
+    return r & (BOARD_MASK ^ mask)
+
+
+def popcount(bitboard):
+    """Nombre de bits à 1"""
+    return bin(bitboard).count('1')
+
+
+class EndgameSolver:
+    """
+    Solveur exact (Negamax Alpha-Beta jusqu'à la fin de la partie)
+
+    Score du point de vue du joueur qui joue :
+    - victoire : nombre de cases encore vides après le coup gagnant + 1
+      (plus la victoire est proche, plus le score est grand)
+    - nul : 0
+    - défaite : l'opposé
+    La table est conservée d'un appel à l'autre : les scores sont exacts,
+    ils ne dépendent pas d'une profondeur. Un solveur gardé d'un coup à
+    l'autre de la partie (paramètre endgame_solver des recherches) réutilise
+    donc ses résultats.
+    """
+
+    def __init__(self, tt_size_mb=16):
+        """
+        Args:
+            tt_size_mb (float): Taille de la table de transposition (en Mo)
+        """
+        self.tt = TranspositionTable(tt_size_mb)
+        self.nodes_explored = 0
+
+    def negamax(self, current, mask, moves, alpha, beta):
+        """
+        Score exact d'une position (du point de vue du joueur qui joue)
+
+        Args:
+            current (int): Bitboard du joueur qui joue
+            mask (int): Bitboard de toutes les cases occupées
+            moves (int): Nombre de pions sur le plateau
+            alpha (int): Borne inférieure
+            beta (int): Borne supérieure
+
+        Returns:
+            int: Score de la position (exact si alpha < score < beta)
+        """
+        self.nodes_explored += 1
+        if moves == CELLS:
+            return 0
+
+        possible = (mask + BOTTOM_MASK) & BOARD_MASK
+        if winning_cells(current, mask) & possible:
+            return CELLS - moves
+
+        # Menaces immédiates de l'adversaire : il faut les bloquer
+        opponent = current ^ mask
+        threats = winning_cells(opponent, mask)
+        forced = possible & threats
+        if forced:
+            if forced & (forced - 1):
+                return -(CELLS - moves - 1)  # Deux menaces : défaite au coup suivant
+            possible = forced
+        # Ne pas jouer sous une case gagnante de l'adversaire
+        playable = possible & ~(threats >> 1)
+        if not playable:
+            return -(CELLS - moves - 1)
+
+        # Bornes : ni victoire ni défaite au prochain coup
+        lower = -(CELLS - moves - 3) if moves + 4 <= CELLS else 0
+        upper = CELLS - moves - 2 if moves + 3 <= CELLS else 0
+
+        key = ((current + mask) * KEY_MULTIPLIER) & KEY_MASK
+        key ^= key >> 32
+        alpha_orig = alpha
+        hash_move = None
+        entry = self.tt.probe(key)
+        if entry is not None:
+            _, tt_score, tt_flag, hash_move = entry
+            if tt_flag == EXACT:
+                return tt_score
+            elif tt_flag == LOWER_BOUND:
+                lower = max(lower, tt_score)
+            else:
+                upper = min(upper, tt_score)
+        alpha = max(alpha, lower)
+        beta = min(beta, upper)
+        if alpha >= beta:
+            return alpha
+
+        # Ordre : coup de la table, puis les coups qui créent le plus de menaces, puis le centre
+        candidates = []
+        for col, column in CENTER_COLUMNS:
+            bit = playable & column
+            if bit:
+                threats_created = popcount(winning_cells(current | bit, mask | bit))
+                candidates.append((col != hash_move, -threats_created, len(candidates), col, bit))
+        candidates.sort()
+
+        value = -CELLS
+        best_col = candidates[0][3]
+        for _, _, _, col, bit in candidates:
+            score = -self.negamax(opponent, mask | bit, moves + 1, -beta, -alpha)
+            if score > value:
+                value = score
+                best_col = col
+            alpha = max(alpha, value)
+            if alpha >= beta:
+                break
+
+        if value <= alpha_orig:
+            flag = UPPER_BOUND
+        elif value >= beta:
+            flag = LOWER_BOUND
+        else:
+            flag = EXACT
+        self.tt.store(key, CELLS - moves, value, flag, best_col)
+        return value
+
+    def solve(self, game, piece=PLAYER_2):
+        """
+        Trouve le meilleur coup exact pour piece
+
+        Args:
+            game (Connect4): Position (piece doit être au trait)
+            piece (int): Joueur qui joue
+
+        Returns:
+            tuple: (meilleure_colonne, score du solveur)
+        """
+        self.nodes_explored = 1
+        current = game.bitboards[piece]
+        mask = game.mask
+        moves = popcount(mask)
+
+        possible = (mask + BOTTOM_MASK) & BOARD_MASK
+        if winning_cells(current, mask) & possible:
+            for col, column in CENTER_COLUMNS:
+                if winning_cells(current, mask) & possible & column:
+                    return col, CELLS - moves
+
+        best_col, best_score = None, -CELLS - 1
+        for col, column in CENTER_COLUMNS:
+            bit = possible & column
+            if not bit:
+                continue
+            # Fenêtre [meilleur score, +CELLS] : un coup qui ne fait pas mieux est vite écarté
+            score = -self.negamax(current ^ mask, mask | bit, moves + 1, -CELLS, -best_score)
+            if score > best_score:
+                best_col, best_score = col, score
+        return best_col, best_score
+
+
+def empty_cells(game):
+    """Nombre de cases vides du plateau"""
+    return CELLS - popcount(game.mask)
+
+
+def to_engine_score(score):
+    """
+    Convertit un score du solveur à l'échelle d'Alpha-Beta
+    (victoire = 100000000 + distance, nul = 0)
+
+    Args:
+        score (int): Score du solveur
+
+    Returns:
+        int: Score du point de vue de l'IA
+    """
+    if score > 0:
+        return WIN_SCORE + score
+    if score < 0:
+        return -WIN_SCORE + score
+    return 0
+
+
+def solve_endgame(game, threshold=ENDGAME_THRESHOLD, solver=None):
+    """
+    Résout la position exactement s'il reste au plus threshold cases vides
+    (utilisé par les recherches avant de lancer Alpha-Beta)
+
+    Args:
+        game (Connect4): État actuel du jeu (l'IA, PLAYER_2, au trait)
+        threshold (int): Nombre de cases vides maximal (None pour désactiver)
+        solver (EndgameSolver): Solveur à utiliser (un nouveau solveur par défaut ;
+                                le garder d'un coup à l'autre conserve sa table)
+
+    Returns:
+        tuple: (meilleure_colonne, score, statistiques) ou None si la
+               position n'est pas une fin de partie
+    """
+    # Les tables du solveur sont celles du plateau standard
+    if threshold is None or game.geometry is not DEFAULT_GEOMETRY or game.is_terminal_node():
+        return None
+    remaining = empty_cells(game)
+    if remaining > threshold:
+        return None
+
+    if solver is None:
+        solver = EndgameSolver()
+    else:
+        solver.tt.reset_stats()
+    col, score = solver.solve(game, PLAYER_2)
+    result_stats = {
+        'nodes_explored': solver.nodes_explored,
+        'nodes_pruned': 0,
+        'max_depth': remaining,
+        'endgame': True,
+        'endgame_empty_cells': remaining,
+        'endgame_score': score
+    }
+    result_stats.update(solver.tt.get_stats())
+    return col, to_engine_score(score), result_stats
+
+
+# EXPLICATION DU SOLVEUR DE FIN DE PARTIE :
+"""
+POURQUOI UN SOLVEUR :
+---------------------
+Alpha-Beta s'arrête à une profondeur fixe et estime la position avec
+l'heuristique. En fin de partie, il reste si peu de cases que l'arbre
+entier peut être exploré : le résultat est alors exact, et l'IA ne fait
+plus d'erreur.
+
+SCORE AVEC DISTANCE :
+---------------------
+Une victoire vaut (cases vides après le coup gagnant + 1) : gagner vite
+vaut plus que gagner tard, et perdre tard vaut mieux que perdre vite.
+Converti pour Alpha-Beta : 100000000 + distance (voir to_engine_score).
+
+ACCÉLÉRATIONS :
+---------------
+- Cases gagnantes calculées par décalages de bits (winning_cells)
+- Une menace adverse doit être bloquée ; deux menaces = défaite
+- On ne joue jamais sous une case gagnante de l'adversaire
+- Bornes sur le score : personne ne peut gagner avant 2 coups
+- Table de transposition propre au solveur, conservée entre les coups
+  par celui qui garde le solveur (moteur, parties IA contre IA, pools)
+- Coups qui créent le plus de menaces explorés en premier
+"""
@@ -0,0 +1,332 @@
+"""
+engine.py
+Recherche de l'IA en arrière-plan
+
+L'interface Pygame ne doit jamais attendre la fin d'une recherche : sinon
+la fenêtre ne traite plus ses événements et le système la déclare "ne
+répond pas". EngineHandle lance la recherche dans un processus séparé
+(pas de GIL partagé avec l'interface) et rend immédiatement un Future ;
+l'interface continue de s'afficher et consulte le Future à chaque image.
+
+Pendant que le joueur réfléchit, le processus de calcul peut aussi
+"méditer" (ponder) : il cherche à l'avance les positions après les
+réponses les plus probables du joueur.
+"""
+
+import math
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from game import PLAYER_1
+from minimax import find_best_move_minimax
+from alphabeta import alphabeta, find_best_move_alphabeta
+from negamax import find_best_move_negamax
+from mcts import MCTSTree, find_best_move_mcts
+from endgame import EndgameSolver
+from book import default_book
+from context import SearchContext, SearchTimeout
+from transposition import TranspositionTable
+from ordering import make_orderer
+
+# Algorithmes disponibles, par nom
+ALGORITHMS = {
+    'minimax': find_best_move_minimax,
+    'alphabeta': find_best_move_alphabeta,
+    'negamax': find_best_move_negamax,
+    'mcts': find_best_move_mcts,
+}
+
+# Algorithmes qui utilisent une table de transposition (Min-Max et MCTS n'en ont pas)
+TT_ALGORITHMS = ('alphabeta', 'negamax')
+
+# Algorithmes qui passent au solveur exact en fin de partie (tous sauf Min-Max)
+ENDGAME_ALGORITHMS = ('alphabeta', 'negamax', 'mcts')
+
+# État du processus de calcul (initialisé dans le processus, conservé d'un coup à l'autre)
+_stop_event = None
+_book = None
+_tables = {}        # Algorithme -> table de transposition conservée entre les recherches
+_endgame_solver = None  # Solveur de fin de partie (sa table est conservée entre les coups)
+_mcts_tree = None       # Arbre MCTS réutilisé d'un coup à l'autre
+_ponder_cache = {}  # (hachage, algorithme, profondeur) -> résultat cherché à l'avance
+
+
+def _init_worker(stop_event, use_book):
+    """Initialise le processus de calcul (l'ouverture de la bibliothèque est faite une seule fois)"""
+    global _stop_event, _book, _endgame_solver, _mcts_tree
+    _stop_event = stop_event
+    _book = default_book() if use_book else None
+    _endgame_solver = EndgameSolver()
+    _mcts_tree = MCTSTree()
+
+
+def _search(game, algorithm, depth):
+    """
+    Lance une recherche avec l'état persistant du processus : table de
+    transposition de l'algorithme (Min-Max et MCTS n'en utilisent pas),
+    solveur de fin de partie et arbre MCTS
+
+    Returns:
+        tuple: (meilleure_colonne, score, statistiques)
+    """
+    kwargs = {'book': _book, 'stop_event': _stop_event}
+    if algorithm in TT_ALGORITHMS:
+        kwargs['tt'] = _tables.setdefault(algorithm, TranspositionTable())
+    if algorithm in ENDGAME_ALGORITHMS:
+        kwargs['endgame_solver'] = _endgame_solver
+    if algorithm == 'mcts':
+        kwargs['mcts_tree'] = _mcts_tree
+    start_time = time.perf_counter()
+    col, score, stats = ALGORITHMS[algorithm](game, depth, **kwargs)
+    stats['search_time'] = time.perf_counter() - start_time
+    return col, score, stats
+
+
+def _run_search(game, algorithm, depth):
+    """
+    Recherche exécutée dans le processus de calcul
+
+    Si la position a déjà été cherchée pendant la réflexion du joueur
+    (ponder), le résultat est rendu immédiatement.
+
+    Args:
+        game (Connect4): Position (copie propre au processus)
+        algorithm (str): 'minimax', 'alphabeta', 'negamax' ou 'mcts'
+        depth (int): Profondeur de recherche
+
+    Returns:
+        tuple: (meilleure_colonne, score, statistiques)
+    """
+    start_time = time.perf_counter()
+    cached = _ponder_cache.get((game.hash, algorithm, depth))
+    _ponder_cache.clear()
+    if cached is not None:
+        col, score, stats = cached
+        stats = dict(stats, ponder_hit=True, ponder_time_saved=stats['search_time'])
+        stats['search_time'] = time.perf_counter() - start_time
+        return col, score, stats
+
+    col, score, stats = _search(game, algorithm, depth)
+    stats['ponder_hit'] = False
+    return col, score, stats
+
+
+def predict_replies(game, depth):
+    """
+    Ordonne les réponses du joueur de la plus probable à la moins probable
+
+    La réponse prédite est le meilleur coup de MIN d'une recherche
+    Alpha-Beta à depth - 1 (en grande partie déjà dans la table : c'est
+    la suite de la variation principale de la recherche de l'IA).
+
+    Args:
+        game (Connect4): Position après le coup de l'IA (PLAYER_1 au trait)
+        depth (int): Profondeur de la recherche de l'IA
+
+    Returns:
+        list: Colonnes jouables, la réponse prédite en premier
+    """
+    replies = sorted(game.get_valid_locations(), key=game.geometry.center_rank.__getitem__)
+    if depth < 2 or not replies:
+        return replies
+
+    orderer = make_orderer()
+    orderer.start_search(game)
+    ctx = SearchContext(_tables.setdefault('alphabeta', TranspositionTable()), orderer,
+                        stop_event=_stop_event)
+    _, predicted = alphabeta(game, depth - 1, -math.inf, math.inf, False, ctx)
+    if predicted is None:
+        return replies
+    return [predicted] + [col for col in replies if col != predicted]
+
+
+def _run_ponder(game, algorithm, depth):
+    """
+    Réflexion pendant le tour du joueur (exécutée dans le processus de calcul)
+
+    Cherche la réponse de l'IA à chaque coup possible du joueur, du plus
+    probable au moins probable, jusqu'à ce que le joueur joue (arrêt par
+    l'événement partagé). Les résultats sont gardés dans _ponder_cache.
+
+    Args:
+        game (Connect4): Position après le coup de l'IA (PLAYER_1 au trait)
+        algorithm (str): Algorithme de l'IA
+        depth (int): Profondeur de recherche
+
+    Returns:
+        dict: Réponse prédite et réponses déjà cherchées
+    """
+    _ponder_cache.clear()
+    predicted, pondered = None, []
+    try:
+        replies = predict_replies(game, depth)
+        predicted = replies[0] if replies else None
+        for reply in replies:
+            game.play(reply, PLAYER_1)
+            if not game.is_terminal_node():
+                _ponder_cache[(game.hash, algorithm, depth)] = _search(game, algorithm, depth)
+                pondered.append(reply)
+            game.undo()
+    except SearchTimeout:
+        pass  # Le joueur a joué
+    return {'predicted': predicted, 'pondered': pondered}
+
+
+class EngineHandle:
+    """
+    Moteur de recherche en arrière-plan (à fermer avec close() ou à utiliser avec `with`)
+
+    Exemple :
+        engine = EngineHandle()
+        future = engine.search(game, 'alphabeta', 5)
+        ...                       # l'interface continue de tourner
+        if future.done():
+            col, score, stats = future.result()
+    """
+
+    def __init__(self, use_book=True):
+        """
+        Args:
+            use_book (bool): Consulter la bibliothèque d'ouvertures si elle existe
+        """
+        # 'spawn' : le processus de calcul ne duplique pas l'état de Pygame
+        context = multiprocessing.get_context('spawn')
+        self.stop_event = context.Event()
+        self.executor = ProcessPoolExecutor(max_workers=1, mp_context=context,
+                                            initializer=_init_worker,
+                                            initargs=(self.stop_event, use_book))
+        self.ponder_future = None  # Réflexion en cours pendant le tour du joueur
+
+        # Statistiques de la réflexion
+        self.ponder_hits = 0          # Coup du joueur déjà cherché : réponse immédiate
+        self.ponder_misses = 0        # Coup du joueur pas encore cherché
+        self.ponder_time_saved = []   # Temps de recherche évité, par coup réussi
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def search(self, game, algorithm, depth):
+        """
+        Lance une recherche sans attendre son résultat
+
+        Args:
+            game (Connect4): État actuel du jeu (copié, la partie peut continuer)
+            algorithm (str): 'minimax', 'alphabeta', 'negamax' ou 'mcts'
+            depth (int): Profondeur de recherche
+
+        Returns:
+            Future: Donne (meilleure_colonne, score, statistiques) ; lève
+                    SearchTimeout si la recherche a été annulée
+        """
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Algorithme inconnu : {algorithm}")
+        pondered = self.stop_pondering()
+        self.stop_event.clear()
+        future = self.executor.submit(_run_search, game.copy(), algorithm, depth)
+        if pondered:
+            future.add_done_callback(self._record_ponder)
+        return future
+
+    def ponder(self, game, algorithm, depth):
+        """
+        Lance la réflexion pendant le tour du joueur (arrêtée par le search() suivant)
+
+        Args:
+            game (Connect4): Position après le coup de l'IA (le joueur au trait)
+            algorithm (str): Algorithme de l'IA
+            depth (int): Profondeur de recherche
+
+        Returns:
+            Future: Donne la réponse prédite et les réponses déjà cherchées
+        """
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Algorithme inconnu : {algorithm}")
+        self.stop_pondering()
+        self.stop_event.clear()
+        self.ponder_future = self.executor.submit(_run_ponder, game.copy(), algorithm, depth)
+        return self.ponder_future
+
+    def stop_pondering(self):
+        """
+        Arrête la réflexion en cours et attend qu'elle rende la main
+        (quelques millisecondes : l'arrêt est vérifié tous les TIME_CHECK_INTERVAL nœuds)
+
+        Returns:
+            bool: True si une réflexion avait été lancée
+        """
+        if self.ponder_future is None:
+            return False
+        self.stop_event.set()
+        self.ponder_future.result()
+        self.ponder_future = None
+        return True
+
+    def _record_ponder(self, future):
+        """Met à jour les statistiques de réflexion quand une recherche se termine"""
+        if future.cancelled() or future.exception() is not None:
+            return
+        stats = future.result()[2]
+        if stats.get('ponder_hit'):
+            self.ponder_hits += 1
+            self.ponder_time_saved.append(stats['ponder_time_saved'])
+        else:
+            self.ponder_misses += 1
+
+    def get_ponder_stats(self):
+        """
+        Returns:
+            dict: Coups devinés, taux de réussite et temps de réponse économisé
+        """
+        total = self.ponder_hits + self.ponder_misses
+        saved = sum(self.ponder_time_saved)
+        return {
+            'ponder_hits': self.ponder_hits,
+            'ponder_misses': self.ponder_misses,
+            'ponder_hit_rate': self.ponder_hits / total if total > 0 else 0.0,
+            'ponder_time_saved': saved,
+            'ponder_time_saved_per_move': saved / total if total > 0 else 0.0
+        }
+
+    def cancel(self):
+        """Demande l'arrêt de la recherche en cours (vérifié régulièrement par la recherche)"""
+        self.stop_event.set()
+
+    def close(self):
+        """Annule la recherche en cours et arrête le processus de calcul"""
+        self.cancel()
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+
+# EXPLICATION DU MOTEUR EN ARRIÈRE-PLAN :
+"""
+POURQUOI UN PROCESSUS :
+-----------------------
+Avec un thread, la recherche (du Python pur) garderait le GIL presque en
+permanence : l'interface serait saccadée. Un processus séparé a son
+propre interpréteur, l'interface garde une fréquence d'affichage stable.
+
+FUTURE :
+--------
+search() rend tout de suite un concurrent.futures.Future. La boucle de
+l'interface teste future.done() à chaque image et lit le coup avec
+future.result() quand il est prêt.
+
+ANNULATION COOPÉRATIVE :
+------------------------
+cancel() active un multiprocessing.Event. Les recherches le consultent
+tous les TIME_CHECK_INTERVAL nœuds et s'arrêtent en levant SearchTimeout :
+le processus de calcul reste disponible pour la recherche suivante.
+
+RÉFLEXION PENDANT LE TOUR DU JOUEUR (PONDER) :
+----------------------------------------------
+Après son coup, l'IA prédit la réponse du joueur (meilleur coup de MIN
+dans sa propre recherche) et cherche d'avance sa réponse à ce coup, puis
+aux autres coups possibles. Quand le joueur joue :
+- coup déjà cherché : réponse immédiate (ponder hit)
+- sinon : recherche normale, qui profite quand même de la table de
+  transposition conservée entre les coups
+"""
@@ -2,200 +2,725 @@
 game.py
 Classe représentant le jeu Puissance 4
 Contient toutes les règles et mécaniques du jeu
+
+Représentation interne : BITBOARDS
+Chaque joueur possède un entier dont chaque bit correspond à une case.
+Les colonnes sont rangées les unes après les autres avec ROWS + 1 bits
+par colonne (le bit supplémentaire en haut sert de séparateur) :
+
+     6 13 20 27 34 41 48   <- séparateurs (toujours à 0)
+     5 12 19 26 33 40 47
+     4 11 18 25 32 39 46
+     3 10 17 24 31 38 45
+     2  9 16 23 30 37 44
+     1  8 15 22 29 36 43
+     0  7 14 21 28 35 42   <- ligne 0 (bas du plateau)
+
+Le plateau standard est 6x7 avec 4 pions à aligner, mais Connect4(rows, cols,
+connect) accepte d'autres dimensions : toutes les tables (fenêtres, lignes
+par case, clés de Zobrist...) sont rangées dans un objet Geometry, construit
+une seule fois par géométrie et partagé par toutes les parties.
 """
 
+import functools
+import random
 import numpy as np
 
-# Constantes du jeu
+# Constantes du jeu (plateau standard)
 ROWS = 6
 COLS = 7
+CONNECT = 4   # Nombre de pions à aligner pour gagner
 PLAYER_1 = 1  # Joueur humain (Rouge)
 PLAYER_2 = 2  # IA (Jaune)
 EMPTY = 0
 
+# Clés de Zobrist : graine fixe pour que les hachages soient identiques d'un processus à l'autre
+ZOBRIST_SEED = 20252026
+
+# Poids de l'heuristique (utilisés par heuristic.py et par l'évaluation incrémentale)
+# Pour un alignement de CONNECT pions : "4" = CONNECT pions, "3" = CONNECT - 1, "2" = CONNECT - 2
+CENTER_WEIGHT = 3       # Par pion dans la colonne centrale
+FOUR_WEIGHT = 100       # 4 pions alignés
+THREE_WEIGHT = 5        # 3 pions + 1 case vide
+TWO_WEIGHT = 2          # 2 pions + 2 cases vides
+OPP_THREE_WEIGHT = -4   # 3 pions adverses + 1 case vide
+
+# États retournés par Connect4.terminal_status() (sinon : numéro du gagnant)
+ONGOING = 0  # Partie en cours
+DRAW = 3     # Plateau plein sans alignement
+
+
+def _window_score(piece_count, opponent_count, connect=CONNECT):
+    """Score d'une fenêtre selon le nombre de pions de chaque joueur (voir heuristic.evaluate_window)"""
+    empty_count = connect - piece_count - opponent_count
+    score = 0
+    if piece_count == connect:
+        score += FOUR_WEIGHT
+    elif piece_count == connect - 1 and empty_count == 1:
+        score += THREE_WEIGHT
+    elif piece_count == connect - 2 and empty_count == 2:
+        score += TWO_WEIGHT
+    if opponent_count == connect - 1 and empty_count == 1:
+        score += OPP_THREE_WEIGHT
+    return score
+
+
+def _run_steps(shift, connect):
+    """
+    Décalages successifs qui réduisent un bitboard aux débuts des séries de
+    connect pions dans une direction : m &= m >> d pour chaque d
+    (par doublement : séries de 2, puis 4, ... puis le complément)
+
+    Args:
+        shift (int): Décalage de la direction
+        connect (int): Longueur de l'alignement
+
+    Returns:
+        tuple: Décalages à appliquer dans l'ordre
+    """
+    steps = []
+    run = 1
+    while run * 2 <= connect:
+        steps.append(run * shift)
+        run *= 2
+    if run < connect:
+        steps.append((connect - run) * shift)
+    return tuple(steps)
+
+
+class Geometry:
+    """
+    Dimensions du plateau et longueur de l'alignement, avec toutes les
+    tables qui en dépendent (calculées une seule fois par géométrie,
+    partagées par toutes les parties : utiliser get_geometry())
+    """
+
+    def __init__(self, rows, cols, connect):
+        """
+        Args:
+            rows (int): Nombre de lignes
+            cols (int): Nombre de colonnes
+            connect (int): Nombre de pions à aligner pour gagner (au moins 3)
+        """
+        if rows < 1 or cols < 1 or connect < 3 or connect > max(rows, cols):
+            raise ValueError(f"Géométrie invalide : {rows}x{cols}, alignement de {connect}")
+        self.rows = rows
+        self.cols = cols
+        self.connect = connect
+        self.cells = rows * cols
+
+        # Constantes des bitboards
+        self.col_height = col_height = rows + 1  # Bits par colonne (avec le séparateur)
+        self.bottom_mask = sum(1 << (c * col_height) for c in range(cols))  # Bit du bas de chaque colonne
+        self.board_mask = self.bottom_mask * ((1 << rows) - 1)  # Toutes les cases jouables
+        self.top_cells = [1 << (c * col_height + rows - 1) for c in range(cols)]  # Case du haut de chaque colonne
+        self.column_mask = (1 << rows) - 1  # Cases d'une colonne (après décalage)
+
+        # Colonnes jouables selon le masque des colonnes pleines (bit c = colonne c pleine) :
+        # calculées une fois, get_valid_locations() n'a plus qu'à lire la table
+        self.legal_moves = [tuple(c for c in range(cols) if not full >> c & 1)
+                            for full in range(1 << cols)]
+
+        # Colonnes du centre vers les bords (ordonnancement des coups)
+        self.center_col = cols // 2
+        self.center_order = sorted(range(cols), key=lambda c: abs(c - cols // 2))
+        self.center_rank = [self.center_order.index(c) for c in range(cols)]
+
+        # Décalages des 4 directions d'alignement
+        # 1 : vertical, col_height : horizontal,
+        # col_height + 1 : diagonale positive (/), col_height - 1 : diagonale négative (\)
+        self.directions = (col_height, 1, col_height + 1, col_height - 1)
+        self.direction_steps = [_run_steps(shift, connect) for shift in self.directions]
+
+        # Clés de Zobrist : un entier aléatoire de 64 bits par (joueur, case)
+        # (le plateau standard garde la graine d'origine, les autres en dérivent : deux
+        # géométries n'ont jamais les mêmes clés et peuvent partager une table de transposition)
+        if (rows, cols, connect) == (ROWS, COLS, CONNECT):
+            seed = ZOBRIST_SEED
+        else:
+            seed = f"{ZOBRIST_SEED}:{rows}x{cols}x{connect}"
+        rng = random.Random(seed)
+        self.zobrist_keys = [[0] * (cols * col_height)] + [
+            [rng.getrandbits(64) for _ in range(cols * col_height)]
+            for _ in (PLAYER_1, PLAYER_2)
+        ]
+        self.zobrist_side = rng.getrandbits(64)  # À combiner quand c'est au tour de MAX
+
+        # Fenêtres de connect cases, sous forme d'indices de bits
+        self.windows = []
+        for c in range(cols):
+            for r in range(rows):
+                for dr, dc in ((0, 1), (1, 0), (1, 1), (-1, 1)):
+                    if 0 <= r + (connect - 1) * dr < rows and c + (connect - 1) * dc < cols:
+                        self.windows.append(tuple((c + i * dc) * col_height + r + i * dr
+                                                  for i in range(connect)))
+
+        # Pour chaque case : les fenêtres qui la contiennent
+        self.cell_windows = [[] for _ in range(cols * col_height)]
+        for w, window in enumerate(self.windows):
+            for index in window:
+                self.cell_windows[index].append(w)
+
+        # Variation des scores quand un joueur ajoute un pion à une fenêtre où il a
+        # déjà `mine` pions et l'adversaire `theirs` :
+        # gain_own pour son propre score, gain_other pour le score de l'adversaire
+        size = connect + 1
+        self.gain_own = [[_window_score(mine + 1, theirs, connect) - _window_score(mine, theirs, connect)
+                          if mine + theirs < connect else 0 for theirs in range(size)] for mine in range(size)]
+        self.gain_other = [[_window_score(theirs, mine + 1, connect) - _window_score(theirs, mine, connect)
+                            if mine + theirs < connect else 0 for theirs in range(size)] for mine in range(size)]
+
+        # Pour chaque case : les alignements qui peuvent passer par elle, sous forme de
+        # (masque des cases de la ligne à moins de connect cases, décalages de _run_steps)
+        # Seules les directions où la ligne est assez longue sont gardées ; à la
+        # verticale, le pion posé est en haut de sa colonne : seules les cases du dessous comptent
+        reach = connect - 1
+        self.line_masks = [() for _ in range(cols * col_height)]
+        for c in range(cols):
+            for r in range(rows):
+                lines = []
+                for shift, dr, dc, ks in ((1, 1, 0, range(-reach, 1)),
+                                          (col_height, 0, 1, range(-reach, reach + 1)),
+                                          (col_height + 1, 1, 1, range(-reach, reach + 1)),
+                                          (col_height - 1, -1, 1, range(-reach, reach + 1))):
+                    cells = [(c + k * dc) * col_height + r + k * dr for k in ks
+                             if 0 <= r + k * dr < rows and 0 <= c + k * dc < cols]
+                    if len(cells) >= connect:
+                        lines.append((sum(1 << i for i in cells), _run_steps(shift, connect)))
+                self.line_masks[c * col_height + r] = tuple(lines)
+
+        # Jusqu'à 4 pions, deux décalages suffisent : les mêmes lignes sous forme de
+        # triplets (masque, premier décalage, second décalage), sans boucle interne
+        # (le cas du plateau standard, le plus fréquent) ; None au-delà
+        self.line_pairs = None
+        if connect <= 4:
+            self.line_pairs = [tuple((line, steps[0], steps[1] if len(steps) > 1 else 0)
+                                     for line, steps in lines)
+                               for lines in self.line_masks]
+
+    def __reduce__(self):
+        # Copiée vers un autre processus par ses seules dimensions (tables recalculées là-bas)
+        return get_geometry, (self.rows, self.cols, self.connect)
+
+    def __repr__(self):
+        return f"Geometry({self.rows}x{self.cols}, alignement de {self.connect})"
+
+    def has_line(self, bitboard):
+        """
+        Vérifie si un bitboard contient connect pions alignés (décalages et masques)
+
+        Args:
+            bitboard (int): Bitboard d'un joueur
+
+        Returns:
+            bool: True si connect pions sont alignés
+        """
+        for steps in self.direction_steps:
+            m = bitboard
+            for step in steps:
+                m &= m >> step
+            if m:
+                return True
+        return False
+
+
+@functools.lru_cache(maxsize=None)
+def get_geometry(rows=ROWS, cols=COLS, connect=CONNECT):
+    """
+    Géométrie partagée pour des dimensions données (tables construites une fois)
+
+    Args:
+        rows (int): Nombre de lignes
+        cols (int): Nombre de colonnes
+        connect (int): Nombre de pions à aligner pour gagner
+
+    Returns:
+        Geometry: La géométrie
+    """
+    return Geometry(rows, cols, connect)
+
+
+# Plateau standard 6x7, alignement de 4
+DEFAULT_GEOMETRY = get_geometry(ROWS, COLS, CONNECT)
+
+# Constantes du plateau standard (utilisées par le solveur de fin de partie,
+# la bibliothèque d'ouvertures et l'interface, propres au 6x7)
+COL_HEIGHT = DEFAULT_GEOMETRY.col_height
+BOTTOM_MASK = DEFAULT_GEOMETRY.bottom_mask
+BOARD_MASK = DEFAULT_GEOMETRY.board_mask
+TOP_CELLS = DEFAULT_GEOMETRY.top_cells
+COLUMN_MASK = DEFAULT_GEOMETRY.column_mask
+LEGAL_MOVES = DEFAULT_GEOMETRY.legal_moves
+DIRECTIONS = DEFAULT_GEOMETRY.directions
+ZOBRIST_KEYS = DEFAULT_GEOMETRY.zobrist_keys
+ZOBRIST_SIDE = DEFAULT_GEOMETRY.zobrist_side
+WINDOWS = DEFAULT_GEOMETRY.windows
+CELL_WINDOWS = DEFAULT_GEOMETRY.cell_windows
+GAIN_OWN = DEFAULT_GEOMETRY.gain_own
+GAIN_OTHER = DEFAULT_GEOMETRY.gain_other
+CENTER_COL = DEFAULT_GEOMETRY.center_col
+LINE_MASKS = DEFAULT_GEOMETRY.line_masks
+LINE_PAIRS = DEFAULT_GEOMETRY.line_pairs
+
+
+def cell_bit(row, col, col_height=COL_HEIGHT):
+    """
+    Retourne le bit correspondant à une case du plateau
+
+    Args:
+        row (int): Ligne de la case
+        col (int): Colonne de la case
+        col_height (int): Bits par colonne (ROWS + 1 sur le plateau standard)
+
+    Returns:
+        int: Entier avec uniquement le bit de la case à 1
+    """
+    return 1 << (col * col_height + row)
+
+
+def has_four(bitboard):
+    """
+    Vérifie si un bitboard du plateau standard contient 4 pions alignés
+    (décalages et masques ; voir Geometry.has_line pour les autres géométries)
+
+    Pour chaque direction, b & (b >> d) garde les paires de pions voisins,
+    puis m & (m >> 2d) garde les séries de 4 pions consécutifs.
+
+    Args:
+        bitboard (int): Bitboard d'un joueur
+
+    Returns:
+        bool: True si 4 pions sont alignés
+    """
+    for shift in DIRECTIONS:
+        m = bitboard & (bitboard >> shift)
+        if m & (m >> (2 * shift)):
+            return True
+    return False
+
 
 class Connect4:
     """Classe représentant le jeu Puissance 4"""
-    
-    def __init__(self):
-        """Initialise un nouveau plateau de jeu vide"""
-        self.board = np.zeros((ROWS, COLS), dtype=int)
+
+    def __init__(self, rows=ROWS, cols=COLS, connect=CONNECT):
+        """
+        Initialise un nouveau plateau de jeu vide
+
+        Args:
+            rows (int): Nombre de lignes
+            cols (int): Nombre de colonnes
+            connect (int): Nombre de pions à aligner pour gagner
+        """
+        self.geometry = geometry = get_geometry(rows, cols, connect)
+        self.bitboards = [0, 0, 0]  # Indexé par joueur (l'indice EMPTY n'est pas utilisé)
+        self.mask = 0  # Toutes les cases occupées
+        self.heights = [0] * cols  # Nombre de pions dans chaque colonne
+        self.full_columns = 0  # Bit c à 1 si la colonne c est pleine
+        self.hash = 0  # Hachage de Zobrist de la position (mis à jour à chaque coup)
+        # Évaluation incrémentale : pions de chaque joueur par fenêtre et score heuristique courant
+        self.window_counts = [None, [0] * len(geometry.windows), [0] * len(geometry.windows)]
+        self.eval_scores = [0, 0, 0]
+        self.moves = []  # Pile des colonnes jouées avec play() (pour undo())
         self.game_over = False
         self.turn = PLAYER_1
-        
+
+    @property
+    def board(self):
+        """
+        Plateau sous forme de tableau NumPy (lignes x colonnes), reconstruit
+        à partir des bitboards. Utilisé pour l'affichage et l'heuristique.
+
+        Returns:
+            numpy.ndarray: Le plateau de jeu
+        """
+        geometry = self.geometry
+        col_height = geometry.col_height
+        board = np.zeros((geometry.rows, geometry.cols), dtype=int)
+        for piece in (PLAYER_1, PLAYER_2):
+            bits = self.bitboards[piece]
+            while bits:
+                low = bits & -bits
+                index = low.bit_length() - 1
+                board[index % col_height][index // col_height] = piece
+                bits ^= low
+        return board
+
+    @board.setter
+    def board(self, board):
+        """
+        Charge un plateau NumPy (lignes x colonnes de la géométrie) dans les bitboards
+
+        Args:
+            board (numpy.ndarray): Le plateau à charger
+        """
+        geometry = self.geometry
+        col_height = geometry.col_height
+        self.bitboards = [0, 0, 0]
+        self.hash = 0
+        self.window_counts = [None, [0] * len(geometry.windows), [0] * len(geometry.windows)]
+        self.eval_scores = [0, 0, 0]
+        for r in range(geometry.rows):
+            for c in range(geometry.cols):
+                piece = int(board[r][c])
+                if piece != EMPTY:
+                    self.bitboards[piece] |= cell_bit(r, c, col_height)
+                    self.hash ^= geometry.zobrist_keys[piece][c * col_height + r]
+                    self._add_to_evaluation(piece, c * col_height + r)
+        self.mask = self.bitboards[PLAYER_1] | self.bitboards[PLAYER_2]
+        self.heights = [((self.mask >> (c * col_height)) & geometry.column_mask).bit_length()
+                        for c in range(geometry.cols)]
+        self.full_columns = sum(1 << c for c in range(geometry.cols) if self.heights[c] == geometry.rows)
+
     def drop_piece(self, row, col, piece):
         """
         Place un pion sur le plateau
-        
+
         Args:
             row (int): Ligne où placer le pion
             col (int): Colonne où placer le pion
             piece (int): Numéro du joueur (1 ou 2)
         """
-        self.board[row][col] = piece
-        
+        geometry = self.geometry
+        col_height = geometry.col_height
+        bit = cell_bit(row, col, col_height)
+        index = col * col_height + row
+        for player in (PLAYER_1, PLAYER_2):
+            if self.bitboards[player] & bit:
+                self.bitboards[player] ^= bit
+                self.hash ^= geometry.zobrist_keys[player][index]
+                self._remove_from_evaluation(player, index)
+        if piece != EMPTY:
+            self.bitboards[piece] |= bit
+            self.hash ^= geometry.zobrist_keys[piece][index]
+            self._add_to_evaluation(piece, index)
+        self.mask = self.bitboards[PLAYER_1] | self.bitboards[PLAYER_2]
+        self.heights[col] = ((self.mask >> (col * col_height)) & geometry.column_mask).bit_length()
+        if self.heights[col] == geometry.rows:
+            self.full_columns |= 1 << col
+        else:
+            self.full_columns &= ~(1 << col)
+
+    def play(self, col, piece=None):
+        """
+        Joue un pion dans une colonne et l'empile pour pouvoir l'annuler
+        Utilisé par les algorithmes de recherche à la place de copy()
+
+        Args:
+            col (int): Colonne jouée (doit être jouable)
+            piece (int): Numéro du joueur, par défaut celui dont c'est le tour
+        """
+        if piece is None:
+            piece = self.turn
+        geometry = self.geometry
+        height = self.heights[col]
+        index = col * geometry.col_height + height
+        bit = 1 << index
+        self.bitboards[piece] |= bit
+        self.mask |= bit
+        self.hash ^= geometry.zobrist_keys[piece][index]
+        self._add_to_evaluation(piece, index)
+        self.heights[col] = height + 1
+        if height == geometry.rows - 1:
+            self.full_columns |= 1 << col
+        self.moves.append(col)
+        self.turn = PLAYER_1 if piece == PLAYER_2 else PLAYER_2
+
+    def undo(self):
+        """
+        Annule le dernier coup joué avec play()
+        (le tour revient au joueur dont le coup est annulé)
+
+        Returns:
+            int: La colonne du coup annulé
+        """
+        geometry = self.geometry
+        col = self.moves.pop()
+        height = self.heights[col] - 1
+        index = col * geometry.col_height + height
+        bit = 1 << index
+        piece = PLAYER_1 if self.bitboards[PLAYER_1] & bit else PLAYER_2
+        self.bitboards[piece] ^= bit
+        self.mask ^= bit
+        self.hash ^= geometry.zobrist_keys[piece][index]
+        self._remove_from_evaluation(piece, index)
+        self.heights[col] = height
+        if height == geometry.rows - 1:
+            self.full_columns ^= 1 << col
+        self.turn = piece
+        return col
+
+    def _add_to_evaluation(self, piece, index):
+        """
+        Met à jour l'évaluation incrémentale après l'ajout d'un pion
+        (seules les fenêtres passant par la case changent)
+
+        Args:
+            piece (int): Joueur qui a posé le pion
+            index (int): Indice du bit de la case
+        """
+        geometry = self.geometry
+        gain_own = geometry.gain_own
+        gain_other = geometry.gain_other
+        other = PLAYER_1 if piece == PLAYER_2 else PLAYER_2
+        mine = self.window_counts[piece]
+        theirs = self.window_counts[other]
+        own_score = self.eval_scores[piece]
+        other_score = self.eval_scores[other]
+        for w in geometry.cell_windows[index]:
+            m = mine[w]
+            t = theirs[w]
+            own_score += gain_own[m][t]
+            other_score += gain_other[m][t]
+            mine[w] = m + 1
+        if index // geometry.col_height == geometry.center_col:
+            own_score += CENTER_WEIGHT
+        self.eval_scores[piece] = own_score
+        self.eval_scores[other] = other_score
+
+    def _remove_from_evaluation(self, piece, index):
+        """
+        Met à jour l'évaluation incrémentale après le retrait d'un pion
+
+        Args:
+            piece (int): Joueur dont le pion est retiré
+            index (int): Indice du bit de la case
+        """
+        geometry = self.geometry
+        gain_own = geometry.gain_own
+        gain_other = geometry.gain_other
+        other = PLAYER_1 if piece == PLAYER_2 else PLAYER_2
+        mine = self.window_counts[piece]
+        theirs = self.window_counts[other]
+        own_score = self.eval_scores[piece]
+        other_score = self.eval_scores[other]
+        for w in geometry.cell_windows[index]:
+            m = mine[w] - 1
+            t = theirs[w]
+            own_score -= gain_own[m][t]
+            other_score -= gain_other[m][t]
+            mine[w] = m
+        if index // geometry.col_height == geometry.center_col:
+            own_score -= CENTER_WEIGHT
+        self.eval_scores[piece] = own_score
+        self.eval_scores[other] = other_score
+
+    def evaluate(self, piece):
+        """
+        Score heuristique de la position pour un joueur, lu en O(1)
+        Identique à heuristic.evaluate_position(self.board, piece)
+
+        Args:
+            piece (int): Le joueur à évaluer
+
+        Returns:
+            int: Score de la position
+        """
+        return self.eval_scores[piece]
+
     def is_valid_location(self, col):
         """
         Vérifie si une colonne n'est pas pleine
-        
+
         Args:
             col (int): Numéro de la colonne
-            
+
         Returns:
             bool: True si la colonne est jouable
         """
-        return self.board[ROWS - 1][col] == EMPTY
-    
+        return not self.full_columns >> col & 1
+
     def get_next_open_row(self, col):
         """
         Retourne la première ligne vide dans une colonne (simulation de la gravité)
-        
+
         Args:
             col (int): Numéro de la colonne
-            
+
         Returns:
             int: Numéro de la ligne disponible, None si colonne pleine
         """
-        for r in range(ROWS):
-            if self.board[r][col] == EMPTY:
-                return r
-        return None
-    
+        height = self.heights[col]
+        return height if height < self.geometry.rows else None
+
     def check_win(self, piece):
         """
-        Vérifie si un joueur a gagné (4 pions alignés)
-        
+        Vérifie si un joueur a gagné (connect pions alignés, 4 par défaut)
+
         Args:
             piece (int): Numéro du joueur (1 ou 2)
-            
+
         Returns:
             bool: True si le joueur a gagné
         """
-        # Vérification horizontale
-        for c in range(COLS - 3):
-            for r in range(ROWS):
-                if (self.board[r][c] == piece and 
-                    self.board[r][c+1] == piece and
-                    self.board[r][c+2] == piece and 
-                    self.board[r][c+3] == piece):
-                    return True
-        
-        # Vérification verticale
-        for c in range(COLS):
-            for r in range(ROWS - 3):
-                if (self.board[r][c] == piece and 
-                    self.board[r+1][c] == piece and
-                    self.board[r+2][c] == piece and 
-                    self.board[r+3][c] == piece):
-                    return True
-        
-        # Vérification diagonale positive (/)
-        for c in range(COLS - 3):
-            for r in range(ROWS - 3):
-                if (self.board[r][c] == piece and 
-                    self.board[r+1][c+1] == piece and
-                    self.board[r+2][c+2] == piece and 
-                    self.board[r+3][c+3] == piece):
-                    return True
-        
-        # Vérification diagonale négative (\)
-        for c in range(COLS - 3):
-            for r in range(3, ROWS):
-                if (self.board[r][c] == piece and 
-                    self.board[r-1][c+1] == piece and
-                    self.board[r-2][c+2] == piece and 
-                    self.board[r-3][c+3] == piece):
-                    return True
-        
-        return False
-    
+        return self.geometry.has_line(self.bitboards[piece])
+
     def get_winning_sequence(self, piece):
         """
-        Retourne les coordonnées des 4 pions gagnants
-        
+        Retourne les coordonnées des pions gagnants
+
         Args:
             piece (int): Numéro du joueur (1 ou 2)
-            
+
         Returns:
             list: Liste de tuples (row, col) des pions gagnants, ou [] si pas de victoire
         """
-        # Vérification horizontale
-        for c in range(COLS - 3):
-            for r in range(ROWS):
-                if (self.board[r][c] == piece and 
-                    self.board[r][c+1] == piece and
-                    self.board[r][c+2] == piece and 
-                    self.board[r][c+3] == piece):
-                    return [(r, c), (r, c+1), (r, c+2), (r, c+3)]
-        
-        # Vérification verticale
-        for c in range(COLS):
-            for r in range(ROWS - 3):
-                if (self.board[r][c] == piece and 
-                    self.board[r+1][c] == piece and
-                    self.board[r+2][c] == piece and 
-                    self.board[r+3][c] == piece):
-                    return [(r, c), (r+1, c), (r+2, c), (r+3, c)]
-        
-        # Vérification diagonale positive (/)
-        for c in range(COLS - 3):
-            for r in range(ROWS - 3):
-                if (self.board[r][c] == piece and 
-                    self.board[r+1][c+1] == piece and
-                    self.board[r+2][c+2] == piece and 
-                    self.board[r+3][c+3] == piece):
-                    return [(r, c), (r+1, c+1), (r+2, c+2), (r+3, c+3)]
-        
-        # Vérification diagonale négative (\)
-        for c in range(COLS - 3):
-            for r in range(3, ROWS):
-                if (self.board[r][c] == piece and 
-                    self.board[r-1][c+1] == piece and
-                    self.board[r-2][c+2] == piece and 
-                    self.board[r-3][c+3] == piece):
-                    return [(r, c), (r-1, c+1), (r-2, c+2), (r-3, c+3)]
-        
+        geometry = self.geometry
+        col_height = geometry.col_height
+        bitboard = self.bitboards[piece]
+        for shift, steps in zip(geometry.directions, geometry.direction_steps):
+            starts = bitboard
+            for step in steps:
+                starts &= starts >> step
+            if starts:
+                # Le bit le plus faible donne la première case de l'alignement
+                index = (starts & -starts).bit_length() - 1
+                return [((index + i * shift) % col_height, (index + i * shift) // col_height)
+                        for i in range(geometry.connect)]
         return []
-    
+
     def is_terminal_node(self):
         """
         Vérifie si le jeu est dans un état terminal
         (victoire d'un joueur ou plateau plein)
-        
+
         Returns:
             bool: True si le jeu est terminé
         """
-        return (self.check_win(PLAYER_1) or 
-                self.check_win(PLAYER_2) or 
-                len(self.get_valid_locations()) == 0)
-    
+        board_mask = self.geometry.board_mask
+        return (self.check_win(PLAYER_1) or
+                self.check_win(PLAYER_2) or
+                self.mask & board_mask == board_mask)
+
+    def terminal_status(self):
+        """
+        État de la partie en une seule passe, en ne regardant que les lignes
+        qui passent par le dernier pion joué avec play() (seul ce coup peut
+        avoir créé un alignement : la position précédente n'était pas finie)
+        Sans coup dans la pile (position posée avec drop_piece), tout le
+        plateau est vérifié.
+
+        Returns:
+            int: ONGOING, DRAW, ou le numéro du joueur qui a gagné
+        """
+        geometry = self.geometry
+        moves = self.moves
+        if not moves:
+            if geometry.has_line(self.bitboards[PLAYER_1]):
+                return PLAYER_1
+            if geometry.has_line(self.bitboards[PLAYER_2]):
+                return PLAYER_2
+        else:
+            col = moves[-1]
+            piece = PLAYER_1 if self.turn == PLAYER_2 else PLAYER_2
+            bitboard = self.bitboards[piece]
+            index = col * geometry.col_height + self.heights[col] - 1
+            line_pairs = geometry.line_pairs
+            if line_pairs is not None:
+                for line, first, second in line_pairs[index]:
+                    m = bitboard & line
+                    m &= m >> first
+                    if m & (m >> second):
+                        return piece
+            else:
+                for line, steps in geometry.line_masks[index]:
+                    m = bitboard & line
+                    for step in steps:
+                        m &= m >> step
+                    if m:
+                        return piece
+        board_mask = geometry.board_mask
+        if self.mask & board_mask == board_mask:
+            return DRAW
+        return ONGOING
+
+    def legal_moves(self):
+        """
+        Colonnes jouables, lues dans la table de la géométrie (aucune liste construite)
+        Utilisé par les algorithmes de recherche à chaque nœud
+
+        Returns:
+            tuple: Numéros des colonnes non pleines (à ne pas modifier)
+        """
+        return self.geometry.legal_moves[self.full_columns]
+
     def get_valid_locations(self):
         """
         Retourne la liste des colonnes jouables
-        
+
         Returns:
             list: Liste des numéros de colonnes non pleines
         """
-        valid_locations = []
-        for col in range(COLS):
-            if self.is_valid_location(col):
-                valid_locations.append(col)
-        return valid_locations
-    
+        return list(self.geometry.legal_moves[self.full_columns])
+
+    @classmethod
+    def from_moves(cls, moves, rows=ROWS, cols=COLS, connect=CONNECT):
+        """
+        Crée une position à partir des colonnes jouées depuis le plateau vide
+        (PLAYER_1 joue en premier, puis les joueurs alternent)
+
+        Args:
+            moves (str ou list): Colonnes jouées, par exemple '3342' ou [3, 3, 4, 2]
+                                 (une liste au-delà de 10 colonnes)
+            rows (int): Nombre de lignes
+            cols (int): Nombre de colonnes
+            connect (int): Nombre de pions à aligner pour gagner
+
+        Returns:
+            Connect4: La position obtenue
+        """
+        game = cls(rows, cols, connect)
+        for col in moves:
+            col = int(col)
+            if not 0 <= col < cols or not game.is_valid_location(col):
+                raise ValueError(f"Coup invalide : {col}")
+            game.play(col)
+        return game
+
+    def swapped(self):
+        """
+        Crée une copie où les deux joueurs échangent leurs pions
+        (les algorithmes jouent pour PLAYER_2 : on les fait jouer pour
+        PLAYER_1 en leur donnant la position échangée)
+
+        Returns:
+            Connect4: Nouvelle instance avec les couleurs inversées
+        """
+        new_game = self.copy()
+        new_game.bitboards = [0, self.bitboards[PLAYER_2], self.bitboards[PLAYER_1]]
+        new_game.window_counts = [None, self.window_counts[PLAYER_2][:], self.window_counts[PLAYER_1][:]]
+        new_game.eval_scores = [0, self.eval_scores[PLAYER_2], self.eval_scores[PLAYER_1]]
+        new_game.turn = PLAYER_1 if self.turn == PLAYER_2 else PLAYER_2
+        new_game.hash = 0
+        for piece in (PLAYER_1, PLAYER_2):
+            bits = new_game.bitboards[piece]
+            while bits:
+                low = bits & -bits
+                new_game.hash ^= self.geometry.zobrist_keys[piece][low.bit_length() - 1]
+                bits ^= low
+        return new_game
+
     def copy(self):
         """
         Crée une copie du plateau actuel
-        Utilisé par les algorithmes Min-Max et Alpha-Beta
-        
+        (les algorithmes de recherche utilisent plutôt play() / undo())
+
         Returns:
             Connect4: Nouvelle instance avec le même état
         """
-        new_game = Connect4()
-        new_game.board = np.copy(self.board)
+        new_game = Connect4.__new__(Connect4)
+        new_game.geometry = self.geometry
+        new_game.bitboards = self.bitboards[:]
+        new_game.mask = self.mask
+        new_game.heights = self.heights[:]
+        new_game.full_columns = self.full_columns
+        new_game.hash = self.hash
+        new_game.window_counts = [None, self.window_counts[PLAYER_1][:], self.window_counts[PLAYER_2][:]]
+        new_game.eval_scores = self.eval_scores[:]
+        new_game.moves = self.moves[:]
         new_game.game_over = self.game_over
         new_game.turn = self.turn
         return new_game
-    
+
     def print_board(self):
         """Affiche le plateau dans la console (pour debug)"""
-        print(np.flip(self.board, 0))
\ No newline at end of file
+        print(np.flip(self.board, 0))
@@ -4,12 +4,40 @@ Fonction heuristique pour évaluer la qualité d'une position
 Plus le score est élevé, meilleure est la position pour l'IA (PLAYER_2)
 """
 
-from game import ROWS, COLS, PLAYER_1, PLAYER_2, EMPTY
+import functools
+import numpy as np
+from game import (ROWS, COLS, CONNECT, PLAYER_1, PLAYER_2, EMPTY, CENTER_WEIGHT,
+                  FOUR_WEIGHT, THREE_WEIGHT, TWO_WEIGHT, OPP_THREE_WEIGHT,
+                  ONGOING, DRAW, get_geometry)
+
+
+@functools.lru_cache(maxsize=None)
+def window_index(rows=ROWS, cols=COLS, connect=CONNECT):
+    """
+    Indices des fenêtres dans un plateau aplati (case (r, c) -> r * cols + c)
+    Matrice (fenêtres, connect) utilisée pour extraire toutes les fenêtres d'un coup
+    (fancy indexing) ; calculée une fois par géométrie
+
+    Returns:
+        numpy.ndarray: Matrice d'indices
+    """
+    geometry = get_geometry(rows, cols, connect)
+    col_height = geometry.col_height
+    return np.array([[(i % col_height) * cols + i // col_height for i in window]
+                     for window in geometry.windows], dtype=np.intp)
+
+
+# Indices des 69 fenêtres du plateau standard : matrice (69, 4)
+WINDOW_INDEX = window_index()
+
+# Nombre de plateaux traités à la fois par evaluate_positions (limite la mémoire)
+BATCH_CHUNK_SIZE = 65536
 
 
 def evaluate_window(window, piece):
     """
     Évalue une fenêtre de 4 cases consécutives
+    (ou de connect cases : la longueur de la fenêtre donne l'alignement visé)
     
     Args:
         window (list): Liste de 4 valeurs du plateau
@@ -20,6 +48,7 @@ def evaluate_window(window, piece):
     """
     score = 0
     opponent = PLAYER_1 if piece == PLAYER_2 else PLAYER_2
+    connect = len(window)
     
     # Compter les pions dans la fenêtre
     piece_count = window.count(piece)
@@ -27,21 +56,21 @@ def evaluate_window(window, piece):
     opponent_count = window.count(opponent)
     
     # Scoring basé sur le nombre de pions alignés
-    if piece_count == 4:
-        score += 100  # Victoire !
-    elif piece_count == 3 and empty_count == 1:
-        score += 5    # 3 alignés avec possibilité de gagner
-    elif piece_count == 2 and empty_count == 2:
-        score += 2    # 2 alignés avec possibilités
+    if piece_count == connect:
+        score += FOUR_WEIGHT   # Victoire ! (+100)
+    elif piece_count == connect - 1 and empty_count == 1:
+        score += THREE_WEIGHT  # 3 alignés avec possibilité de gagner (+5)
+    elif piece_count == connect - 2 and empty_count == 2:
+        score += TWO_WEIGHT    # 2 alignés avec possibilités (+2)
     
     # Pénalité si l'adversaire peut gagner
-    if opponent_count == 3 and empty_count == 1:
-        score -= 4    # Bloquer l'adversaire est important
+    if opponent_count == connect - 1 and empty_count == 1:
+        score += OPP_THREE_WEIGHT  # Bloquer l'adversaire est important (-4)
     
     return score
 
 
-def evaluate_position(board, piece):
+def evaluate_position(board, piece, connect=CONNECT):
     """
     Évalue la qualité globale d'une position sur le plateau
     
@@ -52,54 +81,110 @@ def evaluate_position(board, piece):
     4. Les alignements diagonaux possibles
     
     Args:
-        board (numpy.ndarray): Le plateau de jeu
+        board (numpy.ndarray): Le plateau de jeu (ses dimensions donnent la géométrie)
         piece (int): Le joueur à évaluer (PLAYER_2 pour l'IA)
+        connect (int): Nombre de pions à aligner pour gagner
         
     Returns:
         int: Score total de la position (plus c'est élevé, mieux c'est pour piece)
     """
     score = 0
+    rows, cols = board.shape
+    span = connect - 1  # Cases après la première d'une fenêtre
     
     # 1. BONUS POUR LE CENTRE
     # Le centre est stratégiquement important
-    center_array = [int(i) for i in list(board[:, COLS//2])]
+    center_array = [int(i) for i in list(board[:, cols//2])]
     center_count = center_array.count(piece)
-    score += center_count * 3
+    score += center_count * CENTER_WEIGHT
     
     # 2. ÉVALUATION HORIZONTALE
-    # Parcourir toutes les fenêtres de 4 cases horizontales
-    for r in range(ROWS):
+    # Parcourir toutes les fenêtres de connect cases horizontales
+    for r in range(rows):
         row_array = [int(i) for i in list(board[r, :])]
-        for c in range(COLS - 3):
-            window = row_array[c:c + 4]
+        for c in range(cols - span):
+            window = row_array[c:c + connect]
             score += evaluate_window(window, piece)
     
     # 3. ÉVALUATION VERTICALE
-    # Parcourir toutes les fenêtres de 4 cases verticales
-    for c in range(COLS):
+    # Parcourir toutes les fenêtres de connect cases verticales
+    for c in range(cols):
         col_array = [int(i) for i in list(board[:, c])]
-        for r in range(ROWS - 3):
-            window = col_array[r:r + 4]
+        for r in range(rows - span):
+            window = col_array[r:r + connect]
             score += evaluate_window(window, piece)
     
     # 4. ÉVALUATION DIAGONALE POSITIVE (/)
-    for r in range(ROWS - 3):
-        for c in range(COLS - 3):
-            window = [board[r+i][c+i] for i in range(4)]
+    for r in range(rows - span):
+        for c in range(cols - span):
+            window = [board[r+i][c+i] for i in range(connect)]
             score += evaluate_window(window, piece)
     
     # 5. ÉVALUATION DIAGONALE NÉGATIVE (\)
-    for r in range(ROWS - 3):
-        for c in range(COLS - 3):
-            window = [board[r+3-i][c+i] for i in range(4)]
+    for r in range(rows - span):
+        for c in range(cols - span):
+            window = [board[r+span-i][c+i] for i in range(connect)]
             score += evaluate_window(window, piece)
     
     return score
 
 
+def evaluate_positions(boards, piece, connect=CONNECT):
+    """
+    Évalue un lot de plateaux en une seule fois (version vectorisée NumPy
+    de evaluate_position, pour l'analyse hors ligne)
+    
+    Toutes les fenêtres sont extraites avec la matrice d'indices window_index(),
+    puis les comptes de pions et les scores sont calculés en opérations sur
+    tableaux. Les plateaux sont traités par paquets de BATCH_CHUNK_SIZE.
+    
+    Args:
+        boards (numpy.ndarray): Tableau (N, lignes, colonnes) de plateaux
+        piece (int): Le joueur à évaluer
+        connect (int): Nombre de pions à aligner pour gagner
+        
+    Returns:
+        numpy.ndarray: Les N scores (identiques à evaluate_position)
+    """
+    boards = np.asarray(boards)
+    if boards.ndim != 3:
+        raise ValueError(f"Attendu un tableau (N, {ROWS}, {COLS}), reçu {boards.shape}")
+    opponent = PLAYER_1 if piece == PLAYER_2 else PLAYER_2
+    n, rows, cols = boards.shape
+    indices = window_index(rows, cols, connect)
+    
+    scores = np.empty(n, dtype=np.int64)
+    flat_boards = boards.reshape(n, rows * cols)
+    
+    for start in range(0, n, BATCH_CHUNK_SIZE):
+        flat = flat_boards[start:start + BATCH_CHUNK_SIZE].astype(np.int8)
+        
+        # 1. Contrôle du centre
+        score = (flat[:, cols // 2::cols] == piece).sum(axis=1, dtype=np.int64) * CENTER_WEIGHT
+        
+        # 2. Toutes les fenêtres : tableau (paquet, 69, 4) sur le plateau standard
+        windows = flat[:, indices]
+        piece_count = (windows == piece).sum(axis=2, dtype=np.int8)
+        empty_count = (windows == EMPTY).sum(axis=2, dtype=np.int8)
+        opponent_count = (windows == opponent).sum(axis=2, dtype=np.int8)
+        
+        # 3. Même barème que evaluate_window
+        window_scores = np.where(piece_count == connect, FOUR_WEIGHT,
+                        np.where((piece_count == connect - 1) & (empty_count == 1), THREE_WEIGHT,
+                        np.where((piece_count == connect - 2) & (empty_count == 2), TWO_WEIGHT, 0)))
+        window_scores += np.where((opponent_count == connect - 1) & (empty_count == 1), OPP_THREE_WEIGHT, 0)
+        
+        scores[start:start + len(flat)] = score + window_scores.sum(axis=1)
+    
+    return scores
+
+
 def heuristic(game, piece):
     """
-    Fonction heuristique principale appelée par Min-Max et Alpha-Beta
+    Fonction heuristique pour les appelants extérieurs aux recherches
+    
+    Min-Max, Alpha-Beta et Negamax vérifient déjà l'état terminal de chaque
+    nœud : à l'horizon, ils lisent directement game.evaluate(PLAYER_2).
     
     Args:
         game (Connect4): L'état du jeu à évaluer
@@ -111,16 +196,18 @@ def heuristic(game, piece):
              < 0 : Avantageux pour l'adversaire
              = 0 : Position équilibrée
     """
-    # Vérifier les états terminaux
-    if game.check_win(piece):
+    # Vérifier les états terminaux (une seule passe, autour du dernier coup)
+    status = game.terminal_status()
+    if status == piece:
         return 100000000  # Victoire de l'IA : score maximal
-    elif game.check_win(PLAYER_1 if piece == PLAYER_2 else PLAYER_2):
-        return -100000000  # Victoire de l'adversaire : score minimal
-    elif len(game.get_valid_locations()) == 0:
+    elif status == DRAW:
         return 0  # Match nul
+    elif status != ONGOING:
+        return -100000000  # Victoire de l'adversaire : score minimal
     
-    # Évaluer la position
-    return evaluate_position(game.board, piece)
+    # Évaluer la position : le score est tenu à jour à chaque coup par le jeu
+    # (même résultat que evaluate_position(game.board, piece), en O(1))
+    return game.evaluate(piece)
 
 
 # EXPLICATIONS DE LA FONCTION HEURISTIQUE :
@@ -160,4 +247,13 @@ Fenêtre [O,O,O,_] horizontale :
 - Si l'adversaire joue X dans le vide → il peut gagner → -4
 
 Score total = somme de toutes les fenêtres évaluées
+
+ÉVALUATION INCRÉMENTALE :
+-------------------------
+Un coup ne modifie que les fenêtres qui passent par sa case (au plus 13
+sur 69). Le jeu (game.Connect4) garde donc le nombre de pions de chaque
+joueur par fenêtre et le score courant des deux joueurs, mis à jour à
+chaque coup joué ou annulé. heuristic() et les recherches lisent ce score
+en O(1) ; evaluate_position() reste la référence (test_incremental.py
+vérifie que les deux donnent le même résultat).
 """
\ No newline at end of file
@@ -0,0 +1,232 @@
+"""
+lazysmp.py
+Recherche parallèle "Lazy SMP" avec table de transposition partagée
+
+N processus lancent la même recherche Alpha-Beta par approfondissement
+itératif (alphabeta.find_best_move_alphabeta) sur la même position, avec
+des ordres de coups légèrement différents. Ils ne communiquent que par une
+table de transposition sans verrou en mémoire partagée : ce qu'un
+processus a déjà résolu, les autres le trouvent dans la table.
+"""
+
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+
+from game import COLS, PLAYER_1, PLAYER_2
+from alphabeta import find_best_move_alphabeta
+from transposition import SharedTranspositionTable, DEFAULT_SIZE_MB
+from ordering import make_orderer, DEFAULT_STRATEGY
+from endgame import EndgameSolver, solve_endgame
+
+# Stratégies utilisées à tour de rôle par les processus auxiliaires
+HELPER_STRATEGIES = ['history', 'killer', 'pv', 'center']
+
+# Table partagée et événement d'arrêt (initialisés dans chaque processus)
+_shared_tt = None
+_stop_event = None
+
+
+def _init_worker(shared_tt, stop_event):
+    """Initialise un processus de calcul avec la table partagée"""
+    global _shared_tt, _stop_event
+    _shared_tt = shared_tt
+    _stop_event = stop_event
+
+
+def helper_orderer(worker_id, ordering=DEFAULT_STRATEGY, cols=COLS):
+    """
+    Crée l'ordonnanceur d'un processus : le processus principal (0) garde
+    la stratégie demandée, les auxiliaires changent de stratégie et partent
+    d'un historique aléatoire pour explorer l'arbre dans un autre ordre
+
+    Args:
+        worker_id (int): Numéro du processus (0 = principal)
+        ordering (str): Stratégie du processus principal
+        cols (int): Nombre de colonnes du plateau
+
+    Returns:
+        MoveOrderer: L'ordonnanceur
+    """
+    if worker_id == 0:
+        return make_orderer(ordering)
+    orderer = make_orderer(HELPER_STRATEGIES[(worker_id - 1) % len(HELPER_STRATEGIES)])
+    if hasattr(orderer, 'history'):
+        rng = random.Random(worker_id)
+        orderer.history = {piece: [rng.randrange(16) for _ in range(cols)]
+                           for piece in (PLAYER_1, PLAYER_2)}
+    return orderer
+
+
+def _search_worker(worker_id, game, depth, time_limit, ordering):
+    """
+    Recherche d'un processus (exécutée dans le pool)
+
+    Args:
+        worker_id (int): Numéro du processus (0 = principal)
+        game (Connect4): Position racine
+        depth (int): Profondeur maximale (None = limitée par le temps)
+        time_limit (float): Temps alloué (math.inf = jusqu'à la profondeur maximale)
+        ordering (str): Stratégie du processus principal
+
+    Returns:
+        dict: Coup, score et statistiques du processus
+    """
+    start_time = time.perf_counter()
+    col, score, stats = find_best_move_alphabeta(
+        game, depth, tt=_shared_tt, time_limit=time_limit,
+        ordering=helper_orderer(worker_id, ordering, game.geometry.cols),
+        stop_event=None if worker_id == 0 else _stop_event)
+    stats.update({
+        'worker_id': worker_id,
+        'pid': os.getpid(),
+        'column': col,
+        'score': score,
+        'time': time.perf_counter() - start_time
+    })
+    return stats
+
+
+class LazySMPSearcher:
+    """
+    Pool de processus et table partagée réutilisables pour Lazy SMP
+    (à fermer avec close() ou à utiliser avec `with`)
+    """
+
+    def __init__(self, workers=None, tt_size_mb=DEFAULT_SIZE_MB):
+        """
+        Args:
+            workers (int): Nombre de processus (par défaut : nombre de cœurs)
+            tt_size_mb (float): Taille de la table partagée (en Mo)
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.tt = SharedTranspositionTable(tt_size_mb)
+        self.stop_event = multiprocessing.Event()
+        self.executor = ProcessPoolExecutor(max_workers=self.workers,
+                                            initializer=_init_worker,
+                                            initargs=(self.tt, self.stop_event))
+        self.endgame_solver = EndgameSolver()  # Fins de partie résolues dans ce processus
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Arrête les processus et libère la table partagée"""
+        self.executor.shutdown()
+        self.tt.close()
+
+    def search(self, game, depth=None, time_limit=None, ordering=DEFAULT_STRATEGY, clear_tt=True):
+        """
+        Trouve le meilleur coup avec tous les processus
+
+        Le résultat est celui du processus principal ; les auxiliaires
+        sont arrêtés dès qu'il a terminé. Comme la table ne coupe qu'avec
+        des entrées de même profondeur, le score est celui d'Alpha-Beta
+        séquentiel à la même profondeur.
+
+        Args:
+            game (Connect4): État actuel du jeu
+            depth (int): Profondeur maximale
+            time_limit (float): Temps alloué en secondes
+            ordering (str): Stratégie d'ordonnancement du processus principal
+            clear_tt (bool): Vider la table partagée avant la recherche
+
+        Returns:
+            tuple: (meilleure_colonne, score, statistiques)
+        """
+        if depth is None and time_limit is None:
+            raise ValueError("Il faut indiquer une profondeur ou un temps limite")
+        self.tt.check_limits(game.geometry, depth)
+
+        # Fin de partie : le solveur exact suffit, inutile de lancer les processus
+        result = solve_endgame(game, solver=self.endgame_solver)
+        if result is not None:
+            return result
+
+        start_time = time.perf_counter()
+        if clear_tt:
+            self.tt.clear()
+        self.stop_event.clear()
+        if time_limit is None:
+            time_limit = math.inf
+
+        root = game.copy()
+        futures = [self.executor.submit(_search_worker, worker_id, root, depth, time_limit, ordering)
+                   for worker_id in range(self.workers)]
+
+        # Le processus principal décide ; les auxiliaires s'arrêtent ensuite
+        main_stats = futures[0].result()
+        self.stop_event.set()
+        helper_stats = [future.result() for future in futures[1:]]
+        all_stats = [main_stats] + helper_stats
+
+        return main_stats['column'], main_stats['score'], {
+            'nodes_explored': sum(s['nodes_explored'] for s in all_stats),
+            'nodes_pruned': sum(s['nodes_pruned'] for s in all_stats),
+            'tt_hits': sum(s['tt_hits'] for s in all_stats),
+            'tt_stores': sum(s['tt_stores'] for s in all_stats),
+            'tt_collisions': sum(s['tt_collisions'] for s in all_stats),
+            'depth_reached': main_stats['depth_reached'],
+            'iterations': main_stats['iterations'],
+            'workers': self.workers,
+            'worker_stats': [{
+                'worker_id': s['worker_id'],
+                'pid': s['pid'],
+                'ordering': s['ordering'],
+                'depth_reached': s['depth_reached'],
+                'nodes': s['nodes_explored'],
+                'time': s['time']
+            } for s in all_stats],
+            'wall_time': time.perf_counter() - start_time
+        }
+
+
+def find_best_move_lazy_smp(game, depth=None, time_limit=None, workers=None,
+                            tt_size_mb=DEFAULT_SIZE_MB, ordering=DEFAULT_STRATEGY):
+    """
+    Trouve le meilleur coup avec Lazy SMP
+    (crée le pool le temps de la recherche, voir LazySMPSearcher pour le réutiliser)
+
+    Args:
+        game (Connect4): État actuel du jeu
+        depth (int): Profondeur maximale
+        time_limit (float): Temps alloué en secondes
+        workers (int): Nombre de processus (par défaut : nombre de cœurs)
+        tt_size_mb (float): Taille de la table partagée (en Mo)
+        ordering (str): Stratégie d'ordonnancement du processus principal
+
+    Returns:
+        tuple: (meilleure_colonne, score, statistiques)
+    """
+    with LazySMPSearcher(workers, tt_size_mb) as searcher:
+        return searcher.search(game, depth, time_limit, ordering)
+
+
+# EXPLICATION DE LAZY SMP :
+"""
+PRINCIPE :
+----------
+Au lieu de découper l'arbre (voir parallel.py), chaque processus cherche
+TOUT l'arbre. Seul l'ordre d'exploration change d'un processus à l'autre :
+ils se retrouvent rapidement sur des sous-arbres différents et déposent
+leurs résultats dans la table partagée, que les autres réutilisent.
+
+POURQUOI ÇA MARCHE MIEUX QUE LE DÉCOUPAGE DE LA RACINE :
+--------------------------------------------------------
+Au milieu de partie, la racine n'a souvent qu'un ou deux bons coups :
+avec le découpage de la racine, les processus chargés des mauvais coups
+terminent vite et restent inactifs. Avec Lazy SMP, tous les processus
+travaillent jusqu'au bout sur tout l'arbre.
+
+TABLE SANS VERROU :
+-------------------
+Une entrée = 2 mots de 64 bits (clé XOR données, données). Une écriture
+concurrente peut produire un mélange de deux entrées ; il est alors
+détecté à la lecture (le XOR ne redonne pas la clé) et ignoré.
+"""
@@ -4,18 +4,21 @@ Programme principal avec interface graphique Pygame
 Menu de sélection de l'algorithme et de la profondeur
 """
 
+import math
 import pygame
 import sys
 import time
 from game import Connect4, ROWS, COLS, PLAYER_1, PLAYER_2, EMPTY
-from minimax import find_best_move_minimax
-from alphabeta import find_best_move_alphabeta
+from engine import EngineHandle, TT_ALGORITHMS
+from mcts import ITERATIONS_PER_DEPTH
 
 # Constantes pour l'interface
 SQUARE_SIZE = 100
 WIDTH = COLS * SQUARE_SIZE
 HEIGHT = (ROWS + 1) * SQUARE_SIZE
 RADIUS = int(SQUARE_SIZE / 2 - 5)
+FPS = 30  # Images par seconde (l'interface reste fluide pendant que l'IA réfléchit)
+PONDER = True  # L'IA cherche à l'avance pendant le tour du joueur
 
 # Couleurs
 BLUE = (0, 102, 204)
@@ -25,6 +28,7 @@ YELLOW = (255, 255, 0)
 WHITE = (255, 255, 255)
 GREEN = (0, 255, 0)
 GRAY = (100, 100, 100)
+PURPLE = (120, 60, 170)
 LIGHT_GRAY = (200, 200, 200)
 DARK_BLUE = (0, 51, 102)
 
@@ -74,12 +78,17 @@ def show_menu(screen):
     font_button = pygame.font.SysFont("Arial", 28, bold=True)
     
     # Variables de sélection
-    selected_algo = None  # 'minimax' ou 'alphabeta'
+    selected_algo = None  # 'minimax', 'alphabeta', 'negamax' ou 'mcts'
     selected_depth = 5    # Profondeur par défaut
     
     # Boutons pour les algorithmes
-    btn_minimax = Button(100, 200, 250, 80, "Min-Max", RED, (255, 50, 50))
-    btn_alphabeta = Button(WIDTH - 350, 200, 250, 80, "Alpha-Beta", BLUE, (50, 150, 255))
+    algo_width = 155
+    algo_spacing = (WIDTH - 4 * algo_width) // 5
+    algo_x = [algo_spacing + i * (algo_width + algo_spacing) for i in range(4)]
+    btn_minimax = Button(algo_x[0], 200, algo_width, 80, "Min-Max", RED, (255, 50, 50))
+    btn_alphabeta = Button(algo_x[1], 200, algo_width, 80, "Alpha-Beta", BLUE, (50, 150, 255))
+    btn_negamax = Button(algo_x[2], 200, algo_width, 80, "Negamax", GRAY, (150, 150, 150))
+    btn_mcts = Button(algo_x[3], 200, algo_width, 80, "MCTS", PURPLE, (170, 110, 220))
     
     # Boutons pour la profondeur
     depth_buttons = []
@@ -121,21 +130,33 @@ def show_menu(screen):
         # Boutons algorithme
         btn_minimax.check_hover(mouse_pos)
         btn_alphabeta.check_hover(mouse_pos)
+        btn_negamax.check_hover(mouse_pos)
+        btn_mcts.check_hover(mouse_pos)
         
         btn_minimax.draw(screen, font_button)
         btn_alphabeta.draw(screen, font_button)
+        btn_negamax.draw(screen, font_button)
+        btn_mcts.draw(screen, font_button)
         
         # Sélection algorithme
         if btn_minimax.is_clicked(mouse_pos, mouse_clicked):
             selected_algo = 'minimax'
         if btn_alphabeta.is_clicked(mouse_pos, mouse_clicked):
             selected_algo = 'alphabeta'
+        if btn_negamax.is_clicked(mouse_pos, mouse_clicked):
+            selected_algo = 'negamax'
+        if btn_mcts.is_clicked(mouse_pos, mouse_clicked):
+            selected_algo = 'mcts'
         
         # Indicateur de sélection algorithme
         if selected_algo == 'minimax':
             pygame.draw.rect(screen, YELLOW, btn_minimax.rect, 5, border_radius=10)
         elif selected_algo == 'alphabeta':
             pygame.draw.rect(screen, YELLOW, btn_alphabeta.rect, 5, border_radius=10)
+        elif selected_algo == 'negamax':
+            pygame.draw.rect(screen, YELLOW, btn_negamax.rect, 5, border_radius=10)
+        elif selected_algo == 'mcts':
+            pygame.draw.rect(screen, YELLOW, btn_mcts.rect, 5, border_radius=10)
         
         # Section Profondeur
         subtitle_depth = font_subtitle.render("Choisissez la profondeur :", True, WHITE)
@@ -154,11 +175,19 @@ def show_menu(screen):
                 pygame.draw.rect(screen, YELLOW, btn.rect, 5, border_radius=10)
         
         # Informations sur la profondeur
-        depth_info = [
-            "Prof. 3-4 : Rapide, IA moyenne",
-            "Prof. 5 : Équilibré (recommandé)",
-            "Prof. 6-7 : Lent, IA excellente"
-        ]
+        if selected_algo == 'mcts':
+            # MCTS n'a pas de profondeur : chaque niveau ajoute des simulations
+            depth_info = [
+                f"MCTS : {ITERATIONS_PER_DEPTH} simulations par niveau",
+                f"Prof. {selected_depth} : {selected_depth * ITERATIONS_PER_DEPTH} simulations",
+                "Plus de simulations : plus lent, IA plus forte"
+            ]
+        else:
+            depth_info = [
+                "Prof. 3-4 : Rapide, IA moyenne",
+                "Prof. 5 : Équilibré (recommandé)",
+                "Prof. 6-7 : Lent, IA excellente"
+            ]
         for i, info in enumerate(depth_info):
             text = font_text.render(info, True, LIGHT_GRAY)
             screen.blit(text, (50, 490 + i * 25))
@@ -208,10 +237,11 @@ def draw_board(screen, game, winning_tokens=None):
                               int(r * SQUARE_SIZE + SQUARE_SIZE + SQUARE_SIZE/2)), 
                              RADIUS)
     
-    # Dessine les pions
+    # Dessine les pions (game.board reconstruit le plateau : une seule lecture par image)
+    board = game.board
     for c in range(COLS):
         for r in range(ROWS):
-            if game.board[r][c] == PLAYER_1:
+            if board[r][c] == PLAYER_1:
                 color = RED
                 if winning_tokens and (r, c) in winning_tokens:
                     color = GREEN
@@ -219,7 +249,7 @@ def draw_board(screen, game, winning_tokens=None):
                                  (int(c * SQUARE_SIZE + SQUARE_SIZE/2), 
                                   HEIGHT - int(r * SQUARE_SIZE + SQUARE_SIZE/2)), 
                                  RADIUS)
-            elif game.board[r][c] == PLAYER_2:
+            elif board[r][c] == PLAYER_2:
                 color = YELLOW
                 if winning_tokens and (r, c) in winning_tokens:
                     color = GREEN
@@ -240,7 +270,7 @@ def display_stats(screen, font, algo_name, exec_time, nodes, pruned=None):
         algo_name (str): Nom de l'algorithme
         exec_time (float): Temps d'exécution en secondes
         nodes (int): Nombre de nœuds explorés
-        pruned (int): Nombre de nœuds élagués (pour Alpha-Beta)
+        pruned (int): Nombre de nœuds élagués (pour Alpha-Beta et Negamax, None sinon)
     """
     y_offset = HEIGHT - 90
     
@@ -256,7 +286,7 @@ def display_stats(screen, font, algo_name, exec_time, nodes, pruned=None):
     text = font.render(f"Noeuds: {nodes}", True, WHITE)
     screen.blit(text, (10, y_offset + 40))
     
-    # Nœuds élagués (si Alpha-Beta)
+    # Nœuds élagués (si Alpha-Beta ou Negamax)
     if pruned is not None:
         text = font.render(f"Elagages: {pruned}", True, GREEN)
         screen.blit(text, (10, y_offset + 60))
@@ -264,13 +294,38 @@ def display_stats(screen, font, algo_name, exec_time, nodes, pruned=None):
     pygame.display.update()
 
 
-def play_game(ai_algorithm, search_depth):
+def draw_thinking_indicator(screen, font, elapsed):
+    """
+    Affiche l'indicateur animé "L'IA réfléchit" dans la barre du haut
+    
+    Args:
+        screen: Surface Pygame
+        font: Police pour le texte
+        elapsed (float): Temps de réflexion écoulé en secondes
+    """
+    pygame.draw.rect(screen, BLACK, (0, 0, WIDTH, SQUARE_SIZE))
+    dots = '.' * (int(elapsed * 3) % 4)
+    label = font.render(f"L'IA reflechit{dots:<3} {elapsed:.1f}s", 1, YELLOW)
+    screen.blit(label, (WIDTH//2 - 130, 10))
+    
+    # Pion jaune qui va et vient sous le texte
+    x = WIDTH//2 + int(math.sin(elapsed * 3) * (WIDTH//2 - SQUARE_SIZE))
+    pygame.draw.circle(screen, YELLOW, (x, int(SQUARE_SIZE * 0.7)), RADIUS // 4)
+    pygame.display.update()
+
+
+def play_game(ai_algorithm, search_depth, engine):
     """
     Lance une partie avec les paramètres choisis
     
+    La recherche de l'IA tourne en arrière-plan (engine) : la boucle
+    continue de traiter les événements et d'afficher l'indicateur de
+    réflexion ; fermer la fenêtre annule la recherche en cours.
+    
     Args:
-        ai_algorithm (str): 'minimax' ou 'alphabeta'
+        ai_algorithm (str): 'minimax', 'alphabeta', 'negamax' ou 'mcts'
         search_depth (int): Profondeur de recherche
+        engine (EngineHandle): Moteur de recherche en arrière-plan
     """
     # Initialisation de Pygame
     screen = pygame.display.set_mode((WIDTH, HEIGHT))
@@ -284,6 +339,10 @@ def play_game(ai_algorithm, search_depth):
     game = Connect4()
     draw_board(screen, game)
     
+    clock = pygame.time.Clock()
+    ai_future = None  # Recherche de l'IA en cours
+    start_time = 0
+    
     # Variables pour les statistiques
     last_ai_time = 0
     last_ai_nodes = 0
@@ -303,6 +362,7 @@ def play_game(ai_algorithm, search_depth):
     while not game.game_over:
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
+                engine.cancel()
                 return
             
             # Affichage du pion qui suit la souris
@@ -316,7 +376,7 @@ def play_game(ai_algorithm, search_depth):
                 if last_ai_nodes > 0:
                     display_stats(screen, font_small, ai_algorithm.upper(), 
                                 last_ai_time, last_ai_nodes, 
-                                last_ai_pruned if ai_algorithm == 'alphabeta' else None)
+                                last_ai_pruned if ai_algorithm in TT_ALGORITHMS else None)
                 
                 pygame.display.update()
             
@@ -344,30 +404,21 @@ def play_game(ai_algorithm, search_depth):
                         game.turn = PLAYER_2
                         draw_board(screen, game, winning_tokens)
         
-        # Tour de l'IA (PLAYER_2)
-        if game.turn == PLAYER_2 and not game.game_over:
-            # Afficher "L'IA réfléchit..."
-            pygame.draw.rect(screen, BLACK, (0, 0, WIDTH, SQUARE_SIZE))
-            label = font_small.render("L'IA reflechit...", 1, YELLOW)
-            screen.blit(label, (WIDTH//2 - 100, 10))
-            pygame.display.update()
-            
+        # Tour de l'IA (PLAYER_2) : la recherche tourne en arrière-plan
+        if game.turn == PLAYER_2 and not game.game_over and ai_future is None:
             print(f"\n{'='*70}")
             print(f"Tour de l'IA ({ai_algorithm.upper()})...")
-            
-            # Mesurer le temps d'exécution
             start_time = time.time()
-            
-            # Choisir l'algorithme
-            if ai_algorithm == 'minimax':
-                col, score, stats = find_best_move_minimax(game, search_depth)
-                last_ai_pruned = 0  # Min-Max n'a pas d'élagage
-            else:  # alphabeta
-                col, score, stats = find_best_move_alphabeta(game, search_depth)
-                last_ai_pruned = stats.get('nodes_pruned', 0)
-            
-            end_time = time.time()
-            execution_time = end_time - start_time
+            ai_future = engine.search(game, ai_algorithm, search_depth)
+        
+        if ai_future is not None and not ai_future.done():
+            draw_thinking_indicator(screen, font_small, time.time() - start_time)
+        
+        elif ai_future is not None:
+            col, score, stats = ai_future.result()
+            ai_future = None
+            execution_time = time.time() - start_time
+            last_ai_pruned = stats.get('nodes_pruned', 0)  # 0 pour Min-Max et MCTS (pas d'élagage)
             
             # Sauvegarder les statistiques
             last_ai_time = execution_time
@@ -376,15 +427,25 @@ def play_game(ai_algorithm, search_depth):
             # Afficher les statistiques
             print(f"Colonne choisie : {col}")
             print(f"Score évalué : {score}")
+            if stats.get('book_hit'):
+                print(f"Coup de la bibliothèque d'ouvertures (profondeur {stats['book_depth']})")
+            if stats.get('endgame'):
+                print(f"Solveur exact de fin de partie ({stats['endgame_empty_cells']} cases vides)")
+            if stats.get('ponder_hit'):
+                print(f"Coup deviné pendant votre tour : {stats['ponder_time_saved']:.3f}s de recherche économisées")
             print(f"Temps d'exécution : {execution_time:.3f} secondes")
             print(f"Nœuds explorés : {stats['nodes_explored']}")
-            if ai_algorithm == 'alphabeta':
+            if 'playouts_per_sec' in stats:
+                print(f"Simulations : {stats['playouts']} ({stats['playouts_per_sec']:,.0f}/s), "
+                      f"arbre : {stats['tree_nodes']:,} nœuds, {stats['reused_visits']} visites réutilisées")
+            if ai_algorithm in TT_ALGORITHMS:
                 print(f"Nœuds élagués : {stats['nodes_pruned']}")
                 efficiency = (stats['nodes_pruned'] / stats['nodes_explored'] * 100) if stats['nodes_explored'] > 0 else 0
                 print(f"Efficacité élagage : {efficiency:.1f}%")
             print(f"{'='*70}\n")
             
             # Jouer le coup
+            pygame.draw.rect(screen, BLACK, (0, 0, WIDTH, SQUARE_SIZE))
             if game.is_valid_location(col):
                 row = game.get_next_open_row(col)
                 game.drop_piece(row, col, PLAYER_2)
@@ -401,6 +462,10 @@ def play_game(ai_algorithm, search_depth):
                 
                 game.turn = PLAYER_1
                 draw_board(screen, game, winning_tokens)
+                
+                # Chercher à l'avance pendant que le joueur réfléchit
+                if PONDER and not game.game_over and not game.is_terminal_node():
+                    engine.ponder(game, ai_algorithm, search_depth)
         
         # Vérification match nul
         if len(game.get_valid_locations()) == 0 and not game.game_over:
@@ -411,6 +476,17 @@ def play_game(ai_algorithm, search_depth):
             end_message = "MATCH NUL !"
             end_message_color = WHITE
             print("\n🤝 MATCH NUL ! 🤝\n")
+        
+        clock.tick(FPS)
+    
+    # Bilan de la réflexion pendant le tour du joueur
+    if PONDER:
+        ponder_stats = engine.get_ponder_stats()
+        print(f"Coups du joueur devinés : {ponder_stats['ponder_hits']}/"
+              f"{ponder_stats['ponder_hits'] + ponder_stats['ponder_misses']} "
+              f"({ponder_stats['ponder_hit_rate'] * 100:.0f}%), "
+              f"temps de réponse économisé : {ponder_stats['ponder_time_saved']:.2f}s "
+              f"({ponder_stats['ponder_time_saved_per_move']:.3f}s par coup)")
     
     # Afficher les statistiques finales et le message de fin
     pygame.draw.rect(screen, BLACK, (0, 0, WIDTH, SQUARE_SIZE))
@@ -423,11 +499,15 @@ def play_game(ai_algorithm, search_depth):
     if last_ai_nodes > 0:
         display_stats(screen, font_small, ai_algorithm.upper(), 
                     last_ai_time, last_ai_nodes, 
-                    last_ai_pruned if ai_algorithm == 'alphabeta' else None)
+                    last_ai_pruned if ai_algorithm in TT_ALGORITHMS else None)
     pygame.display.update()
     
-    # Attendre 5 secondes avant de fermer
-    pygame.time.wait(5000)
+    # Attendre 5 secondes avant de fermer (en continuant de traiter les événements)
+    end_time = time.time() + 5
+    while time.time() < end_time:
+        if any(event.type == pygame.QUIT for event in pygame.event.get()):
+            return
+        clock.tick(FPS)
 
 
 def main():
@@ -444,8 +524,9 @@ def main():
         pygame.quit()
         sys.exit()
     
-    # Lancer la partie
-    play_game(ai_algorithm, search_depth)
+    # Lancer la partie (le moteur est arrêté à la fin, même si la fenêtre est fermée)
+    with EngineHandle() as engine:
+        play_game(ai_algorithm, search_depth, engine)
     
     pygame.quit()
 
@@ -0,0 +1,549 @@
+"""
+mcts.py
+Recherche arborescente Monte-Carlo (MCTS, sélection UCT)
+
+Au lieu d'explorer l'arbre jusqu'à une profondeur fixe et d'évaluer les
+feuilles avec l'heuristique, MCTS répète des itérations :
+1. SÉLECTION  : descendre l'arbre en choisissant l'enfant de meilleur score UCT
+2. EXPANSION  : ajouter les enfants d'une feuille
+3. SIMULATION : finir la partie au hasard (playout)
+4. RÉTROPROPAGATION : remonter le résultat jusqu'à la racine
+La recherche peut s'arrêter à tout moment (nombre d'itérations ou temps) :
+le coup le plus visité à la racine est joué.
+
+Les nœuds ne sont pas des objets Python : chaque champ est un tableau
+(array.array) indexé par le numéro du nœud, et les enfants d'un nœud
+occupent des cases consécutives. L'arbre est conservé d'un coup à
+l'autre : la partie déjà explorée sous le coup joué est réutilisée.
+"""
+
+import math
+import random
+import time
+from array import array
+
+from game import PLAYER_1, PLAYER_2, ONGOING
+from context import SearchTimeout
+from endgame import solve_endgame, ENDGAME_THRESHOLD
+
+# Constante d'exploration de UCT (√2 : valeur théorique pour des gains entre 0 et 1)
+EXPLORATION = math.sqrt(2)
+
+# Politiques de simulation : 'random' (coups au hasard) ou 'greedy'
+# (gagner si possible, sinon bloquer la victoire immédiate de l'adversaire, sinon au hasard)
+PLAYOUT_POLICIES = ('random', 'greedy')
+DEFAULT_PLAYOUT = 'greedy'
+
+# Itérations par niveau de "profondeur" (pour le menu, qui propose une profondeur
+# comme pour les autres algorithmes : profondeur 5 -> 5 * ITERATIONS_PER_DEPTH)
+ITERATIONS_PER_DEPTH = 2000
+
+# Nombre maximal de nœuds de l'arbre (au-delà, les feuilles ne sont plus développées)
+DEFAULT_MAX_NODES = 2_000_000
+
+# Le chronomètre et l'événement d'arrêt ne sont consultés que toutes les TIME_CHECK_ITERATIONS itérations
+TIME_CHECK_ITERATIONS = 64
+
+
+def _win_checker(geometry):
+    """
+    Test de victoire autour d'une case pour une géométrie (mêmes tables que
+    Connect4.terminal_status, sans passer par un objet Connect4)
+
+    Returns:
+        callable: wins(bitboard, index) -> True si le pion posé en index aligne connect pions
+    """
+    line_pairs = geometry.line_pairs
+    if line_pairs is not None:
+        def wins(bitboard, index):
+            for line, first, second in line_pairs[index]:
+                m = bitboard & line
+                m &= m >> first
+                if m & (m >> second):
+                    return True
+            return False
+    else:
+        line_masks = geometry.line_masks
+
+        def wins(bitboard, index):
+            for line, steps in line_masks[index]:
+                m = bitboard & line
+                for step in steps:
+                    m &= m >> step
+                if m:
+                    return True
+            return False
+    return wins
+
+
+def _threat_finder(geometry):
+    """
+    Cases qui donneraient la victoire à un joueur s'il y posait un pion
+    (alignement de connect - 1 pions avec un trou, en bout ou au milieu)
+
+    Returns:
+        callable: threats(bitboard) -> masque des cases gagnantes (libres ou non)
+    """
+    board_mask = geometry.board_mask
+    others = [d for d in geometry.directions if d != 1]  # Toutes les directions sauf la verticale
+    if geometry.connect == 4:
+        def threats(b):
+            found = (b << 1) & (b << 2) & (b << 3)  # Trois pions juste en dessous
+            for d in others:
+                pair = (b << d) & (b << 2 * d)
+                found |= pair & ((b << 3 * d) | (b >> d))
+                pair = (b >> d) & (b >> 2 * d)
+                found |= pair & ((b >> 3 * d) | (b << d))
+            return found & board_mask
+        return threats
+
+    needed = geometry.connect - 1
+
+    def threats(b):
+        found = -1
+        for i in range(1, needed + 1):
+            found &= b << i
+        for d in others:
+            # before[i] : les i cases précédentes sont au joueur, after[i] : les i suivantes
+            before, after = [-1], [-1]
+            for i in range(1, needed + 1):
+                before.append(before[-1] & (b << i * d))
+                after.append(after[-1] & (b >> i * d))
+            for i in range(needed + 1):
+                found |= before[i] & after[needed - i]
+        return found & board_mask
+    return threats
+
+
+class MCTSTree:
+    """
+    Arbre de recherche Monte-Carlo stocké dans des tableaux
+
+    Le nœud i est décrit par parent[i], move[i] (colonne jouée pour y
+    arriver), visits[i], wins[i] (demi-points du joueur qui a joué move[i] :
+    2 par victoire, 1 par nul), first_child[i] (-1 si non développé) et
+    child_count[i]. Le nœud 0 est la racine.
+    """
+
+    def __init__(self, exploration=EXPLORATION, playout=DEFAULT_PLAYOUT,
+                 max_nodes=DEFAULT_MAX_NODES, seed=None):
+        """
+        Args:
+            exploration (float): Constante d'exploration de UCT
+            playout (str): Politique de simulation ('random' ou 'greedy')
+            max_nodes (int): Nombre maximal de nœuds
+            seed (int): Graine du générateur (None = aléatoire)
+        """
+        if playout not in PLAYOUT_POLICIES:
+            raise ValueError(f"Politique de simulation inconnue : {playout}")
+        self.exploration = exploration
+        self.playout = playout
+        self.max_nodes = max_nodes
+        self.rng = random.Random(seed)
+        self.root_game = None  # Copie de la position racine (pour la réutilisation)
+        self._reset_arrays()
+
+    def _reset_arrays(self):
+        """Arbre réduit à la racine"""
+        self.parent = array('i', [-1])
+        self.move = array('b', [-1])
+        self.visits = array('i', [0])
+        self.wins = array('i', [0])
+        self.first_child = array('i', [-1])
+        self.child_count = array('b', [0])
+
+    def __len__(self):
+        return len(self.visits)
+
+    def memory_bytes(self):
+        """
+        Returns:
+            int: Mémoire occupée par les tableaux de nœuds (en octets)
+        """
+        return sum(a.itemsize * len(a) for a in (self.parent, self.move, self.visits,
+                                                  self.wins, self.first_child, self.child_count))
+
+    def set_root(self, game):
+        """
+        Place la racine sur la position game, en gardant le sous-arbre déjà
+        exploré si game suit la racine précédente de quelques coups
+
+        Args:
+            game (Connect4): Nouvelle position racine
+
+        Returns:
+            int: Nombre de visites conservées à la nouvelle racine
+        """
+        root = self._find_descendant(game)
+        if root is None:
+            self._reset_arrays()
+        elif root != 0:
+            self._compact(root)
+        self.root_game = game.copy()
+        return self.visits[0]
+
+    def _find_descendant(self, game):
+        """
+        Nœud de l'arbre actuel correspondant à game (None s'il n'y en a pas)
+
+        Les coups joués depuis l'ancienne racine sont retrouvés à partir des
+        pions et non de game.moves : les positions de l'interface sont posées
+        avec drop_piece (pas de pile de coups) et Connect4.swapped garde les
+        coups en inversant les couleurs.
+        """
+        old = self.root_game
+        if old is None or old.geometry is not game.geometry:
+            return None
+        geometry = game.geometry
+        target = game.bitboards
+        bitboards = old.bitboards[:]
+        if any(bitboards[p] & ~target[p] for p in (PLAYER_1, PLAYER_2)):
+            return None
+        heights = old.heights[:]
+        player = PLAYER_2  # L'IA est au trait à chaque racine
+        node = 0
+        while bitboards != target:
+            # Le coup du joueur au trait : la seule case jouable où game a un pion de plus
+            added = [col for col in range(geometry.cols) if heights[col] < geometry.rows
+                     and target[player] >> (col * geometry.col_height + heights[col]) & 1]
+            first = self.first_child[node]
+            if len(added) != 1 or first < 0:
+                return None
+            col = added[0]
+            for child in range(first, first + self.child_count[node]):
+                if self.move[child] == col:
+                    node = child
+                    break
+            else:
+                return None
+            bitboards[player] |= 1 << (col * geometry.col_height + heights[col])
+            heights[col] += 1
+            player = 3 - player
+        return node if player == PLAYER_2 else None
+
+    def _compact(self, root):
+        """Recopie le sous-arbre de root dans de nouveaux tableaux (root devient le nœud 0)"""
+        parent, move, visits, wins = array('i', [-1]), array('b', [-1]), array('i'), array('i')
+        first_child, child_count = array('i', [-1]), array('b', [0])
+        visits.append(self.visits[root])
+        wins.append(self.wins[root])
+        queue = [(root, 0)]
+        for old, new in queue:
+            first = self.first_child[old]
+            if first < 0:
+                continue
+            count = self.child_count[old]
+            first_child[new] = len(visits)
+            child_count[new] = count
+            for child in range(first, first + count):
+                queue.append((child, len(visits)))
+                parent.append(new)
+                move.append(self.move[child])
+                visits.append(self.visits[child])
+                wins.append(self.wins[child])
+                first_child.append(-1)
+                child_count.append(0)
+        self.parent, self.move, self.visits, self.wins = parent, move, visits, wins
+        self.first_child, self.child_count = first_child, child_count
+
+    def search(self, game, iterations=None, time_limit=None, stop_event=None):
+        """
+        Lance des itérations depuis game (qui devient la racine)
+
+        Args:
+            game (Connect4): Position racine, l'IA (PLAYER_2) au trait (non modifiée)
+            iterations (int): Nombre d'itérations
+            time_limit (float): Temps alloué en secondes
+            stop_event (Event): Arrête la recherche quand il est activé. Avec un
+                                nombre d'itérations seul, SearchTimeout est alors
+                                levée ; avec time_limit, la recherche s'arrête normalement.
+
+        Returns:
+            dict: Statistiques de la recherche
+        """
+        if iterations is None and time_limit is None:
+            raise ValueError("Il faut indiquer un nombre d'itérations ou un temps limite")
+        start_time = time.perf_counter()
+        deadline = None if time_limit is None else start_time + time_limit
+        reused = self.set_root(game)
+        nodes_before = len(self)
+
+        geometry = game.geometry
+        wins_at = _win_checker(geometry)
+        threats = _threat_finder(geometry)
+        bottom_mask = geometry.bottom_mask
+        board_mask = geometry.board_mask
+        legal_moves = geometry.legal_moves
+        center_rank = geometry.center_rank
+        col_height = geometry.col_height
+        rows = geometry.rows
+        root_player = PLAYER_2  # Comme les autres algorithmes, l'IA (PLAYER_2) est au trait
+        root_bitboards = game.bitboards
+        root_heights = game.heights
+        root_full = game.full_columns
+        root_empty = geometry.cells - bin(game.mask).count('1')
+        root_status = game.terminal_status()
+        greedy = self.playout == 'greedy'
+        rand = self.rng.random
+        log, sqrt = math.log, math.sqrt
+        exploration = self.exploration
+
+        parent, move, visits, wins = self.parent, self.move, self.visits, self.wins
+        first_child, child_count = self.first_child, self.child_count
+
+        done = 0
+        max_depth = 0
+        while root_status == ONGOING and (iterations is None or done < iterations):
+            if done % TIME_CHECK_ITERATIONS == 0 and done > 0:
+                if deadline is not None and time.perf_counter() > deadline:
+                    break
+                if stop_event is not None and stop_event.is_set():
+                    if deadline is None:
+                        raise SearchTimeout()
+                    break
+            done += 1
+
+            # Copie légère de la position : bitboards, hauteurs, colonnes pleines
+            bitboards = root_bitboards[:]
+            heights = root_heights[:]
+            full = root_full
+            empty = root_empty
+            player = root_player   # Joueur au trait
+            winner = ONGOING       # Gagnant (0 = partie en cours, -1 = nul)
+
+            # 1. SÉLECTION
+            node = 0
+            depth = 0
+            while first_child[node] >= 0:
+                first = first_child[node]
+                log_n = log(visits[node])
+                best, best_value = first, -1.0
+                for child in range(first, first + child_count[node]):
+                    n = visits[child]
+                    if n == 0:
+                        best = child
+                        break
+                    value = wins[child] / (2 * n) + exploration * sqrt(log_n / n)
+                    if value > best_value:
+                        best, best_value = child, value
+                node = best
+                depth += 1
+                col = move[node]
+                index = col * col_height + heights[col]
+                bitboards[player] |= 1 << index
+                heights[col] += 1
+                if heights[col] == rows:
+                    full |= 1 << col
+                empty -= 1
+                if wins_at(bitboards[player], index):
+                    winner = player
+                elif empty == 0:
+                    winner = -1
+                player = 3 - player
+                if winner != ONGOING:
+                    break
+
+            # 2. EXPANSION : tous les coups de la feuille, du centre vers les bords
+            if winner == ONGOING and len(visits) < self.max_nodes:
+                moves = sorted(legal_moves[full], key=center_rank.__getitem__)
+                first_child[node] = len(visits)
+                child_count[node] = len(moves)
+                for col in moves:
+                    parent.append(node)
+                    move.append(col)
+                    visits.append(0)
+                    wins.append(0)
+                    first_child.append(-1)
+                    child_count.append(0)
+            if depth > max_depth:
+                max_depth = depth
+
+            # 3. SIMULATION
+            if greedy and winner == ONGOING:
+                # Cases gagnantes de chaque joueur, recalculées seulement quand il joue
+                threat = [0, threats(bitboards[1]), threats(bitboards[2])]
+                while True:
+                    playable = ((bitboards[1] | bitboards[2]) + bottom_mask) & board_mask
+                    if threat[player] & playable:
+                        winner = player  # Coup gagnant disponible : la partie est finie
+                        break
+                    block = threat[3 - player] & playable
+                    if block:
+                        col = ((block & -block).bit_length() - 1) // col_height
+                    else:
+                        moves = legal_moves[full]
+                        col = moves[int(rand() * len(moves))]
+                    # Sans case gagnante pour le joueur, ce coup ne peut pas gagner
+                    bitboards[player] |= 1 << (col * col_height + heights[col])
+                    heights[col] += 1
+                    if heights[col] == rows:
+                        full |= 1 << col
+                    empty -= 1
+                    if empty == 0:
+                        winner = -1
+                        break
+                    threat[player] = threats(bitboards[player])
+                    player = 3 - player
+            while winner == ONGOING:
+                moves = legal_moves[full]
+                col = moves[int(rand() * len(moves))]
+                index = col * col_height + heights[col]
+                bitboards[player] |= 1 << index
+                heights[col] += 1
+                if heights[col] == rows:
+                    full |= 1 << col
+                empty -= 1
+                if wins_at(bitboards[player], index):
+                    winner = player
+                elif empty == 0:
+                    winner = -1
+                player = 3 - player
+
+            # 4. RÉTROPROPAGATION : chaque nœud compte pour le joueur qui y a mené
+            mover = root_player if depth % 2 == 1 else 3 - root_player
+            while node >= 0:
+                visits[node] += 1
+                if winner == mover:
+                    wins[node] += 2
+                elif winner == -1:
+                    wins[node] += 1
+                mover = 3 - mover
+                node = parent[node]
+
+        elapsed = time.perf_counter() - start_time
+        return {
+            'iterations': done,
+            'playouts': done,
+            'playouts_per_sec': done / elapsed if elapsed > 0 else 0.0,
+            'reused_visits': reused,
+            'tree_nodes': len(self),
+            'new_nodes': len(self) - nodes_before,
+            'tree_memory': self.memory_bytes(),
+            'max_depth': max_depth,
+            'search_time': elapsed
+        }
+
+    def root_children(self):
+        """
+        Returns:
+            list: (colonne, visites, taux de gain) de chaque coup de la racine
+        """
+        first = self.first_child[0]
+        if first < 0:
+            return []
+        return [(self.move[c], self.visits[c], self.wins[c] / (2 * self.visits[c]) if self.visits[c] else 0.0)
+                for c in range(first, first + self.child_count[0])]
+
+    def best_move(self):
+        """
+        Coup le plus visité à la racine (plus sûr que le meilleur taux de gain)
+
+        Returns:
+            tuple: (colonne, taux de gain) ou (None, 0.0) si la racine n'a pas d'enfant
+        """
+        children = self.root_children()
+        if not children:
+            return None, 0.0
+        col, _, value = max(children, key=lambda child: child[1])
+        return col, value
+
+
+def find_best_move_mcts(game, depth=None, iterations=None, time_limit=None, mcts_tree=None,
+                        reuse=True, stop_event=None, book=None, endgame_threshold=ENDGAME_THRESHOLD,
+                        endgame_solver=None):
+    """
+    Trouve le meilleur coup par recherche Monte-Carlo
+
+    Args:
+        game (Connect4): État actuel du jeu (l'IA au trait)
+        depth (int): Niveau comme pour les autres algorithmes : depth * ITERATIONS_PER_DEPTH
+                     itérations (ignoré si iterations ou time_limit est donné)
+        iterations (int): Nombre d'itérations
+        time_limit (float): Temps alloué en secondes (avec iterations : le premier atteint)
+        mcts_tree (MCTSTree): Arbre à utiliser, gardé par l'appelant d'un coup à l'autre
+                              (None = un nouvel arbre, sans réutilisation)
+        reuse (bool): Garder l'arbre exploré aux coups précédents
+        stop_event (Event): Arrête la recherche quand il est activé. Sans time_limit,
+                            SearchTimeout est alors levée ; avec time_limit, le
+                            coup le plus visité jusque-là est retourné.
+        book (OpeningBook): Bibliothèque d'ouvertures consultée avant de chercher
+        endgame_threshold (int): Nombre de cases vides à partir duquel le solveur
+                                 exact remplace la recherche (None pour le désactiver)
+        endgame_solver (EndgameSolver): Solveur de fin de partie (un nouveau par défaut ;
+                                        le garder d'un coup à l'autre conserve sa table)
+
+    Returns:
+        tuple: (meilleure_colonne, taux de gain estimé entre 0 et 1, statistiques)
+               (score de la bibliothèque ou du solveur exact s'ils répondent)
+    """
+    if iterations is None and time_limit is None:
+        if depth is None:
+            raise ValueError("Il faut indiquer une profondeur, un nombre d'itérations ou un temps limite")
+        iterations = depth * ITERATIONS_PER_DEPTH
+
+    if book is not None:
+        result = book.probe(game)
+        if result is not None:
+            return result
+    result = solve_endgame(game, endgame_threshold, endgame_solver)
+    if result is not None:
+        return result
+
+    if mcts_tree is None:
+        mcts_tree = MCTSTree()
+    elif not reuse:
+        mcts_tree.root_game = None
+    stats = mcts_tree.search(game, iterations, time_limit, stop_event)
+    col, value = mcts_tree.best_move()
+    if col is None:
+        # Aucune itération (temps nul) : premier coup du centre
+        col = min(game.legal_moves(), key=game.geometry.center_rank.__getitem__)
+    stats.update({
+        'nodes_explored': stats['iterations'],
+        'root_children': [{'column': c, 'visits': n, 'value': v} for c, n, v in mcts_tree.root_children()]
+    })
+    return col, value, stats
+
+
+# EXPLICATION DE MCTS :
+"""
+UCT :
+-----
+À chaque nœud, on descend vers l'enfant qui maximise
+    gains / visites + C * sqrt(ln(visites du parent) / visites)
+Le premier terme exploite les coups qui ont bien réussi, le second
+explore les coups peu essayés. Un enfant jamais visité est choisi en
+premier (du centre vers les bords).
+
+SIMULATIONS :
+-------------
+- 'random' : coups au hasard jusqu'à la fin, le plus rapide
+- 'greedy' : joue le coup gagnant s'il existe, sinon bloque le coup
+  gagnant adverse, sinon au hasard. Plus lent par simulation, mais les
+  résultats ressemblent beaucoup plus à une vraie partie.
+Les simulations travaillent directement sur des copies des bitboards
+(pas de hachage de Zobrist ni d'évaluation incrémentale à tenir à jour).
+
+STOCKAGE DES NŒUDS :
+--------------------
+Six tableaux array.array (parent, coup, visites, gains, premier enfant,
+nombre d'enfants) : environ 18 octets par nœud au lieu de plusieurs
+centaines pour un objet Python. Les enfants sont créés tous ensemble et
+rangés à la suite : les parcourir est une simple boucle sur un intervalle.
+
+RÉUTILISATION DE L'ARBRE :
+--------------------------
+Après le coup de l'IA et la réponse du joueur, le nœud de la nouvelle
+position existe souvent déjà dans l'arbre : son sous-arbre est recopié
+(le reste est oublié) et ses visites servent immédiatement. L'arbre
+appartient à celui qui mène la partie (processus du moteur, partie IA
+contre IA) et est passé avec mcts_tree : deux parties ne partagent
+jamais le même arbre.
+
+BUDGET :
+--------
+Nombre d'itérations ou temps limite : MCTS est un algorithme "à tout
+moment", le coup le plus visité est toujours disponible. stats contient
+les simulations par seconde (playouts_per_sec) pour comparer sa force à
+celle d'Alpha-Beta à temps de calcul égal (voir stats.compare_mcts).
+"""
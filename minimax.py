@@ -8,129 +8,154 @@ L'algorithme Min-Max explore l'arbre de jeu en alternant entre :
 """
 
 import math
-from game import PLAYER_1, PLAYER_2
-from heuristic import heuristic
+from game import PLAYER_1, PLAYER_2, ONGOING
+from context import SearchContext, SearchTimeout, TIME_CHECK_INTERVAL
 
 
-class MinMaxStats:
-    """Classe pour collecter les statistiques de l'algorithme"""
-    def __init__(self):
-        self.nodes_explored = 0  # Nombre de nœuds explorés
-        self.max_depth_reached = 0  # Profondeur maximale atteinte
-        
-    def reset(self):
-        """Réinitialise les compteurs"""
-        self.nodes_explored = 0
-        self.max_depth_reached = 0
-
-
-# Instance globale pour les statistiques
-stats = MinMaxStats()
-
-
-def minimax(game, depth, maximizing_player):
+def minimax(game, depth, maximizing_player, ctx):
     """
     Algorithme Min-Max récursif
     
+    Le nombre de nœuds est tenu dans des variables locales de _minimax et
+    ajouté au contexte une seule fois, à la fin de la recherche.
+    
     Args:
         game (Connect4): État actuel du jeu
         depth (int): Profondeur restante à explorer
         maximizing_player (bool): True si c'est le tour de MAX (IA)
+        ctx (SearchContext): Contexte de la recherche (statistiques et arrêt)
         
     Returns:
         tuple: (meilleur_score, meilleure_colonne)
     """
-    # Incrémenter le compteur de nœuds
-    stats.nodes_explored += 1
+    try:
+        score, col, nodes = _minimax(game, depth, maximizing_player, ctx)
+    except SearchTimeout as stop:
+        ctx.add_counts(stop.nodes, 0, depth)
+        raise
+    ctx.add_counts(nodes, 0, depth)
+    return score, col
+
+
+def _minimax(game, depth, maximizing_player, ctx):
+    """
+    Nœud de la recherche Min-Max (voir minimax)
     
-    # Mettre à jour la profondeur maximale atteinte
-    current_depth = stats.max_depth_reached
-    if depth > current_depth:
-        stats.max_depth_reached = depth
+    Returns:
+        tuple: (meilleur_score, meilleure_colonne, nœuds du sous-arbre, ce nœud compris)
+    """
+    # Condition d'arrêt : nœud terminal (seul le dernier coup peut avoir
+    # créé un alignement) ou profondeur = 0
+    status = game.terminal_status()
+    if status != ONGOING:
+        # États terminaux
+        if status == PLAYER_2:
+            return (100000000, None, 1)  # IA gagne
+        elif status == PLAYER_1:
+            return (-100000000, None, 1)  # Adversaire gagne
+        else:
+            return (0, None, 1)  # Match nul
+    if depth == 0:
+        # Profondeur limite atteinte : le nœud n'est pas terminal (vérifié ci-dessus),
+        # on lit directement le score incrémental
+        return (game.evaluate(PLAYER_2), None, 1)
     
     # Récupérer les coups valides
-    valid_locations = game.get_valid_locations()
-    
-    # Condition d'arrêt : nœud terminal ou profondeur = 0
-    is_terminal = game.is_terminal_node()
+    valid_locations = game.legal_moves()
     
-    if depth == 0 or is_terminal:
-        if is_terminal:
-            # États terminaux
-            if game.check_win(PLAYER_2):
-                return (100000000, None)  # IA gagne
-            elif game.check_win(PLAYER_1):
-                return (-100000000, None)  # Adversaire gagne
-            else:
-                return (0, None)  # Match nul
-        else:
-            # Profondeur limite atteinte : évaluer avec heuristique
-            return (heuristic(game, PLAYER_2), None)
+    # Nœuds du sous-arbre ; les demandes d'arrêt sont vérifiées tous les
+    # TIME_CHECK_INTERVAL nœuds
+    nodes = 1
+    next_check = TIME_CHECK_INTERVAL
     
-    if maximizing_player:
-        # Niveau MAX : L'IA cherche à maximiser
-        value = -math.inf
-        best_col = valid_locations[0]  # Colonne par défaut
-        
-        for col in valid_locations:
-            # Créer une copie du jeu et simuler le coup
-            temp_game = game.copy()
-            row = temp_game.get_next_open_row(col)
-            temp_game.drop_piece(row, col, PLAYER_2)
-            
-            # Appel récursif pour le niveau MIN
-            new_score, _ = minimax(temp_game, depth - 1, False)
+    try:
+        if maximizing_player:
+            # Niveau MAX : L'IA cherche à maximiser
+            value = -math.inf
+            best_col = valid_locations[0]  # Colonne par défaut
             
-            # Mettre à jour le meilleur score
-            if new_score > value:
-                value = new_score
-                best_col = col
+            for col in valid_locations:
+                # Simuler le coup sur le plateau (annulé juste après)
+                game.play(col, PLAYER_2)
+                
+                # Appel récursif pour le niveau MIN
+                new_score, _, child_nodes = _minimax(game, depth - 1, False, ctx)
+                game.undo()
+                nodes += child_nodes
+                if nodes >= next_check:
+                    if ctx.should_stop():
+                        raise SearchTimeout()
+                    next_check = nodes + TIME_CHECK_INTERVAL
+                
+                # Mettre à jour le meilleur score
+                if new_score > value:
+                    value = new_score
+                    best_col = col
         
-        return value, best_col
-    
-    else:
-        # Niveau MIN : L'adversaire cherche à minimiser
-        value = math.inf
-        best_col = valid_locations[0]  # Colonne par défaut
-        
-        for col in valid_locations:
-            # Créer une copie du jeu et simuler le coup
-            temp_game = game.copy()
-            row = temp_game.get_next_open_row(col)
-            temp_game.drop_piece(row, col, PLAYER_1)
-            
-            # Appel récursif pour le niveau MAX
-            new_score, _ = minimax(temp_game, depth - 1, True)
+        else:
+            # Niveau MIN : L'adversaire cherche à minimiser
+            value = math.inf
+            best_col = valid_locations[0]  # Colonne par défaut
             
-            # Mettre à jour le meilleur score
-            if new_score < value:
-                value = new_score
-                best_col = col
-        
-        return value, best_col
+            for col in valid_locations:
+                # Simuler le coup sur le plateau (annulé juste après)
+                game.play(col, PLAYER_1)
+                
+                # Appel récursif pour le niveau MAX
+                new_score, _, child_nodes = _minimax(game, depth - 1, True, ctx)
+                game.undo()
+                nodes += child_nodes
+                if nodes >= next_check:
+                    if ctx.should_stop():
+                        raise SearchTimeout()
+                    next_check = nodes + TIME_CHECK_INTERVAL
+                
+                # Mettre à jour le meilleur score
+                if new_score < value:
+                    value = new_score
+                    best_col = col
+    except SearchTimeout as stop:
+        # Ajouter les nœuds de ce sous-arbre avant de remonter l'arrêt
+        stop.nodes += nodes
+        raise
+    
+    return value, best_col, nodes
 
 
-def find_best_move_minimax(game, depth):
+def find_best_move_minimax(game, depth, book=None, stop_event=None):
     """
     Trouve le meilleur coup à jouer avec l'algorithme Min-Max
     
     Args:
         game (Connect4): État actuel du jeu
         depth (int): Profondeur de recherche
+        book (OpeningBook): Bibliothèque d'ouvertures consultée avant de chercher
+        stop_event (Event): Arrête la recherche (SearchTimeout est levée) quand il est activé
         
     Returns:
         tuple: (meilleure_colonne, score, statistiques)
     """
-    # Réinitialiser les statistiques
-    stats.reset()
+    # Position connue : le coup de la bibliothèque évite toute recherche
+    if book is not None:
+        result = book.probe(game)
+        if result is not None:
+            return result
     
     # Lancer Min-Max
-    score, col = minimax(game, depth, True)
+    root_moves = len(game.moves)
+    ctx = SearchContext(stop_event=stop_event)
+    try:
+        score, col = minimax(game, depth, True, ctx)
+    except SearchTimeout:
+        # Remettre le plateau dans l'état de la racine avant de propager l'arrêt
+        while len(game.moves) > root_moves:
+            game.undo()
+        raise
     
     # Retourner le résultat avec les statistiques
     return col, score, {
-        'nodes_explored': stats.nodes_explored,
-        'max_depth': stats.max_depth_reached
+        'nodes_explored': ctx.nodes_explored,
+        'max_depth': ctx.max_depth_reached
     }
 
 
@@ -0,0 +1,320 @@
+"""
+negamax.py
+Implémentation de Negamax avec Principal Variation Search (PVS)
+et fenêtres d'aspiration
+
+Negamax est une écriture compacte de Min-Max : au lieu de deux branches
+MAX et MIN, chaque nœud maximise le score du point de vue du joueur qui
+joue, et l'on inverse le signe en remontant d'un niveau.
+PVS, avec un approfondissement itératif de deux en deux aux profondeurs
+6 et plus, explore en général moins de nœuds qu'Alpha-Beta (pas sur
+toutes les positions : voir stats.compare_negamax), sans changer le
+score trouvé.
+"""
+
+import math
+from game import PLAYER_1, PLAYER_2, ONGOING
+from transposition import TranspositionTable, EXACT, LOWER_BOUND, UPPER_BOUND
+from ordering import make_orderer, DEFAULT_STRATEGY
+from endgame import solve_endgame, ENDGAME_THRESHOLD
+from context import SearchContext, SearchTimeout, TIME_CHECK_INTERVAL
+
+# Demi-largeur de la fenêtre d'aspiration autour du score de l'itération précédente
+ASPIRATION_WINDOW = 25
+
+# Un score au-delà de ce seuil signifie une victoire ou une défaite forcée
+WIN_THRESHOLD = 100000000
+
+# Écart de profondeur entre deux itérations : les itérations gardent la parité de depth
+DEEPENING_STEP = 2
+
+# En dessous de cette profondeur, une seule recherche à depth (les itérations ne se remboursent pas)
+DEEPENING_MIN_DEPTH = 6
+
+
+def negamax(game, depth, alpha, beta, piece, ctx):
+    """
+    Negamax avec élagage Alpha-Beta et Principal Variation Search
+
+    Le premier coup (supposé le meilleur grâce à l'ordonnancement) est
+    cherché avec la fenêtre complète ; les suivants avec une fenêtre nulle
+    [alpha, alpha + 1] qui se contente de prouver qu'ils sont moins bons.
+    Si la preuve échoue, le coup est recherché avec la fenêtre complète.
+
+    Args:
+        game (Connect4): État actuel du jeu
+        depth (int): Profondeur restante à explorer
+        alpha (float): Meilleur score garanti pour le joueur qui joue
+        beta (float): Meilleur score garanti pour l'adversaire
+        piece (int): Joueur qui joue à ce nœud
+        ctx (SearchContext): Contexte de la recherche (statistiques, arrêt, table
+                             de transposition et ordonnancement des coups)
+
+    Returns:
+        tuple: (meilleur_score du point de vue de piece, meilleure_colonne)
+    """
+    try:
+        score, col, nodes, pruned = _negamax(game, depth, alpha, beta, piece, ctx)
+    except SearchTimeout as stop:
+        ctx.add_counts(stop.nodes, stop.pruned, depth)
+        raise
+    ctx.add_counts(nodes, pruned, depth)
+    return score, col
+
+
+def _negamax(game, depth, alpha, beta, piece, ctx):
+    """
+    Nœud de la recherche Negamax/PVS (voir negamax ; compteurs tenus localement)
+
+    Returns:
+        tuple: (meilleur_score, meilleure_colonne, nœuds explorés, coupures)
+               (nœuds et coupures du sous-arbre, ce nœud compris)
+    """
+    # Les scores du jeu sont du point de vue de l'IA (PLAYER_2)
+    color = 1 if piece == PLAYER_2 else -1
+
+    status = game.terminal_status()
+    if status != ONGOING:
+        if status == PLAYER_2:
+            return color * 100000000, None, 1, 0
+        elif status == PLAYER_1:
+            return -color * 100000000, None, 1, 0
+        return 0, None, 1, 0
+    if depth == 0:
+        return color * game.evaluate(PLAYER_2), None, 1, 0
+    valid_locations = game.legal_moves()
+
+    # Consulter la table de transposition
+    alpha_orig = alpha
+    hash_move = None
+    tt = ctx.tt
+    if tt is not None:
+        key = game.hash ^ game.geometry.zobrist_side if piece == PLAYER_2 else game.hash
+        entry = tt.probe(key)
+        if entry is not None:
+            hash_move = entry[3]
+            if entry[0] == depth:
+                _, tt_score, tt_flag, tt_move = entry
+                if tt_flag == EXACT:
+                    ctx.tt_cutoffs += 1
+                    return tt_score, tt_move, 1, 0
+                elif tt_flag == LOWER_BOUND:
+                    alpha = max(alpha, tt_score)
+                else:
+                    beta = min(beta, tt_score)
+                if alpha >= beta:
+                    ctx.tt_cutoffs += 1
+                    return tt_score, tt_move, 1, 0
+
+    ply = len(game.moves)
+    orderer = ctx.orderer
+    if orderer is not None:
+        valid_locations = orderer.order(valid_locations, ply, piece, hash_move)
+
+    opponent = PLAYER_1 if piece == PLAYER_2 else PLAYER_2
+    value = -math.inf
+    best_col = valid_locations[0]
+    nodes, pruned = 1, 0
+    next_check = TIME_CHECK_INTERVAL
+
+    try:
+        for index, col in enumerate(valid_locations):
+            game.play(col, piece)
+            if index == 0:
+                score, _, child_nodes, child_pruned = _negamax(game, depth - 1, -beta, -alpha, opponent, ctx)
+            else:
+                # Fenêtre nulle : prouver que le coup ne dépasse pas alpha
+                score, _, child_nodes, child_pruned = _negamax(game, depth - 1, -alpha - 1, -alpha, opponent, ctx)
+                if alpha < -score < beta:
+                    # Preuve ratée : le coup est peut-être meilleur, recherche complète
+                    ctx.pvs_researches += 1
+                    nodes += child_nodes
+                    pruned += child_pruned
+                    score, _, child_nodes, child_pruned = _negamax(game, depth - 1, -beta, score, opponent, ctx)
+            game.undo()
+            score = -score
+            nodes += child_nodes
+            pruned += child_pruned
+            if nodes >= next_check:
+                if ctx.should_stop():
+                    raise SearchTimeout()
+                next_check = nodes + TIME_CHECK_INTERVAL
+
+            if score > value:
+                value = score
+                best_col = col
+            alpha = max(alpha, value)
+            if alpha >= beta:
+                pruned += 1
+                if orderer is not None:
+                    orderer.record_cutoff(col, ply, piece, depth, index == 0)
+                break
+    except SearchTimeout as stop:
+        # Ajouter les nœuds de ce sous-arbre avant de remonter l'arrêt
+        stop.nodes += nodes
+        stop.pruned += pruned
+        raise
+
+    if tt is not None:
+        if value <= alpha_orig:
+            flag = UPPER_BOUND
+        elif value >= beta:
+            flag = LOWER_BOUND
+        else:
+            flag = EXACT
+        tt.store(key, depth, value, flag, best_col)
+    return value, best_col, nodes, pruned
+
+
+def find_best_move_negamax(game, depth, tt=None, use_tt=True, ordering=DEFAULT_STRATEGY,
+                           aspiration=True, book=None, endgame_threshold=ENDGAME_THRESHOLD,
+                           stop_event=None, endgame_solver=None):
+    """
+    Trouve le meilleur coup avec Negamax/PVS
+
+    À partir de DEEPENING_MIN_DEPTH, la recherche procède par approfondissement
+    itératif de DEEPENING_STEP en DEEPENING_STEP (..., depth - 2, depth) : le
+    coup de la variation principale et les meilleurs coups de la table de
+    chaque itération ordonnent la suivante. Avec les fenêtres d'aspiration,
+    chaque itération part d'une fenêtre étroite autour du score précédent,
+    élargie si le score en sort.
+    Le score retourné est celui d'Alpha-Beta à la même profondeur.
+
+    Args:
+        game (Connect4): État actuel du jeu
+        depth (int): Profondeur de recherche
+        tt (TranspositionTable): Table à utiliser (une nouvelle table par défaut)
+        use_tt (bool): False pour désactiver la table de transposition
+        ordering (str): Stratégie d'ordonnancement des coups
+        aspiration (bool): Utiliser les fenêtres d'aspiration
+        book (OpeningBook): Bibliothèque d'ouvertures consultée avant de chercher
+        endgame_threshold (int): Nombre de cases vides à partir duquel le solveur
+                                 exact remplace la recherche (None pour le désactiver)
+        endgame_solver (EndgameSolver): Solveur de fin de partie (un nouveau par défaut ;
+                                        le garder d'un coup à l'autre conserve sa table)
+        stop_event (Event): Arrête la recherche (SearchTimeout est levée) quand il est activé
+
+    Returns:
+        tuple: (meilleure_colonne, score, statistiques)
+    """
+    if book is not None:
+        result = book.probe(game)
+        if result is not None:
+            return result
+    result = solve_endgame(game, endgame_threshold, endgame_solver)
+    if result is not None:
+        return result
+    if not use_tt:
+        tt = None
+    elif tt is None:
+        tt = TranspositionTable()
+    else:
+        tt.reset_stats()
+    orderer = make_orderer(ordering)
+    orderer.start_search(game)
+    ctx = SearchContext(tt, orderer, stop_event=stop_event)
+
+    score, col = None, None
+    iterations = []
+    root_moves = len(game.moves)
+    try:
+        first_depth = depth if depth < DEEPENING_MIN_DEPTH else depth % DEEPENING_STEP or DEEPENING_STEP
+        for current_depth in range(first_depth, depth + 1, DEEPENING_STEP):
+            nodes_before = ctx.nodes_explored
+            if aspiration and score is not None and abs(score) < WIN_THRESHOLD:
+                alpha, beta = score - ASPIRATION_WINDOW, score + ASPIRATION_WINDOW
+            else:
+                # Aucun score ne sort de [-victoire, +victoire] : inutile de chercher au-delà
+                alpha, beta = -WIN_THRESHOLD, WIN_THRESHOLD
+
+            while True:
+                new_score, new_col = negamax(game, current_depth, alpha, beta, PLAYER_2, ctx)
+                if new_score <= alpha and alpha > -WIN_THRESHOLD:
+                    # Échec bas : élargir la fenêtre vers le bas
+                    ctx.aspiration_failures += 1
+                    alpha = -WIN_THRESHOLD
+                elif new_score >= beta and beta < WIN_THRESHOLD:
+                    # Échec haut : élargir la fenêtre vers le haut
+                    ctx.aspiration_failures += 1
+                    beta = WIN_THRESHOLD
+                else:
+                    break
+
+            score, col = new_score, new_col
+            orderer.pv_move = col
+            iterations.append({
+                'depth': current_depth,
+                'column': col,
+                'score': score,
+                'nodes': ctx.nodes_explored - nodes_before
+            })
+
+            # Victoire ou défaite forcée : les scores de fin de partie ne dépendent
+            # pas de la profondeur, les itérations suivantes donneraient le même
+            if abs(score) >= WIN_THRESHOLD:
+                break
+    except SearchTimeout:
+        # Remettre le plateau dans l'état de la racine avant de propager l'arrêt
+        while len(game.moves) > root_moves:
+            game.undo()
+        raise
+
+    result_stats = {
+        'nodes_explored': ctx.nodes_explored,
+        'nodes_pruned': ctx.nodes_pruned,
+        'max_depth': ctx.max_depth_reached,
+        'pvs_researches': ctx.pvs_researches,
+        'aspiration_failures': ctx.aspiration_failures,
+        'iterations': iterations
+    }
+    if tt is not None:
+        result_stats.update(tt.get_stats())
+        result_stats['tt_cutoffs'] = ctx.tt_cutoffs
+    result_stats.update(orderer.get_stats())
+    return col, score, result_stats
+
+
+# EXPLICATION DE NEGAMAX / PVS :
+"""
+NEGAMAX :
+---------
+max(a, b) = -min(-a, -b) : un nœud MIN est un nœud MAX dont on inverse
+les scores. Une seule fonction suffit :
+
+    score(nœud) = max( -score(enfant) )   du point de vue du joueur qui joue
+
+PRINCIPAL VARIATION SEARCH (PVS) :
+----------------------------------
+Avec un bon ordonnancement, le premier coup est presque toujours le
+meilleur. Les autres coups sont donc cherchés avec une fenêtre NULLE
+[alpha, alpha + 1] : la recherche ne calcule pas leur score, elle
+prouve seulement qu'il est <= alpha, ce qui coupe beaucoup plus tôt.
+Si la preuve échoue (score > alpha), on relance une recherche complète.
+
+FENÊTRES D'ASPIRATION :
+-----------------------
+Le score varie peu d'une itération à la suivante. Au lieu de partir de
+[-inf, +inf], on part de [score_précédent - 25, score_précédent + 25].
+Si le vrai score sort de la fenêtre, on l'élargit et on recommence.
+La fenêtre la plus large est [-100000000, +100000000] (défaite, victoire) :
+dès qu'un coup gagnant est trouvé, les autres coups sont coupés.
+
+APPROFONDISSEMENT DE DEUX EN DEUX :
+-----------------------------------
+Chaque itération coûte des nœuds ; elle n'est rentable que si elle
+ordonne bien la suivante (coup PV, meilleurs coups de la table). Or
+l'heuristique à l'horizon favorise le joueur qui a joué le dernier coup :
+les profondeurs paires et impaires ne donnent pas les mêmes variations.
+Avec des itérations de même parité que depth (1, 3, 5, 7 ou 2, 4, 6, 8),
+l'ordre trouvé reste valable et les itérations sont moins nombreuses.
+En dessous de la profondeur 6, les itérations préliminaires ne se
+remboursent pas : une seule recherche est faite (PVS seul). Mesures
+(stats.compare_negamax, positions du banc d'essai) : à peu près autant
+de nœuds qu'Alpha-Beta à la profondeur 2, puis de 5 à 30 % de moins
+selon la profondeur ; certaines positions restent plus coûteuses.
+
+MÊME RÉSULTAT :
+---------------
+Les trois techniques ne changent que le nombre de nœuds explorés : le
+score de la racine est le même qu'avec Min-Max ou Alpha-Beta.
+"""
@@ -0,0 +1,230 @@
+"""
+ordering.py
+Stratégies d'ordonnancement des coups pour Alpha-Beta
+
+L'efficacité de l'élagage dépend de l'ordre d'exploration : si le
+meilleur coup est exploré en premier, les autres sont coupés très tôt.
+Chaque stratégie réordonne la liste des colonnes jouables d'un nœud et
+apprend des coupures observées pendant la recherche.
+"""
+
+from game import PLAYER_1, PLAYER_2, DEFAULT_GEOMETRY
+
+# Colonnes triées du centre vers les bords : 3, 2, 4, 1, 5, 0, 6 (plateau standard ;
+# chaque géométrie a les siennes, voir Geometry.center_order)
+CENTER_ORDER = DEFAULT_GEOMETRY.center_order
+CENTER_RANK = DEFAULT_GEOMETRY.center_rank
+
+# Nombre de coups "killer" mémorisés par niveau
+KILLERS_PER_PLY = 2
+
+
+class MoveOrderer:
+    """
+    Stratégie de base : ordre naturel des colonnes (0 à 6)
+
+    Les sous-classes redéfinissent order() et record_cutoff().
+    Les compteurs de coupures sont communs à toutes les stratégies.
+    """
+
+    name = 'none'
+
+    def __init__(self):
+        self.pv_move = None  # Meilleur coup de l'itération précédente à la racine
+        self.root_ply = 0    # Nombre de coups joués à la racine
+        self.cutoffs = 0             # Nombre total de coupures
+        self.first_move_cutoffs = 0  # Coupures obtenues dès le premier coup exploré
+        self.geometry = DEFAULT_GEOMETRY  # Géométrie de la dernière position cherchée
+
+    def start_search(self, game):
+        """
+        Prépare une nouvelle recherche depuis la position game
+
+        Args:
+            game (Connect4): Position racine
+        """
+        self.geometry = game.geometry
+        self.root_ply = len(game.moves)
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+
+    def order(self, moves, ply, piece, hash_move):
+        """
+        Ordonne les coups d'un nœud
+
+        Args:
+            moves (list): Colonnes jouables
+            ply (int): Nombre de coups joués (identifie le niveau de l'arbre)
+            piece (int): Joueur qui joue à ce nœud
+            hash_move (int): Meilleur coup trouvé dans la table de transposition (ou None)
+
+        Returns:
+            list: Colonnes dans l'ordre d'exploration
+        """
+        return moves
+
+    def record_cutoff(self, col, ply, piece, depth, first_move):
+        """
+        Enregistre une coupure alpha ou beta
+
+        Args:
+            col (int): Colonne qui a provoqué la coupure
+            ply (int): Niveau du nœud
+            piece (int): Joueur qui a joué col
+            depth (int): Profondeur restante du nœud
+            first_move (bool): True si col était le premier coup exploré
+        """
+        self.cutoffs += 1
+        if first_move:
+            self.first_move_cutoffs += 1
+
+    def get_stats(self):
+        """
+        Returns:
+            dict: Stratégie utilisée et taux de coupure au premier coup
+        """
+        rate = self.first_move_cutoffs / self.cutoffs if self.cutoffs > 0 else 0.0
+        return {
+            'ordering': self.name,
+            'cutoffs': self.cutoffs,
+            'first_move_cutoffs': self.first_move_cutoffs,
+            'first_move_cutoff_rate': rate
+        }
+
+
+class CenterOrderer(MoveOrderer):
+    """Ordre statique : colonnes centrales d'abord"""
+
+    name = 'center'
+
+    def order(self, moves, ply, piece, hash_move):
+        return sorted(moves, key=self.geometry.center_rank.__getitem__)
+
+
+class PVOrderer(CenterOrderer):
+    """Coup de la variation principale (table de transposition ou itération précédente) d'abord, puis le centre"""
+
+    name = 'pv'
+
+    def order(self, moves, ply, piece, hash_move):
+        ordered = self.base_order(moves, piece)
+        front = []
+        for move in self.priority_moves(ply, hash_move):
+            if move in ordered and move not in front:
+                front.append(move)
+        if not front:
+            return ordered
+        return front + [c for c in ordered if c not in front]
+
+    def base_order(self, moves, piece):
+        """Ordre des coups qui ne sont pas prioritaires"""
+        return CenterOrderer.order(self, moves, None, piece, None)
+
+    def priority_moves(self, ply, hash_move):
+        """Coups à explorer en premier, par ordre de priorité"""
+        if hash_move is None and ply == self.root_ply:
+            hash_move = self.pv_move
+        return [hash_move] if hash_move is not None else []
+
+
+class KillerOrderer(PVOrderer):
+    """Coup PV, puis les deux derniers coups ayant provoqué une coupure à ce niveau, puis le centre"""
+
+    name = 'killer'
+
+    def __init__(self):
+        super().__init__()
+        self.killers = [[] for _ in range(self.geometry.cells + 1)]
+
+    def start_search(self, game):
+        super().start_search(game)
+        self.killers = [[] for _ in range(self.geometry.cells + 1)]
+
+    def priority_moves(self, ply, hash_move):
+        return super().priority_moves(ply, hash_move) + self.killers[ply]
+
+    def record_cutoff(self, col, ply, piece, depth, first_move):
+        super().record_cutoff(col, ply, piece, depth, first_move)
+        killers = self.killers[ply]
+        if col not in killers:
+            killers.insert(0, col)
+            del killers[KILLERS_PER_PLY:]
+
+
+class HistoryOrderer(KillerOrderer):
+    """Coup PV, killers, puis les colonnes triées par leur historique de coupures"""
+
+    name = 'history'
+
+    def __init__(self):
+        super().__init__()
+        # Non réinitialisé par start_search() : l'historique reste pertinent d'une recherche à l'autre
+        cols = self.geometry.cols
+        self.history = {PLAYER_1: [0] * cols, PLAYER_2: [0] * cols}
+
+    def start_search(self, game):
+        super().start_search(game)
+        # Sauf si le nombre de colonnes change (l'historique porte sur les colonnes)
+        cols = self.geometry.cols
+        if len(self.history[PLAYER_1]) != cols:
+            self.history = {PLAYER_1: [0] * cols, PLAYER_2: [0] * cols}
+
+    def base_order(self, moves, piece):
+        history = self.history[piece]
+        center_rank = self.geometry.center_rank
+        return sorted(moves, key=lambda c: (-history[c], center_rank[c]))
+
+    def record_cutoff(self, col, ply, piece, depth, first_move):
+        super().record_cutoff(col, ply, piece, depth, first_move)
+        # Les coupures proches de la racine pèsent plus lourd
+        self.history[piece][col] += depth * depth
+
+
+# Stratégies disponibles, par nom
+STRATEGIES = {
+    orderer.name: orderer
+    for orderer in (MoveOrderer, CenterOrderer, PVOrderer, KillerOrderer, HistoryOrderer)
+}
+
+# Stratégie utilisée par défaut par Alpha-Beta
+DEFAULT_STRATEGY = 'history'
+
+
+def make_orderer(strategy=DEFAULT_STRATEGY):
+    """
+    Crée l'ordonnanceur correspondant à une stratégie
+
+    Args:
+        strategy (str): 'none', 'center', 'pv', 'killer' ou 'history'
+                        (un MoveOrderer déjà créé est retourné tel quel)
+
+    Returns:
+        MoveOrderer: L'ordonnanceur
+    """
+    if isinstance(strategy, MoveOrderer):
+        return strategy
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Stratégie d'ordonnancement inconnue : {strategy}")
+    return STRATEGIES[strategy]()
+
+
+# EXPLICATION DES STRATÉGIES :
+"""
+POURQUOI ORDONNER :
+-------------------
+Alpha-Beta coupe une branche dès qu'un coup suffisamment bon est trouvé.
+Plus ce coup arrive tôt, plus on évite d'explorer les autres. Le taux de
+coupure au premier coup (first_move_cutoff_rate) mesure la qualité de
+l'ordre : un ordre parfait donne 100 %.
+
+STRATÉGIES :
+------------
+- none    : ordre naturel 0..6 (comportement historique)
+- center  : colonnes centrales d'abord (elles participent à plus d'alignements)
+- pv      : le meilleur coup connu de la position (table de transposition,
+            ou coup de l'itération précédente à la racine) d'abord
+- killer  : + les 2 derniers coups ayant coupé au même niveau de l'arbre
+            (un bon coup chez un frère est souvent bon ici aussi)
+- history : + tri des autres coups par un score cumulé de coupures
+            (profondeur² à chaque coupure), conservé entre les recherches
+"""
@@ -0,0 +1,277 @@
+"""
+parallel.py
+Alpha-Beta parallèle par découpage de la racine (root splitting)
+
+Chaque coup de la racine (et éventuellement chaque réponse de
+l'adversaire, au 2e niveau) est confié à un processus d'un
+ProcessPoolExecutor. Les processus partagent, en mémoire partagée, le
+meilleur score déjà trouvé à la racine : un processus qui démarre tard
+cherche avec une fenêtre plus étroite et élague davantage.
+"""
+
+import math
+import os
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from game import PLAYER_1, PLAYER_2
+from alphabeta import alphabeta, find_best_move_alphabeta
+from context import SearchContext
+from transposition import TranspositionTable
+from ordering import make_orderer, DEFAULT_STRATEGY
+from endgame import EndgameSolver, solve_endgame
+
+# Meilleur score de la racine, partagé entre les processus (initialisé dans chaque processus)
+_shared_best = None
+
+
+def _init_worker(shared_best):
+    """Initialise un processus de calcul avec la borne partagée"""
+    global _shared_best
+    _shared_best = shared_best
+
+
+def _search_subtree(game, root_col, reply_col, depth, use_tt, ordering):
+    """
+    Cherche le sous-arbre d'un coup de la racine (exécuté dans un processus)
+
+    La fenêtre part du meilleur score partagé moins 1 : un score
+    strictement supérieur à cette borne est exact, un score inférieur ou
+    égal signifie que le coup ne peut pas battre le meilleur coup connu
+    (les scores sont entiers, les égalités restent donc exactes).
+
+    Args:
+        game (Connect4): Position racine
+        root_col (int): Coup de l'IA à la racine
+        reply_col (int): Réponse de l'adversaire (None si découpage au 1er niveau)
+        depth (int): Profondeur de la recherche depuis la racine
+        use_tt (bool): Utiliser une table de transposition (propre au processus)
+        ordering (str): Stratégie d'ordonnancement des coups
+
+    Returns:
+        dict: Score, exactitude et statistiques de la tâche
+    """
+    start_time = time.perf_counter()
+    bound = _shared_best.value
+    alpha = bound - 1 if bound != -math.inf else -math.inf
+
+    game.play(root_col, PLAYER_2)
+    if reply_col is None:
+        maximizing, remaining = False, depth - 1
+    else:
+        game.play(reply_col, PLAYER_1)
+        maximizing, remaining = True, depth - 2
+
+    tt = TranspositionTable() if use_tt else None
+    orderer = make_orderer(ordering)
+    orderer.start_search(game)
+    ctx = SearchContext(tt, orderer)
+    score, _ = alphabeta(game, remaining, alpha, math.inf, maximizing, ctx)
+    exact = score > alpha
+
+    # Au 1er niveau, un score exact est la valeur du coup de la racine
+    if reply_col is None and exact:
+        with _shared_best.get_lock():
+            if score > _shared_best.value:
+                _shared_best.value = score
+
+    return {
+        'root_col': root_col,
+        'reply_col': reply_col,
+        'score': score,
+        'exact': exact,
+        'pid': os.getpid(),
+        'time': time.perf_counter() - start_time,
+        'nodes_explored': ctx.nodes_explored,
+        'nodes_pruned': ctx.nodes_pruned,
+        'tt_cutoffs': ctx.tt_cutoffs,
+    }
+
+
+class ParallelSearcher:
+    """
+    Pool de processus réutilisable pour la recherche Alpha-Beta parallèle
+    (à fermer avec close() ou à utiliser avec `with`)
+    """
+
+    def __init__(self, workers=None):
+        """
+        Args:
+            workers (int): Nombre de processus (par défaut : nombre de cœurs)
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.shared_best = multiprocessing.Value('d', -math.inf)
+        self.executor = ProcessPoolExecutor(max_workers=self.workers,
+                                            initializer=_init_worker,
+                                            initargs=(self.shared_best,))
+        self.endgame_solver = EndgameSolver()  # Fins de partie résolues dans ce processus
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Arrête les processus"""
+        self.executor.shutdown()
+
+    def search(self, game, depth, split_depth=1, use_tt=True, ordering=DEFAULT_STRATEGY):
+        """
+        Trouve le meilleur coup en répartissant la racine sur les processus
+
+        Le coup retourné est le même que celui de find_best_move_alphabeta
+        (même profondeur, même ordonnancement) : le meilleur score, et à
+        égalité le premier coup dans l'ordre d'exploration de la racine.
+
+        Args:
+            game (Connect4): État actuel du jeu
+            depth (int): Profondeur de recherche
+            split_depth (int): 1 = une tâche par coup de la racine,
+                               2 = une tâche par (coup, réponse de l'adversaire)
+            use_tt (bool): Table de transposition dans chaque processus
+            ordering (str): Stratégie d'ordonnancement des coups
+
+        Returns:
+            tuple: (meilleure_colonne, score, statistiques)
+        """
+        if split_depth not in (1, 2):
+            raise ValueError("split_depth doit valoir 1 ou 2")
+        if depth < 1 or game.is_terminal_node():
+            return find_best_move_alphabeta(game, depth, use_tt=use_tt, ordering=ordering)
+        # Fin de partie : le solveur exact suffit, inutile de lancer les processus
+        result = solve_endgame(game, solver=self.endgame_solver)
+        if result is not None:
+            return result
+
+        start_time = time.perf_counter()
+        self.shared_best.value = -math.inf
+
+        # Ordre de la racine identique à celui de la recherche séquentielle
+        root_orderer = make_orderer(ordering)
+        root_orderer.start_search(game)
+        root_moves = root_orderer.order(game.get_valid_locations(), len(game.moves), PLAYER_2, None)
+
+        # Créer les tâches (la position envoyée aux processus n'est plus modifiée :
+        # elle est sérialisée en arrière-plan par l'exécuteur)
+        root = game.copy()
+        scratch = game.copy()
+        futures = []
+        pending_replies = {}  # Coup de la racine -> nombre de réponses restant à chercher
+        for col in root_moves:
+            replies = []
+            if split_depth == 2 and depth >= 2:
+                scratch.play(col, PLAYER_2)
+                if not scratch.is_terminal_node():
+                    replies = scratch.get_valid_locations()
+                scratch.undo()
+            if replies:
+                pending_replies[col] = len(replies)
+                for reply in replies:
+                    futures.append(self.executor.submit(
+                        _search_subtree, root, col, reply, depth, use_tt, ordering))
+            else:
+                futures.append(self.executor.submit(
+                    _search_subtree, root, col, None, depth, use_tt, ordering))
+
+        # Fusionner les résultats au fur et à mesure
+        root_scores = {}  # Coup -> (score, exact)
+        reply_scores = {}
+        worker_times = {}
+        totals = {'nodes_explored': 1, 'nodes_pruned': 0, 'tt_cutoffs': 0}
+        for future in as_completed(futures):
+            result = future.result()
+            for key in totals:
+                totals[key] += result[key]
+            worker = worker_times.setdefault(result['pid'], {'tasks': 0, 'time': 0.0, 'nodes': 0})
+            worker['tasks'] += 1
+            worker['time'] += result['time']
+            worker['nodes'] += result['nodes_explored']
+
+            col = result['root_col']
+            if result['reply_col'] is None:
+                root_scores[col] = (result['score'], result['exact'])
+                continue
+
+            # Découpage au 2e niveau : le coup vaut le minimum de ses réponses
+            reply_scores.setdefault(col, []).append((result['score'], result['exact']))
+            pending_replies[col] -= 1
+            if pending_replies[col] == 0:
+                score = min(s for s, _ in reply_scores[col])
+                exact = all(e for _, e in reply_scores[col])
+                root_scores[col] = (score, exact)
+                if exact:
+                    with self.shared_best.get_lock():
+                        if score > self.shared_best.value:
+                            self.shared_best.value = score
+
+        # Meilleur score, et à égalité le premier coup dans l'ordre de la racine
+        # (le meilleur coup a toujours un score exact : la borne partagée lui est inférieure)
+        best_col, best_score = None, -math.inf
+        for col in root_moves:
+            score, exact = root_scores[col]
+            if exact and (best_col is None or score > best_score):
+                best_col, best_score = col, score
+
+        return best_col, best_score, {
+            'nodes_explored': totals['nodes_explored'],
+            'nodes_pruned': totals['nodes_pruned'],
+            'tt_cutoffs': totals['tt_cutoffs'],
+            'max_depth': depth,
+            'workers': self.workers,
+            'tasks': len(futures),
+            'split_depth': split_depth,
+            'worker_times': worker_times,
+            'wall_time': time.perf_counter() - start_time
+        }
+
+
+def find_best_move_parallel(game, depth, workers=None, split_depth=1, use_tt=True,
+                            ordering=DEFAULT_STRATEGY):
+    """
+    Trouve le meilleur coup avec Alpha-Beta réparti sur plusieurs processus
+    (crée un pool le temps de la recherche, voir ParallelSearcher pour le réutiliser)
+
+    Args:
+        game (Connect4): État actuel du jeu
+        depth (int): Profondeur de recherche
+        workers (int): Nombre de processus (par défaut : nombre de cœurs)
+        split_depth (int): Niveau de découpage de l'arbre (1 ou 2)
+        use_tt (bool): Table de transposition dans chaque processus
+        ordering (str): Stratégie d'ordonnancement des coups
+
+    Returns:
+        tuple: (meilleure_colonne, score, statistiques)
+    """
+    with ParallelSearcher(workers) as searcher:
+        return searcher.search(game, depth, split_depth, use_tt, ordering)
+
+
+# EXPLICATION DU DÉCOUPAGE DE LA RACINE :
+"""
+PRINCIPE :
+----------
+Les sous-arbres des coups de la racine sont indépendants : on peut les
+chercher en même temps sur plusieurs cœurs.
+
+      [MAX]          <- racine, dans le processus principal
+     / | ... \\
+  [MIN][MIN]..[MIN]  <- une tâche par coup (split_depth=1)
+  /|\\
+ ...                 <- ou une tâche par réponse (split_depth=2)
+
+BORNE PARTAGÉE :
+----------------
+En séquentiel, les derniers coups profitent de l'alpha trouvé par les
+premiers. En parallèle, le meilleur score connu est rangé dans une
+multiprocessing.Value (mémoire partagée) : chaque tâche lit cette borne
+au démarrage et cherche avec la fenêtre [meilleur - 1, +inf].
+
+MÊME RÉSULTAT :
+---------------
+- score > meilleur - 1 : score exact
+- score <= meilleur - 1 : le coup est strictement moins bon, il est écarté
+Le meilleur coup est donc celui de la recherche séquentielle, égalités
+comprises (premier coup dans l'ordre de la racine).
+"""
@@ -0,0 +1,333 @@
+"""
+profiling.py
+Instrumentation des primitives appelées par les recherches
+
+Quand une recherche est lente, on veut savoir si le temps part dans
+terminal_status, legal_moves, play/undo, copy ou l'heuristique.
+L'instrumentation est optionnelle et ne coûte rien quand elle est
+désactivée : les primitives ne sont remplacées par des versions
+chronométrées qu'à l'intérieur de `with instrument():`, puis les
+originaux sont remis en place.
+
+Deux profileurs complets sont aussi disponibles : cProfile (fichier .prof)
+et un profileur par échantillonnage qui écrit des piles "repliées"
+(format d'entrée de flamegraph.pl et de speedscope).
+
+Exemple : python profiling.py --algorithm alphabeta --depth 7 --output recherche.folded
+"""
+
+import argparse
+import collections
+import contextlib
+import cProfile
+import functools
+import importlib
+import os
+import sys
+import threading
+import time
+
+from game import Connect4
+
+# Primitives chronométrées : méthodes du jeu...
+GAME_PRIMITIVES = ['check_win', 'terminal_status', 'legal_moves', 'get_valid_locations',
+                   'is_terminal_node', 'play', 'undo', 'copy', 'get_next_open_row', 'evaluate']
+
+# ... et fonctions de l'heuristique, remplacées dans chaque module qui les importe
+# (`from heuristic import heuristic` crée une référence propre au module ; les
+# recherches lisent game.evaluate à l'horizon et n'appellent plus heuristic)
+FUNCTION_PRIMITIVES = {
+    'heuristic': ['heuristic'],
+    'evaluate_position': ['heuristic'],
+}
+
+# Intervalle entre deux échantillons du profileur par échantillonnage (secondes)
+SAMPLE_INTERVAL = 0.001
+
+
+class PrimitiveCounters:
+    """Appels et temps cumulé de chaque primitive pendant l'instrumentation"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Réinitialise les compteurs"""
+        self.calls = collections.Counter()
+        self.total_time = collections.Counter()  # Temps inclusif (appels imbriqués compris)
+        self.self_time = collections.Counter()   # Temps propre (sans les primitives appelées)
+        self._child_time = [0.0]                 # Pile : temps des primitives imbriquées
+
+    def wrap(self, label, func):
+        """
+        Version chronométrée d'une primitive
+
+        Args:
+            label (str): Nom affiché de la primitive
+            func (callable): Primitive d'origine
+
+        Returns:
+            callable: Fonction qui appelle func et met à jour les compteurs
+        """
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            child_time = self._child_time
+            child_time.append(0.0)
+            start_time = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start_time
+                nested = child_time.pop()
+                child_time[-1] += elapsed
+                self.calls[label] += 1
+                self.total_time[label] += elapsed
+                self.self_time[label] += elapsed - nested
+        return timed
+
+    def get_breakdown(self, search_time=None):
+        """
+        Returns:
+            list: Un dictionnaire par primitive, de la plus coûteuse (temps propre)
+                  à la moins coûteuse ; 'share' est la part du temps de recherche
+        """
+        rows = []
+        for label in sorted(self.calls, key=lambda name: -self.self_time[name]):
+            calls = self.calls[label]
+            rows.append({
+                'primitive': label,
+                'calls': calls,
+                'total_time': self.total_time[label],
+                'self_time': self.self_time[label],
+                'time_per_call': self.total_time[label] / calls,
+                'share': self.self_time[label] / search_time if search_time else None
+            })
+        return rows
+
+
+# Instance globale des compteurs
+counters = PrimitiveCounters()
+
+
+@contextlib.contextmanager
+def instrument():
+    """
+    Chronomètre les primitives pendant le bloc `with` (compteurs remis à zéro)
+
+    Exemple :
+        with instrument():
+            find_best_move_alphabeta(game, 6)
+        print(counters.get_breakdown())
+    """
+    counters.reset()
+    originals = []
+    for name in GAME_PRIMITIVES:
+        originals.append((Connect4, name, Connect4.__dict__[name]))
+    for name, module_names in FUNCTION_PRIMITIVES.items():
+        wrapped = None
+        for module_name in module_names:
+            module = importlib.import_module(module_name)
+            original = getattr(module, name)
+            originals.append((module, name, original))
+            wrapped = wrapped or counters.wrap(name, original)
+            setattr(module, name, wrapped)
+    for name in GAME_PRIMITIVES:
+        setattr(Connect4, name, counters.wrap(name, Connect4.__dict__[name]))
+    try:
+        yield counters
+    finally:
+        for owner, name, original in originals:
+            setattr(owner, name, original)
+
+
+def run_instrumented(search, game, depth, **kwargs):
+    """
+    Lance une recherche avec les primitives chronométrées
+
+    Args:
+        search (callable): find_best_move_minimax, find_best_move_alphabeta, ...
+        game (Connect4): Position à chercher
+        depth (int): Profondeur de recherche
+        **kwargs: Paramètres supplémentaires de la recherche
+
+    Returns:
+        tuple: (meilleure_colonne, score, statistiques) ; les statistiques
+               contiennent 'search_time' et 'primitives' (get_breakdown())
+    """
+    with instrument():
+        start_time = time.perf_counter()
+        col, score, stats = search(game, depth, **kwargs)
+        search_time = time.perf_counter() - start_time
+    stats['search_time'] = search_time
+    stats['primitives'] = counters.get_breakdown(search_time)
+    return col, score, stats
+
+
+def _frame_label(frame):
+    """Nom d'un cadre de pile pour le graphe de flammes : fichier:fonction"""
+    return f"{os.path.basename(frame.f_code.co_filename)}:{frame.f_code.co_name}"
+
+
+class SamplingProfiler:
+    """
+    Profileur par échantillonnage : un thread relève régulièrement la pile
+    du thread profilé et compte les piles identiques
+    """
+
+    def __init__(self, interval=SAMPLE_INTERVAL):
+        """
+        Args:
+            interval (float): Intervalle entre deux échantillons (secondes)
+        """
+        self.interval = interval
+        self.stacks = collections.Counter()
+        self._stop = threading.Event()
+        self._thread = None
+        self._target = None
+
+    def _sample(self):
+        """Boucle du thread d'échantillonnage"""
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def __enter__(self):
+        self._target = threading.get_ident()
+        # Le thread d'échantillonnage doit récupérer le GIL au moins à chaque intervalle
+        self._switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(min(self._switch_interval, self.interval))
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+        sys.setswitchinterval(self._switch_interval)
+
+    def write_folded(self, path):
+        """
+        Écrit les piles repliées ("a;b;c nombre" par ligne) pour flamegraph.pl ou speedscope
+
+        Args:
+            path (str): Fichier de sortie
+        """
+        with open(path, 'w') as f:
+            for stack, count in sorted(self.stacks.items()):
+                f.write(f"{stack} {count}\n")
+
+
+def profile_search(search, game, depth, output, mode='sampling', interval=SAMPLE_INTERVAL, **kwargs):
+    """
+    Lance une recherche sous un profileur complet et écrit son résultat
+
+    Args:
+        search (callable): Fonction de recherche (find_best_move_alphabeta, ...)
+        game (Connect4): Position à chercher
+        depth (int): Profondeur de recherche
+        output (str): Fichier de sortie (.folded pour 'sampling', .prof pour 'cprofile')
+        mode (str): 'sampling' (piles repliées) ou 'cprofile' (statistiques pstats,
+                    lisibles par snakeviz ou flameprof)
+        interval (float): Intervalle d'échantillonnage (mode 'sampling')
+        **kwargs: Paramètres supplémentaires de la recherche
+
+    Returns:
+        tuple: (meilleure_colonne, score, statistiques)
+    """
+    if mode == 'cprofile':
+        profiler = cProfile.Profile()
+        result = profiler.runcall(search, game, depth, **kwargs)
+        profiler.dump_stats(output)
+    elif mode == 'sampling':
+        with SamplingProfiler(interval) as profiler:
+            result = search(game, depth, **kwargs)
+        profiler.write_folded(output)
+    else:
+        raise ValueError(f"Mode de profilage inconnu : {mode}")
+    return result
+
+
+def print_breakdown(rows, search_time):
+    """
+    Affiche le tableau des primitives
+
+    Args:
+        rows (list): Résultat de PrimitiveCounters.get_breakdown()
+        search_time (float): Durée totale de la recherche instrumentée
+    """
+    print(f"\n{'Primitive':<20} │ {'Appels':>9} │ {'Total (s)':>9} │ {'Propre (s)':>10} │ "
+          f"{'µs/appel':>8} │ {'Part':>6}")
+    print("─"*78)
+    for row in rows:
+        # Part inconnue (None) quand la durée de la recherche est nulle
+        share = '-' if row['share'] is None else f"{row['share'] * 100:.1f}%"
+        print(f"{row['primitive']:<20} │ {row['calls']:>9,} │ {row['total_time']:>9.4f} │ "
+              f"{row['self_time']:>10.4f} │ {row['time_per_call'] * 1e6:>8.2f} │ {share:>6}")
+    print("─"*78)
+    own = sum(row['self_time'] for row in rows)
+    share = f"{(search_time - own) / search_time * 100:.1f}%" if search_time else '-'
+    print(f"{'Recherche (reste)':<20} │ {'':>9} │ {search_time:>9.4f} │ {search_time - own:>10.4f} │ "
+          f"{'':>8} │ {share:>6}")
+
+
+def main():
+    """Profile une recherche en ligne de commande"""
+    from engine import ALGORITHMS
+
+    parser = argparse.ArgumentParser(description="Profilage d'une recherche")
+    parser.add_argument('--algorithm', default='alphabeta', choices=sorted(ALGORITHMS))
+    parser.add_argument('--depth', type=int, default=6)
+    parser.add_argument('--moves', default='', help="Colonnes jouées depuis le plateau vide")
+    parser.add_argument('--mode', default='sampling', choices=['sampling', 'cprofile'])
+    parser.add_argument('--output', default=None, help="Fichier de profil (.folded ou .prof)")
+    args = parser.parse_args()
+
+    search = ALGORITHMS[args.algorithm]
+    game = Connect4.from_moves(args.moves)
+
+    col, score, stats = run_instrumented(search, game.copy(), args.depth)
+    print(f"{args.algorithm} profondeur {args.depth} : colonne {col}, score {score}, "
+          f"{stats['nodes_explored']:,} nœuds")
+    print_breakdown(stats['primitives'], stats['search_time'])
+
+    if args.output:
+        profile_search(search, game.copy(), args.depth, args.output, mode=args.mode)
+        print(f"✓ Profil écrit dans {args.output}")
+
+
+# EXPLICATION DE L'INSTRUMENTATION :
+"""
+COÛT NUL QUAND ELLE EST DÉSACTIVÉE :
+------------------------------------
+Aucun test "profilage activé ?" n'est ajouté dans les primitives. Le bloc
+`with instrument():` remplace les méthodes de Connect4 et les fonctions de
+l'heuristique par des versions chronométrées, puis remet les originaux en
+place : en dehors du bloc, le code exécuté est exactement le même.
+
+TEMPS TOTAL ET TEMPS PROPRE :
+-----------------------------
+Les recherches appellent terminal_status une fois par nœud, puis evaluate
+à l'horizon. heuristic (appels extérieurs) appelle à son tour ces deux
+primitives : son temps total les inclut, son temps propre non. La somme des
+temps propres ne compte donc rien deux fois ; le reste est le temps passé
+dans la recherche elle-même
+(boucles, table de transposition, ordonnancement). Le chronométrage
+ajoute environ une microseconde par appel : les proportions restent
+justes, mais la recherche instrumentée est plus lente.
+
+GRAPHES DE FLAMMES :
+--------------------
+- mode 'sampling' : une ligne "fichier:fonction;...;fichier:fonction N" par pile
+  observée, à donner à flamegraph.pl ou à ouvrir dans speedscope
+- mode 'cprofile' : fichier pstats, pour snakeviz ou flameprof
+"""
+
+
+if __name__ == "__main__":
+    main()
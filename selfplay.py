@@ -0,0 +1,355 @@
+"""
+selfplay.py
+Parties IA contre IA sans interface graphique
+
+Joue N parties en parallèle sur un pool de processus et enregistre
+chaque partie dès qu'elle est terminée, au format JSON Lines (.jsonl)
+ou binaire compact (.bin). Une exécution interrompue reprend là où elle
+s'était arrêtée : les parties déjà enregistrées ne sont pas rejouées.
+
+Exemple : python selfplay.py --games 10000 --depth1 4 --depth2 4 --output parties.jsonl
+"""
+
+import argparse
+import json
+import os
+import random
+import struct
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+from game import Connect4, PLAYER_1, PLAYER_2, EMPTY
+from engine import ALGORITHMS, ENDGAME_ALGORITHMS
+from endgame import EndgameSolver
+from mcts import MCTSTree
+
+# Algorithmes qui acceptent un temps par coup
+TIMED_ALGORITHMS = ('alphabeta', 'mcts')
+
+# Coups joués au hasard au début de chaque partie (pour varier les parties)
+OPENING_PLIES = 4
+
+# Format binaire : en-tête du fichier, puis un enregistrement par partie
+# enregistrement : numéro (4 octets) | résultat | coups d'ouverture | nombre de coups
+#                  | colonnes (2 par octet)
+BINARY_MAGIC = b'C4SP'
+BINARY_VERSION = 1
+BINARY_HEADER = struct.pack('<4sH2x', BINARY_MAGIC, BINARY_VERSION)
+RECORD_FORMAT = '<IBBB'
+RECORD_SIZE = struct.calcsize(RECORD_FORMAT)
+
+# Nombre de parties en attente par processus (les parties sont lancées au fur et à mesure)
+TASKS_PER_WORKER = 4
+
+
+def make_player(algorithm='alphabeta', depth=4, time_limit=None):
+    """
+    Décrit un joueur IA
+
+    Args:
+        algorithm (str): 'minimax', 'alphabeta', 'negamax' ou 'mcts'
+        depth (int): Profondeur de recherche (maximale si time_limit est donné)
+        time_limit (float): Temps par coup en secondes (Alpha-Beta et MCTS uniquement)
+
+    Returns:
+        dict: Paramètres du joueur
+    """
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Algorithme inconnu : {algorithm}")
+    if time_limit is not None and algorithm not in TIMED_ALGORITHMS:
+        raise ValueError("Le temps par coup n'est disponible qu'avec Alpha-Beta et MCTS")
+    if depth is None and time_limit is None:
+        raise ValueError("Il faut indiquer une profondeur ou un temps limite")
+    return {'algorithm': algorithm, 'depth': depth, 'time_limit': time_limit}
+
+
+def choose_move(game, player, endgame_solver=None, mcts_tree=None):
+    """
+    Coup d'un joueur IA pour PLAYER_2 (la position est échangée pour PLAYER_1)
+
+    Args:
+        game (Connect4): Position, PLAYER_2 au trait
+        player (dict): Paramètres du joueur (voir make_player)
+        endgame_solver (EndgameSolver): Solveur de fin de partie gardé pendant la partie
+        mcts_tree (MCTSTree): Arbre du joueur gardé pendant la partie (MCTS uniquement)
+
+    Returns:
+        tuple: (colonne, statistiques)
+    """
+    search = ALGORITHMS[player['algorithm']]
+    kwargs = {}
+    if player['time_limit'] is not None:
+        kwargs['time_limit'] = player['time_limit']
+    if player['algorithm'] in ENDGAME_ALGORITHMS:
+        kwargs['endgame_solver'] = endgame_solver
+    if mcts_tree is not None:
+        kwargs['mcts_tree'] = mcts_tree
+    col, _, stats = search(game, player['depth'], **kwargs)
+    return col, stats
+
+
+def play_selfplay_game(game_id, players, opening_plies=OPENING_PLIES, seed=0):
+    """
+    Joue une partie complète (exécutée dans un processus du pool)
+
+    Args:
+        game_id (int): Numéro de la partie (détermine l'ouverture aléatoire)
+        players (tuple): Paramètres de PLAYER_1 et de PLAYER_2
+        opening_plies (int): Nombre de coups aléatoires au début
+        seed (int): Graine de l'exécution
+
+    Returns:
+        dict: Enregistrement de la partie
+    """
+    start_time = time.perf_counter()
+    rng = random.Random(f"{seed}-{game_id}")
+    game = Connect4()
+
+    # Ouverture aléatoire
+    for _ in range(opening_plies):
+        if game.is_terminal_node():
+            break
+        game.play(rng.choice(game.get_valid_locations()))
+    opening = len(game.moves)
+
+    # État gardé pendant la partie : le solveur est commun (scores exacts),
+    # chaque joueur MCTS a son propre arbre
+    solver = EndgameSolver()
+    trees = [MCTSTree() if player['algorithm'] == 'mcts' else None for player in players]
+
+    nodes = 0
+    while not game.is_terminal_node():
+        if game.turn == PLAYER_2:
+            col, stats = choose_move(game, players[1], solver, trees[1])
+        else:
+            col, stats = choose_move(game.swapped(), players[0], solver, trees[0])
+        nodes += stats['nodes_explored']
+        game.play(col)
+
+    if game.check_win(PLAYER_1):
+        result = PLAYER_1
+    elif game.check_win(PLAYER_2):
+        result = PLAYER_2
+    else:
+        result = EMPTY
+    return {
+        'id': game_id,
+        'moves': ''.join(str(col) for col in game.moves),
+        'opening': opening,
+        'result': result,
+        'nodes': nodes,
+        'time': round(time.perf_counter() - start_time, 4)
+    }
+
+
+def record_format(path):
+    """Format d'un fichier de parties d'après son extension ('jsonl' ou 'bin')"""
+    return 'bin' if path.endswith('.bin') else 'jsonl'
+
+
+def encode_record(record, fmt):
+    """
+    Convertit une partie en octets à écrire dans le fichier
+
+    Args:
+        record (dict): Enregistrement de la partie
+        fmt (str): 'jsonl' ou 'bin'
+
+    Returns:
+        bytes: L'enregistrement encodé
+    """
+    if fmt == 'jsonl':
+        return (json.dumps(record, separators=(',', ':')) + '\n').encode()
+    moves = [int(c) for c in record['moves']]
+    if len(moves) % 2:
+        moves.append(0)
+    packed = bytes(moves[i] << 4 | moves[i + 1] for i in range(0, len(moves), 2))
+    return struct.pack(RECORD_FORMAT, record['id'], record['result'], record['opening'],
+                       len(record['moves'])) + packed
+
+
+def read_records(path, fmt=None):
+    """
+    Lit les parties d'un fichier, en ignorant un dernier enregistrement incomplet
+    (exécution interrompue pendant l'écriture)
+
+    Args:
+        path (str): Fichier de parties
+        fmt (str): 'jsonl' ou 'bin' (par défaut : d'après l'extension)
+
+    Returns:
+        tuple: (liste des parties, taille en octets de la partie valide du fichier)
+    """
+    fmt = fmt or record_format(path)
+    with open(path, 'rb') as f:
+        data = f.read()
+    records = []
+
+    if fmt == 'jsonl':
+        offset = 0
+        for line in data.splitlines(keepends=True):
+            if not line.endswith(b'\n'):
+                break
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                break
+            offset += len(line)
+        return records, offset
+
+    if data[:len(BINARY_HEADER)] != BINARY_HEADER:
+        raise ValueError(f"Fichier de parties invalide : {path}")
+    offset = len(BINARY_HEADER)
+    while offset + RECORD_SIZE <= len(data):
+        game_id, result, opening, n_moves = struct.unpack_from(RECORD_FORMAT, data, offset)
+        end = offset + RECORD_SIZE + (n_moves + 1) // 2
+        if end > len(data):
+            break
+        packed = data[offset + RECORD_SIZE:end]
+        moves = ''.join(f"{byte >> 4}{byte & 0xF}" for byte in packed)[:n_moves]
+        records.append({'id': game_id, 'moves': moves, 'opening': opening, 'result': result})
+        offset = end
+    return records, offset
+
+
+def run_selfplay(n_games, output, players, workers=None, opening_plies=OPENING_PLIES,
+                 seed=0, resume=True, progress_every=100):
+    """
+    Joue n_games parties sur un pool de processus et les écrit dans output
+
+    Args:
+        n_games (int): Nombre total de parties (numérotées de 0 à n_games - 1)
+        output (str): Fichier de sortie (.jsonl ou .bin)
+        players (tuple): Paramètres de PLAYER_1 et de PLAYER_2 (voir make_player)
+        workers (int): Nombre de processus (par défaut : nombre de cœurs)
+        opening_plies (int): Nombre de coups aléatoires au début de chaque partie
+        seed (int): Graine des ouvertures
+        resume (bool): Reprendre le fichier existant au lieu de l'écraser
+        progress_every (int): Afficher l'avancement toutes les progress_every parties
+
+    Returns:
+        dict: Nombre de parties, résultats et vitesse (parties par seconde)
+    """
+    fmt = record_format(output)
+    workers = workers or os.cpu_count() or 1
+
+    # Reprise : garder les parties complètes et supprimer une éventuelle fin tronquée
+    done = set()
+    if resume and os.path.exists(output):
+        records, valid_size = read_records(output, fmt)
+        done = {record['id'] for record in records}
+        with open(output, 'r+b') as f:
+            f.truncate(valid_size)
+    else:
+        with open(output, 'wb') as f:
+            if fmt == 'bin':
+                f.write(BINARY_HEADER)
+
+    todo = iter([game_id for game_id in range(n_games) if game_id not in done])
+    results = {PLAYER_1: 0, PLAYER_2: 0, EMPTY: 0}
+    played = 0
+    next_report = progress_every
+    start_time = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=workers) as executor, open(output, 'ab') as f:
+        # Nombre limité de parties en attente : la mémoire ne dépend pas de n_games
+        pending = set()
+
+        def submit_next():
+            game_id = next(todo, None)
+            if game_id is not None:
+                pending.add(executor.submit(play_selfplay_game, game_id, players, opening_plies, seed))
+
+        for _ in range(workers * TASKS_PER_WORKER):
+            submit_next()
+
+        while pending:
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                pending.discard(future)
+                record = future.result()
+                f.write(encode_record(record, fmt))
+                results[record['result']] += 1
+                played += 1
+                submit_next()
+            f.flush()
+
+            if progress_every and played >= next_report:
+                next_report += progress_every
+                elapsed = time.perf_counter() - start_time
+                print(f"{len(done) + played}/{n_games} parties "
+                      f"({played / elapsed:.1f} parties/s)")
+
+    elapsed = time.perf_counter() - start_time
+    return {
+        'games': len(done) + played,
+        'new_games': played,
+        'resumed_games': len(done),
+        'player1_wins': results[PLAYER_1],
+        'player2_wins': results[PLAYER_2],
+        'draws': results[EMPTY],
+        'elapsed_time': elapsed,
+        'games_per_sec': played / elapsed if elapsed > 0 else 0.0
+    }
+
+
+def main():
+    """Lance des parties IA contre IA en ligne de commande"""
+    parser = argparse.ArgumentParser(description="Parties IA contre IA sans interface")
+    parser.add_argument('--games', type=int, default=1000, help="Nombre de parties")
+    parser.add_argument('--output', default='selfplay.jsonl', help="Fichier de sortie (.jsonl ou .bin)")
+    parser.add_argument('--workers', type=int, default=None, help="Nombre de processus")
+    parser.add_argument('--algo1', default='alphabeta', help="Algorithme de PLAYER_1")
+    parser.add_argument('--algo2', default='alphabeta', help="Algorithme de PLAYER_2")
+    parser.add_argument('--depth1', type=int, default=4, help="Profondeur de PLAYER_1")
+    parser.add_argument('--depth2', type=int, default=4, help="Profondeur de PLAYER_2")
+    parser.add_argument('--time1', type=float, default=None, help="Temps par coup de PLAYER_1 (s)")
+    parser.add_argument('--time2', type=float, default=None, help="Temps par coup de PLAYER_2 (s)")
+    parser.add_argument('--opening-plies', type=int, default=OPENING_PLIES, help="Coups aléatoires au début")
+    parser.add_argument('--seed', type=int, default=0, help="Graine des ouvertures")
+    parser.add_argument('--no-resume', action='store_true', help="Écraser le fichier existant")
+    args = parser.parse_args()
+
+    players = (make_player(args.algo1, args.depth1, args.time1),
+               make_player(args.algo2, args.depth2, args.time2))
+    summary = run_selfplay(args.games, args.output, players, args.workers,
+                           args.opening_plies, args.seed, resume=not args.no_resume)
+
+    print(f"\n✓ {summary['new_games']} parties jouées ({summary['resumed_games']} reprises) "
+          f"en {summary['elapsed_time']:.1f}s : {summary['games_per_sec']:.1f} parties/s "
+          f"({summary['games_per_sec'] * 3600:,.0f} parties/h)")
+    print(f"  PLAYER_1 : {summary['player1_wins']}, PLAYER_2 : {summary['player2_wins']}, "
+          f"nuls : {summary['draws']}")
+
+
+# EXPLICATION DES PARTIES IA CONTRE IA :
+"""
+JOUER LES DEUX CAMPS :
+----------------------
+Les algorithmes cherchent toujours le meilleur coup pour PLAYER_2. Pour
+faire jouer PLAYER_1, on leur donne la position avec les couleurs
+échangées (Connect4.swapped()).
+
+OUVERTURES ALÉATOIRES :
+-----------------------
+Sans hasard, deux IA déterministes joueraient toujours la même partie.
+Les premiers coups sont tirés au hasard, avec une graine propre à chaque
+partie : la partie n° i est la même d'une exécution à l'autre.
+
+ÉCRITURE ET REPRISE :
+---------------------
+Chaque partie est écrite dès qu'elle est finie (dans l'ordre d'arrivée,
+avec son numéro). À la reprise, le fichier est relu, un dernier
+enregistrement incomplet est supprimé et seules les parties manquantes
+sont jouées.
+
+FORMATS :
+---------
+- .jsonl : une ligne JSON par partie (lisible, avec nœuds et temps)
+- .bin   : en-tête 'C4SP', puis numéro, résultat, ouverture, nombre de
+           coups et colonnes sur 4 bits (une partie de 30 coups = 22 octets)
+"""
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,818 @@
+"""
+server.py
+Serveur local de coups : plusieurs clients, un pool de processus déjà prêt
+
+Les interfaces (bots, clients web, analyses) n'ont plus besoin d'importer
+le moteur ni d'attendre son démarrage : elles envoient une position au
+serveur et reçoivent le coup, le score et les statistiques. Le serveur
+(asyncio, TCP ou socket Unix) met les demandes en file, les regroupe par
+paquets, les envoie à un pool de processus gardé chaud (table de
+transposition partagée, bibliothèque d'ouvertures ouverte) et mesure
+débit et latence.
+
+Protocole : une requête JSON par ligne, une réponse JSON par ligne.
+    {"id": 1, "moves": "334", "depth": 6}
+    {"id": 2, "moves": [3, 3], "time_limit": 0.5, "deadline": 1.0}
+    {"id": 3, "moves": "44", "rows": 7, "cols": 8, "connect": 5, "depth": 5}
+    {"id": 4, "op": "metrics"}
+Réponse : {"id": 1, "column": 2, "score": 4, "stats": {...}, "latency": 0.012}
+ou {"id": 1, "error": "..."}. Les réponses d'une même connexion peuvent
+arriver dans le désordre : l'identifiant les relie aux requêtes.
+
+Exemples :
+    python server.py --port 8765                 (ou --unix /tmp/puissance4.sock)
+    python server.py --client --requests 200 --concurrency 8
+    python server.py --selftest                  (serveur et client dans le même processus)
+"""
+
+import argparse
+import asyncio
+import collections
+import json
+import multiprocessing
+import os
+import random
+import socket
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from game import Connect4, ROWS, COLS, CONNECT, PLAYER_2
+from alphabeta import find_best_move_alphabeta
+from transposition import SharedTranspositionTable, DEFAULT_SIZE_MB
+from book import default_book
+from endgame import EndgameSolver
+from benchmark import percentile
+
+# Adresse par défaut (connexions locales uniquement)
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+# Nombre maximal de demandes regroupées dans un même envoi au pool
+DEFAULT_BATCH_SIZE = 8
+
+# Attente supplémentaire pour compléter un paquet (secondes, 0 = envoyer ce qui est en file)
+DEFAULT_BATCH_WINDOW = 0.0
+
+# Demandes en attente au-delà desquelles le serveur refuse (réponse "serveur saturé")
+DEFAULT_MAX_QUEUE = 1024
+
+# Résultats à profondeur fixe gardés en mémoire (même position, même profondeur)
+DEFAULT_CACHE_SIZE = 4096
+
+# Latences conservées pour les centiles des métriques
+LATENCY_WINDOW = 10000
+
+# Plus grand plateau accepté : les géométries sont gardées en cache par chaque
+# processus, et les coups et profondeurs doivent tenir dans la table partagée
+MAX_ROWS = 12
+MAX_COLS = 14
+MAX_CELLS = 144
+
+# Recherche faite par chaque processus au démarrage (imports, tables, caches)
+WARMUP_DEPTH = 4
+
+# État d'un processus du pool (initialisé dans le processus, conservé d'une demande à l'autre)
+_shared_tt = None
+_book = None
+_endgame_solver = None
+
+
+class ServerError(Exception):
+    """Réponse d'erreur du serveur (position invalide, échéance dépassée, serveur saturé...)"""
+
+
+def _init_worker(shared_tt, use_book):
+    """Initialise un processus du pool et le "chauffe" par une petite recherche"""
+    global _shared_tt, _book, _endgame_solver
+    _shared_tt = shared_tt
+    _book = default_book() if use_book else None
+    _endgame_solver = EndgameSolver()
+    find_best_move_alphabeta(Connect4(), WARMUP_DEPTH, use_tt=False)
+
+
+def _warm():
+    """Tâche vide : force le démarrage d'un processus du pool"""
+    return os.getpid()
+
+
+def _run_batch(jobs):
+    """
+    Cherche un paquet de positions (exécuté dans un processus du pool)
+
+    Args:
+        jobs (list): Dictionnaires 'moves', 'geometry', 'depth', 'time_limit'
+                     et 'deadline' (instant limite time.monotonic, ou None)
+
+    Returns:
+        list: Pour chaque demande, (colonne, score, statistiques) ou le message d'erreur
+    """
+    results = []
+    for job in jobs:
+        time_limit = job['time_limit']
+        if job['deadline'] is not None:
+            remaining = job['deadline'] - time.monotonic()
+            if remaining <= 0:
+                results.append("échéance dépassée avant la recherche")
+                continue
+            time_limit = remaining if time_limit is None else min(time_limit, remaining)
+        # La position est rejouée ici et non dans la boucle asyncio du serveur
+        try:
+            game = Connect4.from_moves(job['moves'], *job['geometry'])
+        except ValueError as e:
+            results.append(f"position invalide : {e}")
+            continue
+        if game.is_terminal_node():
+            results.append("la partie est terminée")
+            continue
+        start_time = time.perf_counter()
+        col, score, stats = find_best_move_alphabeta(game, job['depth'], tt=_shared_tt,
+                                                     time_limit=time_limit, book=_book,
+                                                     endgame_solver=_endgame_solver)
+        stats['search_time'] = time.perf_counter() - start_time
+        stats['pid'] = os.getpid()
+        results.append((col, score, stats))
+    return results
+
+
+class ServerMetrics:
+    """Compteurs, débit et latences du serveur"""
+
+    def __init__(self):
+        self.start_time = time.monotonic()
+        self.received = 0       # Demandes de coup reçues
+        self.completed = 0      # Réponses avec un coup
+        self.failed = 0         # Réponses d'erreur (toutes causes)
+        self.expired = 0        # Dont : échéance dépassée avant la recherche
+        self.rejected = 0       # Dont : refusées, file pleine
+        self.cache_hits = 0     # Résultat déjà connu (profondeur fixe)
+        self.deduplicated = 0   # Même demande qu'une autre déjà en cours
+        self.batches = 0        # Envois au pool
+        self.batched_jobs = 0   # Recherches envoyées au pool
+        self.latencies = collections.deque(maxlen=LATENCY_WINDOW)     # Réception -> réponse
+        self.queue_times = collections.deque(maxlen=LATENCY_WINDOW)   # Réception -> envoi au pool
+
+    def snapshot(self, queue_depth=0, in_flight=0):
+        """
+        Returns:
+            dict: Compteurs, débit (réponses par seconde) et centiles de latence (secondes)
+        """
+        uptime = time.monotonic() - self.start_time
+        latencies = list(self.latencies)
+        queue_times = list(self.queue_times)
+        return {
+            'uptime': uptime,
+            'received': self.received,
+            'completed': self.completed,
+            'failed': self.failed,
+            'expired': self.expired,
+            'rejected': self.rejected,
+            'cache_hits': self.cache_hits,
+            'deduplicated': self.deduplicated,
+            'batches': self.batches,
+            'mean_batch_size': self.batched_jobs / self.batches if self.batches else 0.0,
+            'queue_depth': queue_depth,
+            'in_flight': in_flight,
+            'throughput': self.completed / uptime if uptime > 0 else 0.0,
+            'latency_p50': percentile(latencies, 0.50) if latencies else None,
+            'latency_p95': percentile(latencies, 0.95) if latencies else None,
+            'latency_p99': percentile(latencies, 0.99) if latencies else None,
+            'queue_time_p95': percentile(queue_times, 0.95) if queue_times else None,
+        }
+
+
+class _Request:
+    """Demande de coup en attente (dans la file ou dans le pool)"""
+
+    __slots__ = ('key', 'job', 'received', 'deadline', 'future')
+
+    def __init__(self, key, job, received, deadline, future):
+        self.key = key            # Identifie les demandes identiques (None : pas de cache)
+        self.job = job            # Paramètres transmis à _run_batch
+        self.received = received  # Instant de réception (time.monotonic)
+        self.deadline = deadline  # Instant limite (time.monotonic) ou None
+        self.future = future      # Résultat attendu par la connexion
+
+
+class MoveServer:
+    """
+    Serveur de coups asyncio (à arrêter avec close())
+
+    Exemple :
+        server = MoveServer(workers=4)
+        await server.start(port=8765)
+        await server.serve_forever()
+    """
+
+    def __init__(self, workers=None, tt_size_mb=DEFAULT_SIZE_MB, use_book=True,
+                 batch_size=DEFAULT_BATCH_SIZE, batch_window=DEFAULT_BATCH_WINDOW,
+                 max_queue=DEFAULT_MAX_QUEUE, cache_size=DEFAULT_CACHE_SIZE):
+        """
+        Args:
+            workers (int): Nombre de processus de calcul (par défaut : nombre de cœurs)
+            tt_size_mb (float): Taille de la table de transposition partagée (en Mo)
+            use_book (bool): Consulter la bibliothèque d'ouvertures si elle existe
+            batch_size (int): Nombre maximal de demandes par envoi au pool
+            batch_window (float): Attente pour compléter un paquet (secondes)
+            max_queue (int): Nombre maximal de demandes en attente
+            cache_size (int): Résultats à profondeur fixe gardés (0 = pas de cache)
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.tt_size_mb = tt_size_mb
+        self.use_book = use_book
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self.max_queue = max_queue
+        self.cache_size = cache_size
+        self.metrics = ServerMetrics()
+        self.cache = collections.OrderedDict()  # Clé -> (colonne, score, statistiques)
+        self.pending = {}                       # Clé -> demande en cours (déduplication)
+        self.in_flight = 0                      # Paquets en cours dans le pool
+        self.tt = None
+        self.executor = None
+        self.queue = None
+        self.slots = None
+        self.server = None
+        self.dispatcher = None
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT, path=None):
+        """
+        Démarre le pool (processus chauds) puis écoute les connexions
+
+        Args:
+            host (str): Adresse TCP
+            port (int): Port TCP (0 = choisi par le système)
+            path (str): Chemin d'une socket Unix (remplace host et port)
+
+        Returns:
+            str: Adresse d'écoute
+        """
+        # 'spawn' : les processus ne dupliquent pas la boucle asyncio du serveur
+        context = multiprocessing.get_context('spawn')
+        self.tt = SharedTranspositionTable(self.tt_size_mb)
+        self.executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=context,
+                                            initializer=_init_worker,
+                                            initargs=(self.tt, self.use_book))
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self.executor, _warm) for _ in range(self.workers)))
+
+        self.queue = asyncio.Queue(self.max_queue)
+        self.slots = asyncio.Semaphore(self.workers)
+        self.dispatcher = asyncio.create_task(self._dispatch())
+        if path is not None:
+            self.server = await asyncio.start_unix_server(self._handle_connection, path)
+            return path
+        self.server = await asyncio.start_server(self._handle_connection, host, port)
+        host, port = self.server.sockets[0].getsockname()[:2]
+        return f"{host}:{port}"
+
+    async def serve_forever(self):
+        """Traite les connexions jusqu'à l'annulation"""
+        await self.server.serve_forever()
+
+    async def close(self):
+        """Arrête d'écouter, annule les demandes en attente et arrête le pool"""
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        if self.dispatcher is not None:
+            self.dispatcher.cancel()
+            try:
+                await self.dispatcher
+            except asyncio.CancelledError:
+                pass
+        while self.queue is not None and not self.queue.empty():
+            self._finish(self.queue.get_nowait(), exception=ServerError("serveur arrêté"))
+        if self.executor is not None:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+        if self.tt is not None:
+            self.tt.close()
+
+    def get_metrics(self):
+        """
+        Returns:
+            dict: Métriques du serveur (voir ServerMetrics.snapshot)
+        """
+        return self.metrics.snapshot(self.queue.qsize() if self.queue else 0, self.in_flight)
+
+    async def _handle_connection(self, reader, writer):
+        """Lit les requêtes d'une connexion ; chacune est traitée dans sa propre tâche"""
+        tasks = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                task = asyncio.create_task(self._answer(line, writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _answer(self, line, writer):
+        """Traite une requête et écrit sa réponse"""
+        request_id = None
+        try:
+            message = json.loads(line)
+            if not isinstance(message, dict):
+                raise ServerError("la requête doit être un objet JSON")
+            request_id = message.get('id')
+            op = message.get('op', 'move')
+            if op == 'metrics':
+                response = {'metrics': self.get_metrics()}
+            elif op == 'ping':
+                response = {'pong': True}
+            elif op == 'move':
+                response = await self.best_move(message)
+            else:
+                raise ServerError(f"opération inconnue : {op}")
+        except ServerError as e:
+            response = {'error': str(e)}
+        except ValueError as e:
+            response = {'error': f"requête invalide : {e}"}
+        response['id'] = request_id
+        writer.write(json.dumps(response).encode() + b'\n')
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+
+    async def best_move(self, message):
+        """
+        Met une demande de coup en file et attend son résultat
+
+        Args:
+            message (dict): 'moves' et au moins 'depth' ou 'time_limit' ('deadline' :
+                            secondes avant lesquelles répondre ; 'rows', 'cols', 'connect'
+                            pour un autre plateau)
+
+        Returns:
+            dict: 'column', 'score', 'stats' et 'latency' (secondes)
+        """
+        received = time.monotonic()
+        self.metrics.received += 1
+        try:
+            result = await self._submit(self._parse(message, received), received)
+        except ServerError:
+            self.metrics.failed += 1
+            raise
+
+        latency = time.monotonic() - received
+        self.metrics.completed += 1
+        self.metrics.latencies.append(latency)
+        col, score, stats = result
+        return {'column': col, 'score': score, 'stats': stats, 'latency': latency}
+
+    async def _submit(self, job, received):
+        """
+        Résultat d'une demande : cache, recherche identique déjà en cours, ou nouvelle recherche
+
+        Returns:
+            tuple: (meilleure_colonne, score, statistiques)
+        """
+        # Seules les recherches à profondeur fixe sans échéance sont interchangeables
+        fixed = job['time_limit'] is None and job['deadline'] is None
+        key = (job['geometry'], tuple(job['moves']), job['depth'])
+        if fixed:
+            cached = self.cache.get(key)
+            if cached is not None:
+                self.cache.move_to_end(key)
+                self.metrics.cache_hits += 1
+                return cached
+            request = self.pending.get(key)
+            if request is not None:
+                # Même recherche déjà en file ou en cours : on attend son résultat
+                self.metrics.deduplicated += 1
+                return await asyncio.shield(request.future)
+
+        request = _Request(key if fixed else None, job, received, job['deadline'],
+                           asyncio.get_running_loop().create_future())
+        try:
+            self.queue.put_nowait(request)
+        except asyncio.QueueFull:
+            self.metrics.rejected += 1
+            raise ServerError("serveur saturé, réessayer plus tard")
+        if fixed:
+            self.pending[key] = request
+        return await asyncio.shield(request.future)
+
+    def _parse(self, message, received):
+        """
+        Vérifie une demande de coup (sans construire la position : les coups
+        sont rejoués par le processus de calcul)
+
+        Returns:
+            dict: Paramètres de _run_batch
+        """
+        geometry = (message.get('rows', ROWS), message.get('cols', COLS), message.get('connect', CONNECT))
+        if not all(isinstance(value, int) for value in geometry):
+            raise ServerError("rows, cols et connect doivent être des entiers")
+        rows, cols, connect = geometry
+        if not (1 <= rows <= MAX_ROWS and 1 <= cols <= MAX_COLS and rows * cols <= MAX_CELLS
+                and 3 <= connect <= max(rows, cols)):
+            raise ServerError(f"plateau non pris en charge : {rows}x{cols}, alignement de {connect} "
+                              f"(au plus {MAX_ROWS} lignes, {MAX_COLS} colonnes et {MAX_CELLS} cases)")
+        depth = message.get('depth')
+        time_limit = message.get('time_limit')
+        deadline = message.get('deadline')
+        if depth is None and time_limit is None and deadline is None:
+            raise ServerError("il faut indiquer depth, time_limit ou deadline")
+        if depth is not None and (not isinstance(depth, int) or not 1 <= depth <= rows * cols):
+            raise ServerError(f"depth doit être un entier entre 1 et {rows * cols}")
+        for name, value in (('time_limit', time_limit), ('deadline', deadline)):
+            if value is not None and (not isinstance(value, (int, float)) or value <= 0):
+                raise ServerError(f"{name} doit être un nombre de secondes positif")
+
+        try:
+            moves = [int(col) for col in message.get('moves', '')]
+        except (TypeError, ValueError) as e:
+            raise ServerError(f"position invalide : {e}")
+        if len(moves) > rows * cols or not all(0 <= col < cols for col in moves):
+            raise ServerError("position invalide : coup hors du plateau")
+        return {
+            'moves': moves,
+            'geometry': geometry,
+            'depth': depth,
+            'time_limit': time_limit,
+            'deadline': None if deadline is None else received + deadline
+        }
+
+    async def _dispatch(self):
+        """
+        Envoie les demandes au pool : une demande par processus libre. Les
+        demandes ne sont regroupées que si tous les autres processus sont
+        occupés, et ce processus n'en reçoit que sa part de la file (au plus
+        batch_size) : les suivantes restent pour les processus qui se libèrent
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            await self.slots.acquire()
+            batch = [await self.queue.get()]
+            if self.slots.locked():
+                limit = min(self.batch_size, -(-(self.queue.qsize() + 1) // self.workers))
+                window_end = time.monotonic() + self.batch_window
+                while len(batch) < limit and self.slots.locked():
+                    try:
+                        batch.append(self.queue.get_nowait())
+                    except asyncio.QueueEmpty:
+                        remaining = window_end - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        try:
+                            batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+                        except asyncio.TimeoutError:
+                            break
+
+            # Échéances déjà dépassées : inutile d'occuper un processus
+            now = time.monotonic()
+            ready = []
+            for request in batch:
+                if request.deadline is not None and request.deadline <= now:
+                    self.metrics.expired += 1
+                    self._finish(request, exception=ServerError("échéance dépassée avant la recherche"))
+                else:
+                    self.metrics.queue_times.append(now - request.received)
+                    ready.append(request)
+            if not ready:
+                self.slots.release()
+                continue
+
+            self.metrics.batches += 1
+            self.metrics.batched_jobs += len(ready)
+            self.in_flight += 1
+            future = loop.run_in_executor(self.executor, _run_batch, [r.job for r in ready])
+            future.add_done_callback(lambda f, ready=ready: self._batch_done(f, ready))
+
+    def _batch_done(self, future, batch):
+        """Distribue les résultats d'un paquet et libère le processus"""
+        self.in_flight -= 1
+        self.slots.release()
+        if future.cancelled():
+            results = ["serveur arrêté"] * len(batch)
+        elif future.exception() is not None:
+            results = [f"erreur de recherche : {future.exception()}"] * len(batch)
+        else:
+            results = future.result()
+        for request, result in zip(batch, results):
+            if isinstance(result, str):
+                if result.startswith("échéance"):
+                    self.metrics.expired += 1
+                self._finish(request, exception=ServerError(result))
+                continue
+            if request.key is not None and self.cache_size:
+                self.cache[request.key] = result
+                if len(self.cache) > self.cache_size:
+                    self.cache.popitem(last=False)
+            self._finish(request, result=result)
+
+    def _finish(self, request, result=None, exception=None):
+        """Rend le résultat (ou l'erreur) d'une demande à toutes les connexions qui l'attendent"""
+        if request.key is not None and self.pending.get(request.key) is request:
+            del self.pending[request.key]
+        if request.future.done():
+            return
+        if exception is not None:
+            request.future.set_exception(exception)
+        else:
+            request.future.set_result(result)
+
+
+class MoveClient:
+    """
+    Client bloquant du serveur (à fermer avec close() ou à utiliser avec `with`)
+
+    Exemple :
+        with MoveClient(port=8765) as client:
+            col, score, stats = client.best_move('334', depth=6)
+    """
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, path=None, timeout=None):
+        """
+        Args:
+            host (str): Adresse TCP du serveur
+            port (int): Port TCP du serveur
+            path (str): Socket Unix du serveur (remplace host et port)
+            timeout (float): Attente maximale d'une réponse (secondes, None = illimitée)
+        """
+        if path is not None:
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.sock.connect(path)
+        else:
+            self.sock = socket.create_connection((host, port))
+        self.sock.settimeout(timeout)
+        self.reader = self.sock.makefile('rb')
+        self.next_id = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Ferme la connexion"""
+        self.reader.close()
+        self.sock.close()
+
+    def request(self, message):
+        """
+        Envoie une requête et attend sa réponse
+
+        Args:
+            message (dict): Requête (un identifiant est ajouté)
+
+        Returns:
+            dict: Réponse du serveur
+        """
+        self.next_id += 1
+        message = dict(message, id=self.next_id)
+        self.sock.sendall(json.dumps(message).encode() + b'\n')
+        line = self.reader.readline()
+        if not line:
+            raise ConnectionError("connexion fermée par le serveur")
+        return json.loads(line)
+
+    def best_move(self, moves, depth=None, time_limit=None, deadline=None,
+                  rows=ROWS, cols=COLS, connect=CONNECT):
+        """
+        Demande le meilleur coup de l'IA (PLAYER_2 au trait après les coups joués)
+
+        Args:
+            moves (str ou list): Colonnes jouées depuis le plateau vide
+            depth (int): Profondeur de recherche (maximale avec time_limit ou deadline)
+            time_limit (float): Temps de recherche (secondes)
+            deadline (float): Délai de réponse, attente dans la file comprise (secondes)
+            rows (int): Nombre de lignes
+            cols (int): Nombre de colonnes
+            connect (int): Nombre de pions à aligner pour gagner
+
+        Returns:
+            tuple: (meilleure_colonne, score, statistiques)
+        """
+        message = {'moves': moves if isinstance(moves, str) else list(moves)}
+        for name, value in (('depth', depth), ('time_limit', time_limit), ('deadline', deadline)):
+            if value is not None:
+                message[name] = value
+        if (rows, cols, connect) != (ROWS, COLS, CONNECT):
+            message.update({'rows': rows, 'cols': cols, 'connect': connect})
+        response = self.request(message)
+        if 'error' in response:
+            raise ServerError(response['error'])
+        return response['column'], response['score'], response['stats']
+
+    def metrics(self):
+        """
+        Returns:
+            dict: Métriques du serveur
+        """
+        return self.request({'op': 'metrics'})['metrics']
+
+
+def random_positions(count, plies=(2, 4, 6, 8), seed=0):
+    """
+    Positions aléatoires avec l'IA au trait (pour les tests de charge)
+
+    Args:
+        count (int): Nombre de positions
+        plies (tuple): Nombres de paires de coups possibles, plus le premier coup de PLAYER_1
+        seed (int): Graine du générateur
+
+    Returns:
+        list: Colonnes jouées, sous forme de chaînes
+    """
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        game = Connect4()
+        for _ in range(rng.choice(plies) + 1):
+            if game.is_terminal_node():
+                break
+            game.play(rng.choice(game.legal_moves()))
+        if game.turn != PLAYER_2 or game.is_terminal_node():
+            continue
+        positions.append(''.join(str(col) for col in game.moves))
+    return positions
+
+
+def run_client(requests=100, concurrency=4, depth=6, deadline=None, host=DEFAULT_HOST,
+               port=DEFAULT_PORT, path=None, seed=0):
+    """
+    Test de charge : concurrency connexions envoient des positions aléatoires
+
+    Args:
+        requests (int): Nombre total de demandes
+        concurrency (int): Nombre de connexions simultanées
+        depth (int): Profondeur demandée
+        deadline (float): Délai de réponse demandé (secondes, None = aucun)
+        host (str): Adresse TCP du serveur
+        port (int): Port TCP du serveur
+        path (str): Socket Unix du serveur
+        seed (int): Graine des positions
+
+    Returns:
+        dict: Réponses, erreurs, latences vues par le client et métriques du serveur
+    """
+    positions = random_positions(requests, seed=seed)
+    lock = threading.Lock()
+    latencies, errors = [], collections.Counter()
+
+    def worker(chunk):
+        with MoveClient(host, port, path) as client:
+            for moves in chunk:
+                start_time = time.perf_counter()
+                try:
+                    client.best_move(moves, depth=depth, deadline=deadline)
+                except ServerError as e:
+                    with lock:
+                        errors[str(e)] += 1
+                    continue
+                with lock:
+                    latencies.append(time.perf_counter() - start_time)
+
+    start_time = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(worker, [positions[i::concurrency] for i in range(concurrency)]))
+    wall_time = time.perf_counter() - start_time
+
+    with MoveClient(host, port, path) as client:
+        server_metrics = client.metrics()
+    return {
+        'requests': requests,
+        'answered': len(latencies),
+        'errors': dict(errors),
+        'wall_time': wall_time,
+        'throughput': len(latencies) / wall_time if wall_time > 0 else 0.0,
+        'latency_p50': percentile(latencies, 0.50) if latencies else None,
+        'latency_p95': percentile(latencies, 0.95) if latencies else None,
+        'server': server_metrics
+    }
+
+
+def print_client_report(report):
+    """Affiche le résultat de run_client()"""
+    server = report['server']
+    print(f"\n{report['answered']}/{report['requests']} réponses en {report['wall_time']:.2f}s "
+          f"({report['throughput']:.1f} coups/s)")
+    if report['latency_p50'] is not None:
+        print(f"Latence client  : p50 {report['latency_p50'] * 1000:.1f} ms, "
+              f"p95 {report['latency_p95'] * 1000:.1f} ms")
+    for message, count in report['errors'].items():
+        print(f"  ✗ {count} × {message}")
+    print(f"Serveur : {server['batches']} paquets (taille moyenne {server['mean_batch_size']:.2f}), "
+          f"{server['cache_hits']} réponses en cache, {server['deduplicated']} dédupliquées, "
+          f"{server['expired']} échéances dépassées, {server['rejected']} refusées")
+
+
+async def _serve(args):
+    """Lance le serveur jusqu'à Ctrl+C"""
+    server = MoveServer(workers=args.workers, tt_size_mb=args.tt_size, use_book=not args.no_book,
+                        batch_size=args.batch_size, batch_window=args.batch_window,
+                        max_queue=args.max_queue)
+    address = await server.start(args.host, args.port, args.unix)
+    print(f"✓ Serveur prêt sur {address} ({server.workers} processus)")
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+
+
+async def _selftest(args):
+    """Serveur sur une socket temporaire et test de charge dans le même processus"""
+    server = MoveServer(workers=args.workers, tt_size_mb=args.tt_size, use_book=not args.no_book,
+                        batch_size=args.batch_size, batch_window=args.batch_window,
+                        max_queue=args.max_queue)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'puissance4.sock') if hasattr(socket, 'AF_UNIX') else None
+        address = await server.start(port=0, path=path)
+        print(f"✓ Serveur de test sur {address} ({server.workers} processus)")
+        port = int(address.rsplit(':', 1)[1]) if path is None else None
+        try:
+            report = await asyncio.get_running_loop().run_in_executor(
+                None, lambda: run_client(args.requests, args.concurrency, args.depth, args.deadline,
+                                         port=port, path=path))
+        finally:
+            await server.close()
+    print_client_report(report)
+
+
+def main():
+    """Serveur, client de test de charge ou test complet en ligne de commande"""
+    parser = argparse.ArgumentParser(description="Serveur local de coups")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--unix', default=None, help="Socket Unix au lieu de TCP")
+    parser.add_argument('--workers', type=int, default=None, help="Processus de calcul")
+    parser.add_argument('--tt-size', type=float, default=DEFAULT_SIZE_MB, help="Table partagée (Mo)")
+    parser.add_argument('--no-book', action='store_true', help="Ne pas utiliser la bibliothèque d'ouvertures")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument('--batch-window', type=float, default=DEFAULT_BATCH_WINDOW)
+    parser.add_argument('--max-queue', type=int, default=DEFAULT_MAX_QUEUE)
+    parser.add_argument('--client', action='store_true', help="Test de charge d'un serveur lancé")
+    parser.add_argument('--selftest', action='store_true', help="Serveur et test de charge ensemble")
+    parser.add_argument('--requests', type=int, default=100)
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--depth', type=int, default=6)
+    parser.add_argument('--deadline', type=float, default=None, help="Délai de réponse par demande")
+    args = parser.parse_args()
+
+    if args.client:
+        print_client_report(run_client(args.requests, args.concurrency, args.depth, args.deadline,
+                                       args.host, args.port, args.unix))
+    elif args.selftest:
+        asyncio.run(_selftest(args))
+    else:
+        try:
+            asyncio.run(_serve(args))
+        except KeyboardInterrupt:
+            print("\n✓ Serveur arrêté")
+
+
+# EXPLICATION DU SERVEUR DE COUPS :
+"""
+POOL CHAUD :
+------------
+Les processus de calcul sont lancés au démarrage du serveur et gardés :
+chacun a déjà importé le moteur, construit les tables du plateau et ouvert
+la bibliothèque d'ouvertures. Ils partagent une table de transposition en
+mémoire (la même que Lazy SMP) : une position cherchée pour un client
+profite aux suivants, quel que soit le processus qui la reçoit.
+
+FILE ET PAQUETS :
+-----------------
+Les demandes attendent dans une file asyncio. Chaque processus libre
+reçoit une demande. Quand tous les autres processus sont occupés, le
+processus qui se libère reçoit sa part de la file (file / processus,
+au plus batch_size) en un seul aller-retour ; le reste attend le
+processus suivant au lieu de s'accumuler derrière lui. L'échéance de
+chaque demande est vérifiée par le processus juste avant sa recherche. Une file pleine fait refuser les nouvelles demandes
+plutôt que d'allonger toutes les latences.
+
+DEMANDES IDENTIQUES :
+---------------------
+Même position, même profondeur : une demande déjà en cours n'est pas
+relancée (les clients attendent la même recherche) et les résultats à
+profondeur fixe sont gardés dans un cache LRU.
+
+ÉCHÉANCES :
+-----------
+"deadline" compte depuis la réception : une demande encore en file à
+l'échéance reçoit une erreur sans occuper de processus ; sinon le temps
+restant devient le temps limite de la recherche (approfondissement
+itératif jusqu'à depth), et le coup de la dernière profondeur terminée
+est rendu à temps.
+
+MÉTRIQUES :
+-----------
+{"op": "metrics"} renvoie les compteurs, le débit (réponses par
+seconde), les centiles de latence (réception -> réponse) et d'attente
+dans la file, la taille moyenne des paquets et les demandes en cours.
+"""
+
+
+if __name__ == "__main__":
+    main()
@@ -9,10 +9,48 @@ Point f) et g) du TP :
 """
 
 import time
+import random
+import numpy as np
 import matplotlib.pyplot as plt
-from game import Connect4, PLAYER_2
+from game import Connect4, PLAYER_1, PLAYER_2
+from heuristic import evaluate_position, evaluate_positions
 from minimax import find_best_move_minimax
 from alphabeta import find_best_move_alphabeta
+from negamax import find_best_move_negamax
+from endgame import empty_cells
+from ordering import STRATEGIES
+from parallel import ParallelSearcher
+from lazysmp import LazySMPSearcher
+from mcts import MCTSTree, find_best_move_mcts, PLAYOUT_POLICIES
+from selfplay import make_player, play_selfplay_game
+from profiling import run_instrumented, print_breakdown
+
+
+# Fins de partie utilisées pour comparer le solveur exact à Alpha-Beta
+# (colonnes jouées depuis le plateau vide, PLAYER_1 en premier)
+ENDGAME_POSITIONS = [
+    '1441243040632316356534561',
+    '3422106502434024450551556',
+    '3646633441164364103211406',
+]
+
+
+def create_test_position():
+    """
+    Crée la position de départ utilisée pour les comparaisons
+    
+    Returns:
+        Connect4: Position après quelques coups
+    """
+    game = Connect4()
+    
+    # Faire quelques coups pour avoir un état intéressant
+    # (vous pouvez modifier cet état initial)
+    game.drop_piece(0, 3, PLAYER_2)  # Centre
+    game.drop_piece(1, 3, 1)
+    game.drop_piece(0, 2, PLAYER_2)
+    game.drop_piece(1, 2, 1)
+    return game
 
 
 def test_algorithm(game, algorithm_name, depth):
@@ -21,7 +59,7 @@ def test_algorithm(game, algorithm_name, depth):
     
     Args:
         game (Connect4): État du jeu
-        algorithm_name (str): 'minimax' ou 'alphabeta'
+        algorithm_name (str): 'minimax', 'alphabeta' ou 'negamax'
         depth (int): Profondeur de recherche
         
     Returns:
@@ -35,6 +73,8 @@ def test_algorithm(game, algorithm_name, depth):
     
     if algorithm_name == 'minimax':
         col, score, stats = find_best_move_minimax(game, depth)
+    elif algorithm_name == 'negamax':
+        col, score, stats = find_best_move_negamax(game, depth)
     else:  # alphabeta
         col, score, stats = find_best_move_alphabeta(game, depth)
     
@@ -48,16 +88,24 @@ def test_algorithm(game, algorithm_name, depth):
         'score': score,
         'nodes_explored': stats['nodes_explored'],
         'nodes_pruned': stats.get('nodes_pruned', 0),
+        'tt_cutoffs': stats.get('tt_cutoffs', 0),
         'execution_time': execution_time
     }
     
     print(f"Colonne choisie : {col}")
     print(f"Score : {score}")
     print(f"Nœuds explorés : {stats['nodes_explored']}")
-    if algorithm_name == 'alphabeta':
+    if algorithm_name in ('alphabeta', 'negamax'):
         print(f"Nœuds élagués : {stats['nodes_pruned']}")
         efficiency = (stats['nodes_pruned'] / stats['nodes_explored'] * 100) if stats['nodes_explored'] > 0 else 0
         print(f"Efficacité élagage : {efficiency:.2f}%")
+    if algorithm_name == 'negamax':
+        print(f"Recherches PVS relancées : {stats['pvs_researches']}, "
+              f"fenêtres d'aspiration élargies : {stats['aspiration_failures']}")
+    if 'tt_hits' in stats:
+        print(f"Table de transposition : {stats['tt_hits']} succès, "
+              f"{stats['tt_stores']} écritures, {stats['tt_collisions']} collisions, "
+              f"{stats['tt_cutoffs']} nœuds évités")
     print(f"Temps d'exécution : {execution_time:.4f} secondes")
     print(f"{'='*60}\n")
     
@@ -76,14 +124,7 @@ def compare_algorithms(depths=[3, 4, 5, 6]):
     print("="*70)
     
     # Créer un état de jeu de départ
-    game = Connect4()
-    
-    # Faire quelques coups pour avoir un état intéressant
-    # (vous pouvez modifier cet état initial)
-    game.drop_piece(0, 3, PLAYER_2)  # Centre
-    game.drop_piece(1, 3, 1)
-    game.drop_piece(0, 2, PLAYER_2)
-    game.drop_piece(1, 2, 1)
+    game = create_test_position()
     
     print("\nÉtat initial du plateau :")
     game.print_board()
@@ -136,6 +177,441 @@ def compare_algorithms(depths=[3, 4, 5, 6]):
     generate_summary_table(results_minimax, results_alphabeta)
 
 
+def compare_move_ordering(depths=[5, 6, 7]):
+    """
+    Compare les stratégies d'ordonnancement des coups d'Alpha-Beta
+    (nœuds explorés et taux de coupure au premier coup)
+    
+    Args:
+        depths (list): Liste des profondeurs à tester
+        
+    Returns:
+        list: Un dictionnaire de résultats par (stratégie, profondeur)
+    """
+    print("\n" + "="*70)
+    print("COMPARAISON DES STRATÉGIES D'ORDONNANCEMENT (ALPHA-BETA)")
+    print("="*70)
+    
+    game = create_test_position()
+    results = []
+    
+    print(f"\n{'Stratégie':<10} │ {'Prof.':>5} │ {'Nœuds':>8} │ {'Coupures':>8} │ {'1er coup':>8} │ {'Temps (s)':>9}")
+    print("─"*66)
+    for depth in depths:
+        for strategy in STRATEGIES:
+            start_time = time.time()
+            col, score, stats = find_best_move_alphabeta(game.copy(), depth, ordering=strategy)
+            execution_time = time.time() - start_time
+            
+            results.append({
+                'ordering': strategy,
+                'depth': depth,
+                'column': col,
+                'score': score,
+                'nodes_explored': stats['nodes_explored'],
+                'cutoffs': stats['cutoffs'],
+                'first_move_cutoff_rate': stats['first_move_cutoff_rate'],
+                'execution_time': execution_time
+            })
+            print(f"{strategy:<10} │ {depth:>5} │ {stats['nodes_explored']:>8,} │ {stats['cutoffs']:>8,} │ "
+                  f"{stats['first_move_cutoff_rate'] * 100:>7.1f}% │ {execution_time:>9.4f}")
+        print("─"*66)
+    
+    return results
+
+
+def compare_negamax(depths=[3, 4, 5, 6, 7, 8]):
+    """
+    Compare Negamax/PVS (avec fenêtres d'aspiration) à Alpha-Beta sur les
+    positions de milieu et de fin de partie du banc d'essai (solveur exact
+    désactivé) : même score à la racine, nœuds explorés par profondeur
+    
+    Args:
+        depths (list): Liste des profondeurs à tester
+        
+    Returns:
+        list: Un dictionnaire de résultats par (profondeur, position)
+    """
+    from benchmark import POSITIONS
+    
+    print("\n" + "="*70)
+    print("COMPARAISON ALPHA-BETA vs NEGAMAX/PVS")
+    print("="*70)
+    
+    positions = {name: moves for name, moves in POSITIONS.items()
+                 if name.startswith(('middlegame', 'endgame'))}
+    results = []
+    
+    print(f"\n{len(positions)} positions du banc d'essai (milieu et fin de partie), totaux par profondeur")
+    print(f"\n{'Prof.':>5} │ {'Nœuds AB':>9} │ {'Nœuds PVS':>9} │ {'Gain':>7} │ {'PVS pire':>8} │ {'Temps AB':>8} │ {'Temps PVS':>9}")
+    print("─"*76)
+    for depth in depths:
+        totals = {'ab_nodes': 0, 'nm_nodes': 0, 'ab_time': 0.0, 'nm_time': 0.0, 'worse': 0}
+        for name, moves in positions.items():
+            game = Connect4.from_moves(moves)
+            start_time = time.time()
+            ab_col, ab_score, ab_stats = find_best_move_alphabeta(game.copy(), depth, endgame_threshold=None)
+            ab_time = time.time() - start_time
+            
+            start_time = time.time()
+            nm_col, nm_score, nm_stats = find_best_move_negamax(game.copy(), depth, endgame_threshold=None)
+            nm_time = time.time() - start_time
+            
+            # Les deux recherches doivent donner le même score à la racine
+            assert nm_score == ab_score, f"Scores différents ({name}, profondeur {depth}) : {ab_score} / {nm_score}"
+            
+            results.append({
+                'depth': depth,
+                'position': name,
+                'score': ab_score,
+                'alphabeta_nodes': ab_stats['nodes_explored'],
+                'negamax_nodes': nm_stats['nodes_explored'],
+                'pvs_researches': nm_stats['pvs_researches'],
+                'aspiration_failures': nm_stats['aspiration_failures'],
+                'alphabeta_time': ab_time,
+                'negamax_time': nm_time
+            })
+            totals['ab_nodes'] += ab_stats['nodes_explored']
+            totals['nm_nodes'] += nm_stats['nodes_explored']
+            totals['ab_time'] += ab_time
+            totals['nm_time'] += nm_time
+            totals['worse'] += nm_stats['nodes_explored'] > ab_stats['nodes_explored']
+        
+        # Gain négatif : Negamax/PVS explore plus de nœuds qu'Alpha-Beta
+        gain = 1 - totals['nm_nodes'] / totals['ab_nodes']
+        print(f"{depth:>5} │ {totals['ab_nodes']:>9,} │ {totals['nm_nodes']:>9,} │ {gain * 100:>6.1f}% │ "
+              f"{totals['worse']:>4}/{len(positions):<3} │ {totals['ab_time']:>8.4f} │ {totals['nm_time']:>9.4f}")
+    print("─"*76)
+    print("PVS pire : positions où Negamax/PVS explore plus de nœuds qu'Alpha-Beta")
+    
+    return results
+
+
+def compare_endgame(depth=5):
+    """
+    Compare Alpha-Beta (heuristique à l'horizon) et le solveur exact
+    sur les fins de partie de ENDGAME_POSITIONS
+    
+    Args:
+        depth (int): Profondeur d'Alpha-Beta
+        
+    Returns:
+        list: Un dictionnaire de résultats par position
+    """
+    print("\n" + "="*70)
+    print(f"FIN DE PARTIE : ALPHA-BETA (PROFONDEUR {depth}) vs SOLVEUR EXACT")
+    print("="*70)
+    
+    results = []
+    print(f"\n{'Vides':>5} │ {'Coup AB':>7} │ {'Nœuds AB':>8} │ {'Temps AB':>8} │ "
+          f"{'Coup exact':>10} │ {'Score exact':>11} │ {'Nœuds':>7} │ {'Temps':>7}")
+    print("─"*84)
+    for moves in ENDGAME_POSITIONS:
+        game = Connect4()
+        for col in moves:
+            game.play(int(col))
+        
+        start_time = time.time()
+        ab_col, ab_score, ab_stats = find_best_move_alphabeta(game.copy(), depth, endgame_threshold=None)
+        ab_time = time.time() - start_time
+        
+        start_time = time.time()
+        eg_col, eg_score, eg_stats = find_best_move_alphabeta(game.copy(), depth, endgame_threshold=empty_cells(game))
+        eg_time = time.time() - start_time
+        
+        results.append({
+            'empty_cells': empty_cells(game),
+            'alphabeta_column': ab_col,
+            'alphabeta_score': ab_score,
+            'alphabeta_nodes': ab_stats['nodes_explored'],
+            'alphabeta_time': ab_time,
+            'endgame_column': eg_col,
+            'endgame_score': eg_stats['endgame_score'],
+            'endgame_nodes': eg_stats['nodes_explored'],
+            'endgame_time': eg_time
+        })
+        print(f"{empty_cells(game):>5} │ {ab_col:>7} │ {ab_stats['nodes_explored']:>8,} │ {ab_time:>8.4f} │ "
+              f"{eg_col:>10} │ {eg_stats['endgame_score']:>11} │ {eg_stats['nodes_explored']:>7,} │ {eg_time:>7.4f}")
+    print("─"*84)
+    print("Score exact : > 0 victoire (plus grand = plus rapide), 0 nul, < 0 défaite")
+    
+    return results
+
+
+def profile_primitives(depths={'minimax': 4, 'alphabeta': 6}):
+    """
+    Répartit le temps de recherche entre les primitives du jeu et de
+    l'heuristique (check_win, get_valid_locations, play/undo, ...)
+    
+    Args:
+        depths (dict): Profondeur de recherche par algorithme
+        
+    Returns:
+        dict: Tableau des primitives (PrimitiveCounters.get_breakdown()) par algorithme
+    """
+    searches = {'minimax': find_best_move_minimax, 'alphabeta': find_best_move_alphabeta}
+    results = {}
+    for algorithm, depth in depths.items():
+        print("\n" + "="*70)
+        print(f"RÉPARTITION DU TEMPS : {algorithm.upper()} (profondeur {depth})")
+        print("="*70)
+        game = create_test_position()
+        col, score, stats = run_instrumented(searches[algorithm], game, depth)
+        print(f"Colonne {col}, {stats['nodes_explored']:,} nœuds, {stats['search_time']:.3f}s (instrumenté)")
+        print_breakdown(stats['primitives'], stats['search_time'])
+        results[algorithm] = stats['primitives']
+    print("="*70)
+    
+    return results
+
+
+def random_boards(n_positions, seed=0):
+    """
+    Génère des plateaux aléatoires (parties jouées au hasard puis arrêtées)
+    
+    Args:
+        n_positions (int): Nombre de plateaux
+        seed (int): Graine du générateur aléatoire
+        
+    Returns:
+        numpy.ndarray: Tableau (n_positions, ROWS, COLS)
+    """
+    rng = random.Random(seed)
+    boards = []
+    while len(boards) < n_positions:
+        game = Connect4()
+        while game.get_valid_locations() and not game.is_terminal_node() and len(boards) < n_positions:
+            game.play(rng.choice(game.get_valid_locations()))
+            boards.append(game.board)
+    return np.array(boards)
+
+
+def benchmark_batch_evaluation(n_positions=100000, n_scalar=5000):
+    """
+    Compare l'évaluation vectorisée (evaluate_positions) à l'évaluation
+    plateau par plateau (evaluate_position) en positions par seconde
+    
+    Args:
+        n_positions (int): Nombre de plateaux évalués par la version vectorisée
+        n_scalar (int): Nombre de plateaux évalués par la version scalaire
+                        (plus lente, mesurée sur un sous-ensemble)
+        
+    Returns:
+        dict: Débits mesurés et accélération
+    """
+    print("\n" + "="*70)
+    print("ÉVALUATION PAR LOTS (NumPy) vs ÉVALUATION SCALAIRE")
+    print("="*70)
+    
+    boards = random_boards(n_positions)
+    n_scalar = min(n_scalar, n_positions)
+    
+    start_time = time.perf_counter()
+    scalar_scores = [evaluate_position(board, PLAYER_2) for board in boards[:n_scalar]]
+    scalar_time = time.perf_counter() - start_time
+    
+    start_time = time.perf_counter()
+    batch_scores = evaluate_positions(boards, PLAYER_2)
+    batch_time = time.perf_counter() - start_time
+    
+    # Les deux versions doivent donner exactement les mêmes scores
+    assert list(batch_scores[:n_scalar]) == scalar_scores, "Scores différents entre les deux versions"
+    
+    scalar_rate = n_scalar / scalar_time if scalar_time > 0 else 0
+    batch_rate = n_positions / batch_time if batch_time > 0 else 0
+    speedup = batch_rate / scalar_rate if scalar_rate > 0 else 0
+    
+    print(f"Scalaire   : {scalar_rate:>12,.0f} positions/s ({n_scalar:,} positions)")
+    print(f"Vectorisée : {batch_rate:>12,.0f} positions/s ({n_positions:,} positions)")
+    print(f"Accélération : {speedup:.1f}x (scores identiques)")
+    print("="*70)
+    
+    return {
+        'scalar_positions_per_sec': scalar_rate,
+        'batch_positions_per_sec': batch_rate,
+        'speedup': speedup
+    }
+
+
+def benchmark_parallel(depth=8, workers_list=[1, 2, 4, 8], split_depth=1):
+    """
+    Mesure l'accélération d'Alpha-Beta parallèle (découpage de la racine)
+    par rapport à la recherche séquentielle
+    
+    Args:
+        depth (int): Profondeur de recherche
+        workers_list (list): Nombres de processus à tester
+        split_depth (int): Niveau de découpage (1 ou 2)
+        
+    Returns:
+        list: Résultats par nombre de processus
+    """
+    print("\n" + "="*70)
+    print(f"ALPHA-BETA PARALLÈLE (profondeur {depth}, découpage niveau {split_depth})")
+    print("="*70)
+    
+    game = create_test_position()
+    
+    start_time = time.perf_counter()
+    serial_col, serial_score, serial_stats = find_best_move_alphabeta(game.copy(), depth)
+    serial_time = time.perf_counter() - start_time
+    print(f"Séquentiel  : colonne {serial_col}, {serial_stats['nodes_explored']:,} nœuds, {serial_time:.3f}s")
+    
+    results = []
+    for workers in workers_list:
+        with ParallelSearcher(workers) as searcher:
+            start_time = time.perf_counter()
+            col, score, stats = searcher.search(game.copy(), depth, split_depth=split_depth)
+            execution_time = time.perf_counter() - start_time
+        
+        speedup = serial_time / execution_time if execution_time > 0 else 0
+        results.append({
+            'workers': workers,
+            'column': col,
+            'score': score,
+            'nodes_explored': stats['nodes_explored'],
+            'nodes_pruned': stats['nodes_pruned'],
+            'execution_time': execution_time,
+            'speedup': speedup,
+            'worker_times': stats['worker_times']
+        })
+        same = "identique" if col == serial_col else "DIFFÉRENTE"
+        print(f"{workers:>2} processus : colonne {col} ({same}), {stats['nodes_explored']:,} nœuds, "
+              f"{execution_time:.3f}s, accélération {speedup:.2f}x")
+        for pid, worker in sorted(stats['worker_times'].items()):
+            print(f"      pid {pid} : {worker['tasks']} tâches, {worker['time']:.3f}s, {worker['nodes']:,} nœuds")
+    print("="*70)
+    
+    return results
+
+
+def benchmark_lazy_smp(depth=9, workers_list=[1, 2, 4, 8]):
+    """
+    Mesure le passage à l'échelle de Lazy SMP (table de transposition partagée)
+    
+    L'efficacité est l'accélération par rapport à 1 processus divisée par
+    le nombre de processus (100 % = passage à l'échelle parfait).
+    
+    Args:
+        depth (int): Profondeur de recherche
+        workers_list (list): Nombres de processus à tester
+        
+    Returns:
+        list: Résultats par nombre de processus
+    """
+    print("\n" + "="*70)
+    print(f"LAZY SMP (profondeur {depth})")
+    print("="*70)
+    
+    # Position de milieu de partie : peu de bons coups à la racine
+    game = Connect4()
+    for col in [3, 3, 2, 4, 4, 2, 3, 1]:
+        game.play(col)
+    
+    results = []
+    base_time = None
+    print(f"{'Processus':>9} │ {'Colonne':>7} │ {'Score':>9} │ {'Nœuds':>10} │ {'Temps (s)':>9} │ "
+          f"{'Accél.':>6} │ {'Efficacité':>10}")
+    print("─"*79)
+    for workers in workers_list:
+        with LazySMPSearcher(workers) as searcher:
+            start_time = time.perf_counter()
+            col, score, stats = searcher.search(game.copy(), depth)
+            execution_time = time.perf_counter() - start_time
+        
+        if base_time is None:
+            base_time = execution_time * workers_list[0]
+        speedup = base_time / execution_time if execution_time > 0 else 0
+        efficiency = speedup / workers
+        results.append({
+            'workers': workers,
+            'column': col,
+            'score': score,
+            'nodes_explored': stats['nodes_explored'],
+            'execution_time': execution_time,
+            'speedup': speedup,
+            'efficiency': efficiency
+        })
+        print(f"{workers:>9} │ {col:>7} │ {score:>9} │ {stats['nodes_explored']:>10,} │ "
+              f"{execution_time:>9.3f} │ {speedup:>5.2f}x │ {efficiency * 100:>9.1f}%")
+    print("="*70)
+    
+    return results
+
+
+def compare_mcts(iterations=20000, time_limits=[0.1, 0.5], games=10):
+    """
+    Compare MCTS à Alpha-Beta : vitesse des simulations, puis parties
+    avec le même temps de calcul par coup (force par seconde de CPU)
+    
+    Chaque ouverture aléatoire est jouée deux fois, MCTS commençant une
+    fois sur deux. Le score de MCTS compte 1 par victoire et 0,5 par nul.
+    
+    Args:
+        iterations (int): Itérations par politique de simulation
+        time_limits (list): Temps par coup (en secondes) des parties
+        games (int): Nombre de parties par temps par coup (arrondi au nombre pair)
+        
+    Returns:
+        dict: Vitesse par politique et résultats des parties par temps par coup
+    """
+    print("\n" + "="*70)
+    print("MCTS vs ALPHA-BETA")
+    print("="*70)
+    
+    game = create_test_position()
+    speed = []
+    print(f"{'Simulation':<10} │ {'Colonne':>7} │ {'Gain':>6} │ {'Simul./s':>9} │ {'Nœuds':>9} │ {'Mémoire':>10} │ {'Temps':>7}")
+    print("─"*74)
+    for policy in PLAYOUT_POLICIES:
+        tree = MCTSTree(playout=policy, seed=0)
+        col, value, stats = find_best_move_mcts(game.copy(), iterations=iterations, mcts_tree=tree)
+        speed.append({
+            'playout': policy,
+            'column': col,
+            'value': value,
+            'playouts_per_sec': stats['playouts_per_sec'],
+            'tree_nodes': stats['tree_nodes'],
+            'tree_memory': stats['tree_memory'],
+            'search_time': stats['search_time']
+        })
+        print(f"{policy:<10} │ {col:>7} │ {value * 100:>5.1f}% │ {stats['playouts_per_sec']:>9,.0f} │ "
+              f"{stats['tree_nodes']:>9,} │ {stats['tree_memory']:>9,}o │ {stats['search_time']:>6.2f}s")
+    print("─"*74)
+    
+    matches = []
+    for time_limit in time_limits:
+        mcts_player = make_player('mcts', None, time_limit=time_limit)
+        ab_player = make_player('alphabeta', None, time_limit=time_limit)
+        wins = draws = losses = 0
+        start_time = time.perf_counter()
+        for game_id in range(games // 2):
+            for mcts_side in (PLAYER_1, PLAYER_2):
+                players = (mcts_player, ab_player) if mcts_side == PLAYER_1 else (ab_player, mcts_player)
+                record = play_selfplay_game(game_id, players)
+                if record['result'] == mcts_side:
+                    wins += 1
+                elif record['result'] == PLAYER_1 + PLAYER_2 - mcts_side:
+                    losses += 1
+                else:
+                    draws += 1
+        played = wins + draws + losses
+        matches.append({
+            'time_limit': time_limit,
+            'games': played,
+            'mcts_wins': wins,
+            'draws': draws,
+            'alphabeta_wins': losses,
+            'mcts_score': (wins + draws / 2) / played if played else 0.0,
+            'match_time': time.perf_counter() - start_time
+        })
+        print(f"{time_limit:.2f}s par coup : MCTS {wins} victoires, {draws} nuls, {losses} défaites "
+              f"(score {matches[-1]['mcts_score'] * 100:.0f}%)")
+    print("="*70)
+    
+    return {'speed': speed, 'matches': matches}
+
+
 def generate_graphs(results_mm, results_ab, depths):
     """
     Génère des graphiques de comparaison
@@ -280,6 +756,28 @@ def main():
     # Vous pouvez modifier les profondeurs testées
     compare_algorithms(depths=[3, 4, 5, 6])
     
+    # Comparer les stratégies d'ordonnancement d'Alpha-Beta
+    compare_move_ordering(depths=[5, 6, 7])
+    
+    # Comparer Negamax/PVS à Alpha-Beta
+    compare_negamax(depths=[3, 4, 5, 6, 7, 8])
+    
+    # Comparer Alpha-Beta et le solveur exact en fin de partie
+    compare_endgame(depth=5)
+    
+    # Répartir le temps de recherche entre les primitives
+    profile_primitives(depths={'minimax': 4, 'alphabeta': 6})
+    
+    # Mesurer le gain de l'évaluation par lots
+    benchmark_batch_evaluation(n_positions=100000)
+    
+    # Mesurer l'accélération de la recherche parallèle
+    benchmark_parallel(depth=8, workers_list=[1, 2, 4, 8])
+    benchmark_lazy_smp(depth=9, workers_list=[1, 2, 4, 8])
+    
+    # Comparer MCTS et Alpha-Beta à temps de calcul égal
+    compare_mcts(iterations=20000, time_limits=[0.1, 0.5], games=10)
+    
     print("\n✓ Analyse terminée !")
     print("✓ Utilisez ces résultats pour votre rapport (points f et g)")
     print("✓ Le graphique 'comparaison_algorithmes.png' a été généré\n")
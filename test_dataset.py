@@ -0,0 +1,94 @@
+"""
+test_dataset.py
+Aller-retour des positions par le format de dataset.py (python -m pytest)
+"""
+
+import random
+
+import pytest
+
+from game import Connect4, PLAYER_1, PLAYER_2
+from dataset import DatasetWriter, Dataset, MOVES_UNKNOWN
+
+
+def random_game(rng, rows=6, cols=7, connect=4, plies=None):
+    """Position obtenue par des coups au hasard (sans fin de partie)"""
+    game = Connect4(rows, cols, connect)
+    for _ in range(rng.randrange(rows * cols // 2) if plies is None else plies):
+        moves = game.get_valid_locations()
+        if game.is_terminal_node() or not moves:
+            break
+        game.play(rng.choice(moves))
+    return game
+
+
+def dropped_game():
+    """Position posée avec drop_piece (pas de pile de coups), comme stats.create_test_position"""
+    game = Connect4()
+    game.drop_piece(0, 3, PLAYER_2)
+    game.drop_piece(1, 3, PLAYER_1)
+    game.drop_piece(0, 2, PLAYER_2)
+    game.drop_piece(1, 2, PLAYER_1)
+    game.drop_piece(0, 4, PLAYER_1)
+    game.turn = PLAYER_2
+    return game
+
+
+def round_trip(tmp_path, games, scores, rows=6, cols=7, connect=4):
+    path = str(tmp_path / 'positions.c4ds')
+    with DatasetWriter(path, rows, cols, connect, scores=True) as writer:
+        for game, score in zip(games, scores):
+            writer.add(game, score)
+    return Dataset(path)
+
+
+@pytest.mark.parametrize('geometry', [(6, 7, 4), (7, 8, 5), (9, 9, 4)])
+def test_round_trip_played_and_swapped(tmp_path, geometry):
+    rng = random.Random(1)
+    games = []
+    for _ in range(40):
+        game = random_game(rng, *geometry)
+        games.extend([game, game.swapped()])
+    scores = [rng.randrange(-1000, 1000) for _ in games]
+    dataset = round_trip(tmp_path, games, scores, *geometry)
+
+    assert len(dataset) == len(games)
+    for index, (game, score) in enumerate(zip(games, scores)):
+        loaded = dataset[index]
+        assert loaded.bitboards == game.bitboards
+        assert loaded.turn == game.turn
+        assert dataset.turns[index] == game.turn
+        assert dataset.scores[index] == score
+        if index % 2:
+            # Échangée : les coups ne mènent plus à la position
+            assert dataset.records[index]['plies'] == MOVES_UNKNOWN or loaded.moves == game.moves
+        else:
+            assert loaded.moves == game.moves
+
+
+def test_swapped_side_to_move(tmp_path):
+    # PLAYER_2 au trait après un nombre impair de coups : échangée, c'est PLAYER_1 qui a un pion
+    # de plus et qui est au trait
+    game = Connect4.from_moves('334')
+    swapped = game.swapped()
+    assert swapped.turn == PLAYER_1
+    dataset = round_trip(tmp_path, [game, swapped], [7, -7])
+    assert dataset[0].turn == PLAYER_2
+    assert dataset[1].turn == PLAYER_1
+    assert dataset[1].bitboards == swapped.bitboards
+
+    # Nombre pair de coups : mêmes nombres de pions, mais PLAYER_2 au trait une fois échangée
+    even = Connect4.from_moves('3344')
+    dataset = round_trip(tmp_path, [even.swapped()], [0])
+    assert dataset[0].turn == PLAYER_2
+
+
+def test_dropped_position(tmp_path):
+    game = dropped_game()
+    dataset = round_trip(tmp_path, [game, Connect4().swapped()], [5, 0])
+    loaded = dataset[0]
+    assert dataset.records[0]['plies'] == MOVES_UNKNOWN
+    assert loaded.bitboards == game.bitboards
+    assert loaded.turn == PLAYER_2
+    assert (loaded.board == game.board).all()
+    assert dataset[1].turn == PLAYER_2
@@ -0,0 +1,64 @@
+"""
+test_incremental.py
+Évaluation incrémentale (Connect4.evaluate) comparée à heuristic.evaluate_position
+(python -m pytest)
+"""
+
+import random
+
+import pytest
+
+from game import Connect4, PLAYER_1, PLAYER_2
+from heuristic import evaluate_position
+
+# Géométries testées : standard, plus grandes, alignement plus court ou plus long
+GEOMETRIES = [(6, 7, 4), (7, 8, 5), (6, 7, 3), (8, 9, 4), (5, 5, 5), (4, 10, 4)]
+
+
+def check(game):
+    """Compare l'évaluation incrémentale des deux joueurs à celle du plateau complet"""
+    board = game.board
+    for piece in (PLAYER_1, PLAYER_2):
+        expected = evaluate_position(board, piece, game.geometry.connect)
+        assert game.evaluate(piece) == expected, f"coups : {game.moves}, joueur {piece}"
+
+
+@pytest.mark.parametrize('geometry', GEOMETRIES)
+def test_play_then_undo(geometry):
+    # Parties aléatoires jouées jusqu'au bout, puis entièrement annulées
+    rng = random.Random(0)
+    for _ in range(30):
+        game = Connect4(*geometry)
+        check(game)
+        while game.get_valid_locations() and not game.is_terminal_node():
+            game.play(rng.choice(game.get_valid_locations()))
+            check(game)
+        while game.moves:
+            game.undo()
+            check(game)
+
+
+@pytest.mark.parametrize('geometry', GEOMETRIES)
+def test_mixed_play_and_undo(geometry):
+    # Coups et annulations entremêlés, comme dans une recherche
+    rng = random.Random(1)
+    game = Connect4(*geometry)
+    for _ in range(2000):
+        moves = game.get_valid_locations()
+        if game.moves and (not moves or game.is_terminal_node() or rng.random() < 0.4):
+            game.undo()
+        else:
+            game.play(rng.choice(moves))
+        check(game)
+
+
+@pytest.mark.parametrize('geometry', GEOMETRIES)
+def test_copy_and_swapped(geometry):
+    rng = random.Random(2)
+    game = Connect4(*geometry)
+    for _ in range(geometry[0] * geometry[1] // 2):
+        if game.is_terminal_node():
+            break
+        game.play(rng.choice(game.get_valid_locations()))
+        check(game.copy())
+        check(game.swapped())
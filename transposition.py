@@ -0,0 +1,301 @@
+"""
+transposition.py
+Table de transposition pour l'algorithme Alpha-Beta
+
+Au Puissance 4, une même position est atteinte par de nombreux ordres
+de coups différents. La table mémorise le résultat de chaque position
+déjà explorée (indexée par son hachage de Zobrist) pour ne pas la
+réexplorer.
+"""
+
+from multiprocessing import shared_memory
+
+# Types de bornes stockées dans une entrée
+EXACT = 0        # Score exact (alpha < score < beta)
+LOWER_BOUND = 1  # Score >= valeur stockée (coupure beta)
+UPPER_BOUND = 2  # Score <= valeur stockée (aucun coup n'a dépassé alpha)
+
+# Politiques de remplacement quand une case de la table est déjà occupée
+REPLACE_DEPTH = 'depth'    # Garde l'entrée la plus profonde
+REPLACE_ALWAYS = 'always'  # La nouvelle entrée remplace toujours l'ancienne
+
+# Estimation de la mémoire occupée par une entrée (tuple + entiers Python)
+ENTRY_BYTES = 144
+
+# Taille par défaut de la table (en Mo)
+DEFAULT_SIZE_MB = 16
+
+
+class TranspositionTable:
+    """
+    Table de transposition de taille fixe
+
+    Chaque entrée est un tuple (clé, profondeur, score, type_de_borne, meilleur_coup)
+    rangé à l'indice clé % taille. La clé complète est conservée pour
+    détecter les collisions d'indice.
+    """
+
+    def __init__(self, size_mb=DEFAULT_SIZE_MB, replacement=REPLACE_DEPTH):
+        """
+        Args:
+            size_mb (float): Mémoire maximale allouée à la table (en Mo)
+            replacement (str): Politique de remplacement ('depth' ou 'always')
+        """
+        if replacement not in (REPLACE_DEPTH, REPLACE_ALWAYS):
+            raise ValueError(f"Politique de remplacement inconnue : {replacement}")
+
+        # Nombre d'entrées arrondi à la puissance de 2 inférieure
+        max_entries = max(1, int(size_mb * 1024 * 1024) // ENTRY_BYTES)
+        self.size = 1 << (max_entries.bit_length() - 1)
+        self.index_mask = self.size - 1
+        self.replacement = replacement
+        self.entries = [None] * self.size
+
+        # Statistiques
+        self.hits = 0        # Position trouvée dans la table
+        self.stores = 0      # Entrées écrites
+        self.collisions = 0  # Case occupée par une autre position
+
+    def probe(self, key):
+        """
+        Cherche une position dans la table
+
+        Args:
+            key (int): Hachage de Zobrist de la position
+
+        Returns:
+            tuple: (profondeur, score, type_de_borne, meilleur_coup) ou None
+        """
+        entry = self.entries[key & self.index_mask]
+        if entry is None:
+            return None
+        if entry[0] != key:
+            self.collisions += 1
+            return None
+        self.hits += 1
+        return entry[1:]
+
+    def store(self, key, depth, score, flag, best_move):
+        """
+        Enregistre le résultat d'une position selon la politique de remplacement
+
+        Args:
+            key (int): Hachage de Zobrist de la position
+            depth (int): Profondeur restante de la recherche
+            score (int): Score trouvé
+            flag (int): EXACT, LOWER_BOUND ou UPPER_BOUND
+            best_move (int): Meilleure colonne trouvée
+        """
+        index = key & self.index_mask
+        entry = self.entries[index]
+        if entry is not None and entry[0] != key:
+            self.collisions += 1
+            if self.replacement == REPLACE_DEPTH and entry[1] > depth:
+                return  # L'entrée existante est plus profonde : on la garde
+        self.entries[index] = (key, depth, score, flag, best_move)
+        self.stores += 1
+
+    def clear(self):
+        """Vide la table et réinitialise les compteurs"""
+        self.entries = [None] * self.size
+        self.reset_stats()
+
+    def reset_stats(self):
+        """Réinitialise les compteurs sans vider la table"""
+        self.hits = 0
+        self.stores = 0
+        self.collisions = 0
+
+    def get_stats(self):
+        """
+        Returns:
+            dict: Compteurs de la table (succès, écritures, collisions)
+        """
+        return {
+            'tt_hits': self.hits,
+            'tt_stores': self.stores,
+            'tt_collisions': self.collisions,
+        }
+
+
+# Format d'une entrée de la table partagée : deux mots de 64 bits
+# mot 0 : clé XOR données, mot 1 : données
+# données : score (32 bits, décalé de 2^31) | profondeur (10 bits) | borne (2 bits)
+#           | coup (8 bits, 255 = aucun) | bit "entrée utilisée"
+SHARED_ENTRY_BYTES = 16
+_SCORE_OFFSET = 1 << 31
+_NO_MOVE = 0xFF
+_USED_BIT = 1 << 52
+
+# Limites imposées par ce format (vérifiées par les recherches qui utilisent la table partagée)
+SHARED_MAX_DEPTH = 0x3FF  # Profondeur restante maximale
+SHARED_MAX_COLS = _NO_MOVE  # Colonnes 0 à 254
+
+
+class SharedTranspositionTable:
+    """
+    Table de transposition en mémoire partagée (multiprocessing.shared_memory),
+    utilisable sans verrou par plusieurs processus (recherche Lazy SMP)
+
+    Même interface que TranspositionTable. Chaque entrée tient dans deux
+    mots de 64 bits : le premier contient la clé XOR le second. Si deux
+    processus écrivent la même case en même temps, une lecture peut mélanger
+    les mots des deux écritures : le XOR ne redonne alors pas la clé et
+    l'entrée est simplement ignorée (technique de Hyatt et Mann).
+    Les compteurs de statistiques sont propres à chaque processus.
+    """
+
+    def __init__(self, size_mb=DEFAULT_SIZE_MB, replacement=REPLACE_DEPTH, name=None):
+        """
+        Args:
+            size_mb (float): Mémoire maximale allouée à la table (en Mo)
+            replacement (str): Politique de remplacement ('depth' ou 'always')
+            name (str): Nom d'un segment existant à rattacher (None = en créer un)
+        """
+        if replacement not in (REPLACE_DEPTH, REPLACE_ALWAYS):
+            raise ValueError(f"Politique de remplacement inconnue : {replacement}")
+
+        max_entries = max(1, int(size_mb * 1024 * 1024) // SHARED_ENTRY_BYTES)
+        self.size = 1 << (max_entries.bit_length() - 1)
+        self.index_mask = self.size - 1
+        self.replacement = replacement
+        self.size_mb = size_mb
+        self.owner = name is None
+        if self.owner:
+            self.shm = shared_memory.SharedMemory(create=True, size=self.size * SHARED_ENTRY_BYTES)
+            self.shm.buf[:] = bytes(self.size * SHARED_ENTRY_BYTES)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.words = self.shm.buf.cast('Q')
+        self.reset_stats()
+
+    def __getstate__(self):
+        # Transmis aux processus par le nom du segment
+        return {'size_mb': self.size_mb, 'replacement': self.replacement, 'name': self.shm.name}
+
+    def __setstate__(self, state):
+        self.__init__(state['size_mb'], state['replacement'], state['name'])
+
+    @staticmethod
+    def check_limits(geometry, depth=None):
+        """
+        Vérifie qu'une recherche tient dans le format des entrées
+        (sinon les coups ou profondeurs enregistrés seraient tronqués)
+
+        Args:
+            geometry (Geometry): Géométrie du plateau
+            depth (int): Profondeur demandée (None = jusqu'à remplir le plateau)
+        """
+        if geometry.cols > SHARED_MAX_COLS:
+            raise ValueError(f"Table partagée limitée à {SHARED_MAX_COLS} colonnes")
+        if (geometry.cells if depth is None else depth) > SHARED_MAX_DEPTH:
+            raise ValueError(f"Table partagée limitée à une profondeur de {SHARED_MAX_DEPTH}")
+
+    def probe(self, key):
+        """
+        Cherche une position dans la table
+
+        Args:
+            key (int): Hachage de Zobrist de la position
+
+        Returns:
+            tuple: (profondeur, score, type_de_borne, meilleur_coup) ou None
+        """
+        slot = (key & self.index_mask) << 1
+        data = self.words[slot + 1]
+        if not data & _USED_BIT:
+            return None
+        if self.words[slot] ^ data != key:
+            self.collisions += 1
+            return None
+        self.hits += 1
+        move = (data >> 44) & 0xFF
+        return ((data >> 32) & 0x3FF, (data & 0xFFFFFFFF) - _SCORE_OFFSET,
+                (data >> 42) & 0x3, None if move == _NO_MOVE else move)
+
+    def store(self, key, depth, score, flag, best_move):
+        """
+        Enregistre le résultat d'une position selon la politique de remplacement
+
+        Args:
+            key (int): Hachage de Zobrist de la position
+            depth (int): Profondeur restante de la recherche (au plus SHARED_MAX_DEPTH)
+            score (int): Score trouvé
+            flag (int): EXACT, LOWER_BOUND ou UPPER_BOUND
+            best_move (int): Meilleure colonne trouvée (inférieure à SHARED_MAX_COLS)
+        """
+        slot = (key & self.index_mask) << 1
+        old_data = self.words[slot + 1]
+        if old_data & _USED_BIT and self.words[slot] ^ old_data != key:
+            self.collisions += 1
+            if self.replacement == REPLACE_DEPTH and (old_data >> 32) & 0x3FF > depth:
+                return
+        data = (_USED_BIT
+                | (_NO_MOVE if best_move is None else best_move) << 44
+                | flag << 42
+                | depth << 32
+                | (int(score) + _SCORE_OFFSET))
+        self.words[slot] = key ^ data
+        self.words[slot + 1] = data
+        self.stores += 1
+
+    def clear(self):
+        """Vide la table et réinitialise les compteurs"""
+        self.shm.buf[:] = bytes(self.size * SHARED_ENTRY_BYTES)
+        self.reset_stats()
+
+    def reset_stats(self):
+        """Réinitialise les compteurs sans vider la table"""
+        self.hits = 0
+        self.stores = 0
+        self.collisions = 0
+
+    def get_stats(self):
+        """
+        Returns:
+            dict: Compteurs de la table (succès, écritures, collisions)
+        """
+        return {
+            'tt_hits': self.hits,
+            'tt_stores': self.stores,
+            'tt_collisions': self.collisions,
+        }
+
+    def close(self):
+        """Détache la table (et libère le segment si ce processus l'a créé)"""
+        self.words.release()
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+# EXPLICATION DE LA TABLE DE TRANSPOSITION :
+"""
+HACHAGE DE ZOBRIST :
+--------------------
+Chaque couple (joueur, case) reçoit un nombre aléatoire de 64 bits
+(voir game.ZOBRIST_KEYS). Le hachage d'une position est le XOR des
+nombres de toutes les cases occupées. Jouer ou annuler un coup ne
+demande donc qu'un seul XOR : le hachage est mis à jour en O(1).
+
+TYPES DE BORNES :
+-----------------
+Avec l'élagage, le score renvoyé n'est pas toujours exact :
+- EXACT       : alpha < score < beta, le score est la vraie valeur
+- LOWER_BOUND : coupure beta, la vraie valeur est >= score
+- UPPER_BOUND : aucun coup ne dépasse alpha, la vraie valeur est <= score
+
+PROFONDEUR :
+------------
+Alpha-Beta n'utilise une entrée pour couper que si elle a été calculée
+à la même profondeur restante. Le score renvoyé reste ainsi identique à
+celui de Min-Max (avec la même heuristique à l'horizon), seul le nombre
+de nœuds diminue.
+
+REMPLACEMENT :
+--------------
+La table a une taille fixe. Quand deux positions tombent sur la même
+case :
+- 'depth'  : on garde l'entrée de plus grande profondeur (plus coûteuse à recalculer)
+- 'always' : la dernière position explorée remplace toujours l'ancienne
+"""